@@ -5,18 +5,22 @@ This module provides various commands for testing, converting, and processing
 rules and text using the LAPA-NG phonetic transcription system.
 """
 
-import csv
+import hashlib
 import json
+from pathlib import Path
 from typing import List
 
 import click
 import yaml
 
-from lapa_ng.factory import create_matcher
+from lapa_ng import benchmark as benchmark_module
+from lapa_ng import corpus
+from lapa_ng.cache import format_cache_stats, replay_corpus
+from lapa_ng.corpus import create_translator, find_naf_files, translate_naf_file
+from lapa_ng.factory import create_matcher, parse_matcher_spec
 from lapa_ng.naf import parse_naf
-from lapa_ng.table_rules import load_regex_matcher_list
+from lapa_ng.rules_compiled import COMPILED_RULES_SUFFIX, save_compiled_rules
 from lapa_ng.text_clean import clean_words, default_cleaners
-from lapa_ng.translator import CachedTranslator, MatchingTranslator
 from lapa_ng.types import Word
 
 
@@ -38,6 +42,8 @@ def convert_excel(rule_file: str, output_file: str, sheet: str | None):
         output_file: Path to output YAML file
         sheet: Optional sheet name to convert
     """
+    from lapa_ng.table_rules import load_regex_matcher_list
+
     matcher_list = load_regex_matcher_list(rule_file, sheet_name=sheet)
     rules = [r.spec.asdict() for r in matcher_list]
 
@@ -49,74 +55,295 @@ def convert_excel(rule_file: str, output_file: str, sheet: str | None):
 
 
 @cli.command()
-@click.argument("translator")
+@click.argument("matcher_spec")
+@click.argument("output_file", type=click.Path(dir_okay=False))
+def compile_rules(matcher_spec: str, output_file: str):
+    """Compile a rule set for fast loading.
+
+    The compiled rule set contains the resolved patterns and phonemes in
+    priority order. It can be used wherever a matcher specification is
+    expected, e.g. 'ng:rules.lapa'.
+
+    Args:
+        matcher_spec: The ng matcher specification of the rules to compile
+        output_file: Path to the compiled rule set, should end in .lapa
+    """
+    spec = parse_matcher_spec(matcher_spec)
+    if spec.prefix != "ng":
+        raise click.UsageError("Only ng rule sets can be compiled")
+    if not output_file.endswith(COMPILED_RULES_SUFFIX):
+        raise click.UsageError(
+            f"The compiled rule set must have a {COMPILED_RULES_SUFFIX} suffix"
+        )
+
+    matcher = create_matcher(matcher_spec)
+    with open(spec.filename, "rb") as f:
+        source_hash = hashlib.sha256(f.read()).hexdigest()
+
+    fingerprint = save_compiled_rules(
+        [rule.spec for rule in matcher.rules],
+        output_file,
+        source={
+            "matcher_spec": matcher_spec,
+            "filename": Path(spec.filename).name,
+            "sha256": source_hash,
+        },
+    )
+    print(f"Compiled {len(matcher.rules)} rules to {output_file} ({fingerprint[:12]})")
+
+
+@cli.command()
+@click.argument("matcher_spec")
 @click.argument("naf_file", type=click.Path(exists=True))
-def translate_naf(matcher_spec: str, naf_file: str):
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False),
+    default="output.csv",
+    help="Output file, a .parquet suffix writes Parquet instead of CSV",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Directory for a persistent translation cache, reused across runs",
+)
+@click.option(
+    "--stats",
+    is_flag=True,
+    help="Print cache statistics to stderr when done",
+)
+def translate_naf(
+    matcher_spec: str, naf_file: str, output: str, cache_dir: str | None, stats: bool
+):
     """Translate text from a NAF file using specified rules.
 
     Args:
         matcher_spec: The type of matcher to use. Uses the common rules for the matcher factory.
         naf_file: Path to input NAF file
+        output: Path to the output file
+        cache_dir: Directory for a persistent translation cache
+        stats: Whether to print cache statistics
     """
-    matcher = create_matcher(matcher_spec)
-    translator = MatchingTranslator(matcher)
-    translator = CachedTranslator(translator)
+    translator = create_translator(matcher_spec, cache_dir)
+    translate_naf_file(translator, naf_file, output)
+
+    if stats:
+        click.echo(format_cache_stats(translator.cache_stats()), err=True)
 
-    input = parse_naf(naf_file)
-    input = clean_words(input, default_cleaners)
-    output = translator.translate(input, emit="phoneme")
-
-    with open("output.csv", "w") as f:
-        writer = csv.writer(f, quoting=csv.QUOTE_NONNUMERIC, delimiter=",")
-        writer.writerow(
-            [
-                "id",
-                "text",
-                "start",
-                "matched",
-                "phoneme",
-                "rule_id",
-                "rules_attempted",
-            ]
-        )
 
-        for result in output:
-            attribs = result.word.attributes
-            text = result.word.text
-            word_id = attribs.get("id", "")
-            ruled_id = result.match_results[0].rule_id
-            rules_attempted = len(result.match_results[0].rules_attempted)
-
-            for ph_ix, ph in enumerate(result.phonemes):
-                writer.writerow(
-                    [
-                        word_id,
-                        text,
-                        ph_ix,
-                        ph.sampa,
-                        ruled_id,
-                        rules_attempted,
-                    ]
-                )
+@cli.command()
+@click.argument("matcher_spec")
+@click.argument("sources", type=str, nargs=-1, required=True)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False),
+    default=".",
+    help="Directory to write the output files to",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["csv", "parquet"]),
+    default="csv",
+    help="Output file format",
+)
+@click.option(
+    "--workers",
+    "-j",
+    type=int,
+    default=None,
+    help="Number of worker processes, defaults to the number of CPUs",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Directory for a persistent translation cache, reused across runs",
+)
+def translate_corpus(
+    matcher_spec: str,
+    sources: List[str],
+    output_dir: str,
+    output_format: str,
+    workers: int | None,
+    cache_dir: str | None,
+):
+    """Translate NAF files in parallel, writing one output file per NAF file.
+
+    Args:
+        matcher_spec: The type of matcher to use. Uses the common rules for the matcher factory.
+        sources: NAF files, directories containing NAF files, or glob patterns
+        output_dir: Directory to write the output files to
+        output_format: The output file format, csv or parquet
+        workers: Number of worker processes
+        cache_dir: Directory for a persistent translation cache
+    """
+    naf_files = [f for source in sources for f in find_naf_files(source)]
+    if not naf_files:
+        raise click.UsageError("No NAF files found")
+
+    results = corpus.translate_corpus(
+        matcher_spec,
+        naf_files,
+        output_dir,
+        max_workers=workers,
+        output_format=output_format,
+        cache_dir=cache_dir,
+    )
+    for naf_file, output_file, rows in results:
+        print(f"{naf_file} -> {output_file} ({rows} rows)")
 
 
 @cli.command()
 @click.argument("matcher_spec")
 @click.argument("words", type=str, nargs=-1)
-def translate_words(matcher_spec: str, words: List[str]):
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Directory for a persistent translation cache, reused across runs",
+)
+@click.option(
+    "--stats",
+    is_flag=True,
+    help="Print cache statistics to stderr when done",
+)
+def translate_words(
+    matcher_spec: str, words: List[str], cache_dir: str | None, stats: bool
+):
     """Test word transcription using specified rules and engine.
 
     Args:
         matcher_spec: The type of matcher to use. Uses the common rules for the matcher factory.
         words: One or more words to transcribe
+        cache_dir: Directory for a persistent translation cache
+        stats: Whether to print cache statistics
     """
-    matcher = create_matcher(matcher_spec)
-    translator = MatchingTranslator(matcher)
-    translator = CachedTranslator(translator)
+    translator = create_translator(matcher_spec, cache_dir)
 
     input = [Word(text=w, attributes={"id": str(ix)}) for ix, w in enumerate(words)]
     input = clean_words(input, default_cleaners)
-    output = translator.translate(input, emit="word")
+    output = translator.translate_batch(input, emit="word")
 
     for result in output:
         print(result.word.text, " ".join([ph.sampa for ph in result.phonemes]))
+
+    if stats:
+        click.echo(format_cache_stats(translator.cache_stats()), err=True)
+
+
+@cli.command()
+@click.argument("sources", type=str, nargs=-1, required=True)
+@click.option(
+    "--target-hit-rate",
+    type=click.FloatRange(0, 1),
+    default=0.95,
+    show_default=True,
+    help="The hit rate the recommended cache sizes should reach",
+)
+def cache_report(sources: List[str], target_hit_rate: float):
+    """Replay a corpus and recommend cache sizes for a target hit rate.
+
+    Args:
+        sources: NAF files, directories containing NAF files, or glob patterns
+        target_hit_rate: The hit rate the recommended cache sizes should reach
+    """
+    naf_files = [f for source in sources for f in find_naf_files(source)]
+    if not naf_files:
+        raise click.UsageError("No NAF files found")
+
+    words = [
+        word
+        for naf_file in naf_files
+        for word in clean_words(parse_naf(naf_file), default_cleaners)
+    ]
+    recommendations = replay_corpus(words, target_hit_rate)
+
+    print(f"{len(words):,} words, {len({w.text for w in words}):,} distinct")
+    for name, (size, hit_rate) in recommendations.items():
+        print(f"{name}: size {size:,} reaches a hit rate of {hit_rate:.1%}")
+
+
+@cli.command()
+@click.argument("rule_file", type=click.Path(exists=True))
+@click.option("--sheet", type=str)
+@click.option(
+    "--words",
+    "corpus_size",
+    type=int,
+    default=20_000,
+    help="Number of words in the synthetic corpus",
+)
+@click.option(
+    "--engine",
+    "engines",
+    type=click.Choice(benchmark_module.ENGINES),
+    multiple=True,
+    help="Engine to benchmark, can be repeated. Defaults to all engines",
+)
+@click.option(
+    "--output", "-o", type=click.Path(dir_okay=False), help="Write results to JSON"
+)
+@click.option(
+    "--compare",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Compare against the results in this JSON file",
+)
+@click.option(
+    "--tolerance",
+    type=float,
+    default=0.1,
+    help="Relative slowdown accepted before a stage is reported as a regression",
+)
+def benchmark(
+    rule_file: str,
+    sheet: str | None,
+    corpus_size: int,
+    engines: tuple[str, ...],
+    output: str | None,
+    compare: str | None,
+    tolerance: float,
+):
+    """Benchmark rule loading and translation on a synthetic corpus.
+
+    Args:
+        rule_file: Path to the Excel rules file
+        sheet: Optional sheet name
+        corpus_size: Number of words in the synthetic corpus
+        engines: Engines to benchmark
+        output: Optional path to write the results to
+        compare: Optional path of earlier results to compare against
+        tolerance: Relative slowdown accepted before reporting a regression
+    """
+    results = benchmark_module.run_benchmarks(
+        rule_file,
+        sheet_name=sheet,
+        corpus_size=corpus_size,
+        engines=engines or benchmark_module.ENGINES,
+    )
+
+    print(f"{'stage':<24}{'items/s':>14}{'us/item':>14}{'peak memory':>14}")
+    for name, result in results["results"].items():
+        print(
+            f"{name:<24}{result['items_per_second']:>14,.1f}"
+            f"{result['microseconds_per_item']:>14,.1f}{result['peak_memory']:>14,}"
+        )
+
+    if output:
+        benchmark_module.save_results(results, output)
+
+    if compare:
+        baseline = benchmark_module.load_results(compare)
+        comparison = benchmark_module.compare_results(baseline, results, tolerance)
+        print()
+        print(f"{'stage':<24}{'latency':>14}{'memory':>14}")
+        for c in comparison:
+            flag = "  REGRESSION" if c["regression"] else ""
+            print(
+                f"{c['name']:<24}{c['latency_change']:>+14.1%}"
+                f"{c['memory_change']:>+14.1%}{flag}"
+            )
+        if any(c["regression"] for c in comparison):
+            raise SystemExit(1)
@@ -0,0 +1,440 @@
+"""
+Benchmarks for LAPA-NG.
+
+This module measures the cost of loading rules and translating words with the
+next-generation and classic engines. Benchmarks run against a rules file and
+a synthetic, Zipf distributed corpus of Dutch-like words, and report the
+throughput, latency and peak memory of every stage.
+
+Results are plain JSON so that runs for different commits can be stored and
+compared with :func:`compare_results`.
+"""
+
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Sequence
+
+from lapa_ng.types import TranslationResult, Translator, Word, WordOrWordList
+
+__all__ = [
+    "BenchmarkResult",
+    "compare_results",
+    "load_results",
+    "run_benchmarks",
+    "save_results",
+    "synthetic_corpus",
+]
+
+RESULTS_VERSION = 1
+
+ENGINES = ("ng", "classic")
+
+# Spelling fragments of early modern Dutch used to build the synthetic corpus
+_ONSETS = (
+    "", "", "b", "d", "g", "gh", "h", "j", "k", "l", "m", "n", "p", "r", "s",
+    "t", "v", "w", "z", "br", "dr", "gr", "kr", "schr", "sch", "st", "tr", "vr",
+)  # fmt: skip
+_NUCLEI = (
+    "a", "e", "i", "o", "u", "aa", "ae", "ee", "ei", "eu", "ie", "ij", "oe",
+    "oo", "ou", "au", "ui", "uy", "y",
+)  # fmt: skip
+_CODAS = (
+    "", "", "", "n", "r", "l", "t", "ck", "ch", "cht", "ght", "nd", "ng", "s",
+    "ts", "f", "m", "rt",
+)  # fmt: skip
+
+
+@dataclass
+class BenchmarkResult:
+    """The measurements of a single benchmark stage.
+
+    Attributes:
+        name: The name of the stage, e.g. "ng.translate"
+        seconds: The wall time of the stage
+        items: The number of items processed by the stage
+        peak_memory: The peak memory allocated during the stage, in bytes
+        extra: Additional stage specific measurements
+    """
+
+    name: str
+    seconds: float
+    items: int
+    peak_memory: int
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def items_per_second(self) -> float:
+        """Return the throughput of the stage."""
+        return self.items / self.seconds if self.seconds else 0.0
+
+    @property
+    def microseconds_per_item(self) -> float:
+        """Return the mean latency per item of the stage."""
+        return self.seconds * 1_000_000 / self.items if self.items else 0.0
+
+    def asdict(self) -> dict[str, Any]:
+        """Return a serializable dictionary representation of the result."""
+        return {
+            **asdict(self),
+            "items_per_second": self.items_per_second,
+            "microseconds_per_item": self.microseconds_per_item,
+        }
+
+
+class _CountingTranslator(Translator):
+    """A translator that counts the words passed on to its parent."""
+
+    def __init__(self, parent: Translator):
+        self.parent = parent
+        self.calls = 0
+
+    def translate(self, word: WordOrWordList, *, emit=None):
+        self.calls += 1
+        return self.parent.translate(word, emit=emit)
+
+
+def synthetic_corpus(size: int, vocabulary: int = 5_000, seed: int = 1) -> list[Word]:
+    """Create a synthetic corpus of Dutch-like words.
+
+    Words are drawn from a generated vocabulary with a Zipf distribution, so a
+    few forms make up most of the tokens, as in natural text.
+
+    Args:
+        size: The number of words in the corpus
+        vocabulary: The number of distinct word forms to draw from
+        seed: The random seed, the same seed always gives the same corpus
+
+    Returns:
+        List of words with an id attribute
+    """
+    rng = random.Random(seed)
+
+    forms = []
+    seen = set()
+    while len(forms) < vocabulary:
+        syllables = rng.choice((1, 1, 2, 2, 2, 3, 3, 4))
+        form = "".join(
+            rng.choice(_ONSETS) + rng.choice(_NUCLEI) + rng.choice(_CODAS)
+            for _ in range(syllables)
+        )
+        if form not in seen:
+            seen.add(form)
+            forms.append(form)
+
+    weights = [1 / rank for rank in range(1, vocabulary + 1)]
+    texts = rng.choices(forms, weights=weights, k=size)
+    return [Word(text, {"id": f"w{ix}"}) for ix, text in enumerate(texts)]
+
+
+def _measure(
+    name: str,
+    func: Callable[[Any], Any],
+    items: int,
+    setup: Callable[[], Any] = lambda: None,
+) -> tuple[BenchmarkResult, Any]:
+    """Run a function and measure its wall time and peak memory.
+
+    The function is run twice, each time on fresh state from ``setup``: once
+    for the wall time and once under tracemalloc for the peak memory, as
+    tracing allocations slows the code down considerably.
+
+    Args:
+        name: The name of the stage
+        func: The function to run, called with the state returned by setup
+        items: The number of items processed by the function
+        setup: Creates the state for a run, this is not measured
+
+    Returns:
+        The result of the measurement and the state and return value of the timed run
+    """
+    state = setup()
+    start = time.perf_counter()
+    value = func(state)
+    seconds = time.perf_counter() - start
+
+    memory_state = setup()
+    tracemalloc.start()
+    try:
+        func(memory_state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(name, seconds, items, peak), (state, value)
+
+
+def _consume(results: Iterable[TranslationResult]) -> int:
+    """Exhaust a stream of translation results and return its length."""
+    return sum(1 for _ in results)
+
+
+def _benchmark_ng(
+    rules_file: str, sheet_name: str | None, words: Sequence[Word]
+) -> list[BenchmarkResult]:
+    """Benchmark the next-generation engine."""
+    from lapa_ng.rules_regex import RegexListMatcher
+    from lapa_ng.rules_vectorized import VectorizedTranslator
+    from lapa_ng.table_rules import load_regex_matcher_list
+    from lapa_ng.table_rules._io import read_excel
+    from lapa_ng.translator import CachedTranslator, MatchingTranslator
+
+    results = []
+
+    result, (_, rules) = _measure(
+        "ng.read_excel", lambda _: read_excel(rules_file, sheet_name=sheet_name), 1
+    )
+    result.extra["rules"] = len(rules)
+    results.append(result)
+
+    result, (_, matchers) = _measure(
+        "ng.load", lambda _: load_regex_matcher_list(rules_file, sheet_name), 1
+    )
+    result.extra["rules"] = len(matchers)
+    results.append(result)
+
+    positions = [(w, ix) for w in words for ix in range(len(w.text))]
+    result, _ = _measure(
+        "ng.match",
+        lambda matcher: [list(matcher.match(w, ix)) for w, ix in positions],
+        len(positions),
+        setup=lambda: RegexListMatcher(matchers),
+    )
+    results.append(result)
+
+    result, _ = _measure(
+        "ng.translate",
+        lambda translator: _consume(translator.translate(words, emit="word")),
+        len(words),
+        setup=lambda: MatchingTranslator(RegexListMatcher(matchers)),
+    )
+    results.append(result)
+
+    result, _ = _measure(
+        "ng.translate_lean",
+        lambda translator: _consume(translator.translate(words, emit="word")),
+        len(words),
+        setup=lambda: MatchingTranslator(RegexListMatcher(matchers, trace=False)),
+    )
+    results.append(result)
+
+    result, _ = _measure(
+        "ng.translate_codegen",
+        lambda translator: _consume(translator.translate(words, emit="word")),
+        len(words),
+        setup=lambda: MatchingTranslator(RegexListMatcher(matchers, codegen=True)),
+    )
+    results.append(result)
+
+    result, _ = _measure(
+        "ng.translate_codegen_lean",
+        lambda translator: _consume(translator.translate(words, emit="word")),
+        len(words),
+        setup=lambda: MatchingTranslator(
+            RegexListMatcher(matchers, trace=False, codegen=True)
+        ),
+    )
+    results.append(result)
+
+    result, _ = _measure(
+        "ng.translate_batch",
+        lambda translator: _consume(translator.translate_batch(words, emit="word")),
+        len(words),
+        setup=lambda: MatchingTranslator(RegexListMatcher(matchers)),
+    )
+    results.append(result)
+
+    def setup_cached():
+        counting = _CountingTranslator(MatchingTranslator(RegexListMatcher(matchers)))
+        return counting, CachedTranslator(counting)
+
+    result, ((counting, _), _) = _measure(
+        "ng.translate_cached",
+        lambda state: _consume(state[1].translate(words, emit="word")),
+        len(words),
+        setup=setup_cached,
+    )
+    result.extra["hit_rate"] = 1 - counting.calls / len(words) if words else 0.0
+    results.append(result)
+
+    result, _ = _measure(
+        "ng.vectorized",
+        lambda translator: translator.match_corpus(words),
+        len(words),
+        setup=lambda: VectorizedTranslator(RegexListMatcher(matchers)),
+    )
+    results.append(result)
+
+    return results
+
+
+def _benchmark_classic(
+    rules_file: str, sheet_name: str | None, words: Sequence[Word]
+) -> list[BenchmarkResult]:
+    """Benchmark the classic engine."""
+    from lapa_ng.classic import ClassicMatcher
+    from lapa_ng.translator import MatchingTranslator
+
+    results = []
+
+    result, (_, matcher) = _measure(
+        "classic.load",
+        lambda _: ClassicMatcher(rules_file, sheet_name=sheet_name),
+        1,
+    )
+    result.extra["rules"] = len(matcher)
+    results.append(result)
+
+    result, _ = _measure(
+        "classic.translate",
+        lambda translator: _consume(translator.translate(words, emit="word")),
+        len(words),
+        setup=lambda: MatchingTranslator(matcher),
+    )
+    results.append(result)
+
+    untraced = ClassicMatcher(rules_file, sheet_name=sheet_name, trace=False)
+    result, _ = _measure(
+        "classic.translate_untraced",
+        lambda translator: _consume(translator.translate(words, emit="word")),
+        len(words),
+        setup=lambda: MatchingTranslator(untraced),
+    )
+    results.append(result)
+
+    return results
+
+
+def _git_commit() -> str | None:
+    """Return the current git commit, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_benchmarks(
+    rules_file: str | Path,
+    sheet_name: str | None = None,
+    corpus_size: int = 20_000,
+    engines: Sequence[str] = ENGINES,
+    seed: int = 1,
+) -> dict[str, Any]:
+    """Run the benchmarks for the given engines.
+
+    Args:
+        rules_file: Path to the Excel rules file
+        sheet_name: The sheet containing the rules
+        corpus_size: The number of words in the synthetic corpus
+        engines: The engines to benchmark, "ng" and/or "classic"
+        seed: The random seed for the synthetic corpus
+
+    Returns:
+        A serializable dictionary with the run metadata and the stage results
+
+    Raises:
+        ValueError: If an unknown engine is requested
+    """
+    for engine in engines:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine}, expected one of {ENGINES}")
+
+    rules_file = str(rules_file)
+    words = synthetic_corpus(corpus_size, seed=seed)
+
+    results = []
+    if "ng" in engines:
+        results.extend(_benchmark_ng(rules_file, sheet_name, words))
+    if "classic" in engines:
+        results.extend(_benchmark_classic(rules_file, sheet_name, words))
+
+    return {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rules_file": Path(rules_file).name,
+            "sheet_name": sheet_name,
+            "corpus_size": corpus_size,
+            "unique_words": len({w.text for w in words}),
+            "seed": seed,
+        },
+        "results": {r.name: r.asdict() for r in results},
+    }
+
+
+def save_results(results: dict[str, Any], output_file: str | Path) -> None:
+    """Save benchmark results to a JSON file."""
+    with open(output_file, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(input_file: str | Path) -> dict[str, Any]:
+    """Load benchmark results from a JSON file.
+
+    Raises:
+        ValueError: If the file was written by an incompatible version
+    """
+    with open(input_file, "r") as f:
+        results = json.load(f)
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(
+            f"Unsupported benchmark results version: {results.get('version')}"
+        )
+    return results
+
+
+def compare_results(
+    baseline: dict[str, Any], current: dict[str, Any], tolerance: float = 0.1
+) -> list[dict[str, Any]]:
+    """Compare two benchmark runs stage by stage.
+
+    Args:
+        baseline: The results of the reference run
+        current: The results of the run to compare
+        tolerance: The relative slowdown or memory growth that is still accepted
+
+    Returns:
+        One entry per stage present in both runs, with the relative change in
+        latency and peak memory and whether it is a regression
+    """
+    comparison = []
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+
+        latency = _relative_change(
+            old["microseconds_per_item"], new["microseconds_per_item"]
+        )
+        memory = _relative_change(old["peak_memory"], new["peak_memory"])
+        comparison.append(
+            {
+                "name": name,
+                "latency_change": latency,
+                "memory_change": memory,
+                "regression": latency > tolerance or memory > tolerance,
+            }
+        )
+    return comparison
+
+
+def _relative_change(old: float, new: float) -> float:
+    """Return the change from old to new relative to old."""
+    if not old:
+        return 0.0
+    return (new - old) / old
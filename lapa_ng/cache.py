@@ -0,0 +1,421 @@
+"""
+Persistent translation cache for LAPA-NG.
+
+This module provides an on-disk store for rule-level translations, so repeated
+runs over the same corpus do not have to match the same words again. The store
+is a SQLite database in a cache directory, shared by all rule sets and worker
+processes.
+
+Entries are keyed by the fingerprint of the rule set, the id of the cleaner
+pipeline and the word text. A change to the rules, their order (e.g. the sort
+option) or the cleaners gives a new fingerprint or pipeline id, so stale
+entries are not returned. The pipeline id covers the code and arguments of the
+cleaners, but not of other functions they call, see cleaner_fingerprint in
+lapa_ng.text_clean. Clear the cache directory after changing those.
+
+The module also provides statistics for the in-memory caches. StatsLFUCache
+counts hits, misses and evictions, and recommend_cache_size replays a sequence
+of lookups to find the smallest cache that reaches a target hit rate.
+"""
+
+import sqlite3
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Hashable, Iterable, Sequence
+
+from cachetools import LFUCache
+
+from lapa_ng.types import AttemptedRules, Matcher, Word
+
+__all__ = [
+    "CACHE_FILE_NAME",
+    "CacheStats",
+    "StatsLFUCache",
+    "TranslationStore",
+    "approximate_size",
+    "format_cache_stats",
+    "matcher_fingerprint",
+    "recommend_cache_size",
+    "replay_corpus",
+]
+
+CACHE_FILE_NAME = "translations.sqlite"
+
+# Bump when the serialized form of the translations changes
+CACHE_FORMAT_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    ruleset TEXT NOT NULL,
+    pipeline TEXT NOT NULL,
+    text TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (ruleset, pipeline, text)
+) WITHOUT ROWID
+"""
+
+
+def matcher_fingerprint(matcher: Matcher) -> str:
+    """Return the fingerprint of the rule set of a matcher.
+
+    Args:
+        matcher: The matcher, which must have a fingerprint attribute
+
+    Returns:
+        The fingerprint, prefixed with the cache format version
+
+    Raises:
+        ValueError: If the matcher does not provide a fingerprint
+    """
+    fingerprint = getattr(matcher, "fingerprint", None)
+    if not fingerprint:
+        raise ValueError(
+            f"{type(matcher).__name__} does not provide a rule set fingerprint "
+            "and cannot be used with a persistent cache"
+        )
+    return f"v{CACHE_FORMAT_VERSION}:{fingerprint}"
+
+
+class TranslationStore:
+    """An on-disk store of serialized translations for a single rule set.
+
+    Reads go straight to the database, writes are buffered and written in a
+    single transaction by flush, which is much faster than committing every
+    word. Several processes can share the same database.
+
+    Attributes:
+        path: The path of the SQLite database
+        ruleset: The fingerprint of the rule set the translations belong to
+        pipeline: The id of the cleaner pipeline the words were cleaned with
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        ruleset: str,
+        pipeline: str = "",
+        buffer_size: int = 1_000,
+    ):
+        """Open or create a translation store.
+
+        Args:
+            path: The SQLite database file, its directory is created if needed
+            ruleset: The fingerprint of the rule set
+            pipeline: The id of the cleaner pipeline
+            buffer_size: The number of pending writes that triggers a flush
+        """
+        self.path = Path(path)
+        self.ruleset = ruleset
+        self.pipeline = pipeline
+        self.buffer_size = buffer_size
+        self._pending: dict[str, str] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, timeout=60)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(_SCHEMA)
+
+    @classmethod
+    def for_matcher(
+        cls, cache_dir: str | Path, matcher: Matcher, pipeline: str = ""
+    ) -> "TranslationStore":
+        """Open the store for a matcher in a cache directory.
+
+        Args:
+            cache_dir: The cache directory
+            matcher: The matcher whose translations are stored
+            pipeline: The id of the cleaner pipeline
+
+        Returns:
+            The translation store
+
+        Raises:
+            ValueError: If the matcher does not provide a fingerprint
+        """
+        return cls(
+            Path(cache_dir) / CACHE_FILE_NAME, matcher_fingerprint(matcher), pipeline
+        )
+
+    def get(self, text: str) -> str | None:
+        """Return the serialized translation of a text, if stored.
+
+        Args:
+            text: The word text
+
+        Returns:
+            The serialized translation, or None if it is not stored
+        """
+        value = self._pending.get(text)
+        if value is not None:
+            return value
+
+        row = self._connection.execute(
+            "SELECT value FROM translations WHERE ruleset = ? AND pipeline = ? AND text = ?",
+            (self.ruleset, self.pipeline, text),
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, text: str, value: str) -> None:
+        """Store the serialized translation of a text.
+
+        Args:
+            text: The word text
+            value: The serialized translation
+        """
+        self._pending[text] = value
+        if len(self._pending) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the pending translations to the database."""
+        if not self._pending:
+            return
+
+        rows: Iterable[tuple[str, str, str, str]] = (
+            (self.ruleset, self.pipeline, text, value)
+            for text, value in self._pending.items()
+        )
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO translations (ruleset, pipeline, text, value) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        self._pending.clear()
+
+    def __len__(self) -> int:
+        """Return the number of stored translations for this rule set and pipeline."""
+        self.flush()
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM translations WHERE ruleset = ? AND pipeline = ?",
+            (self.ruleset, self.pipeline),
+        ).fetchone()[0]
+
+    def close(self) -> None:
+        """Flush the pending translations and close the database."""
+        self.flush()
+        self._connection.close()
+
+    def __enter__(self) -> "TranslationStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """A snapshot of the statistics of a cache.
+
+    Attributes:
+        name: The name of the cache
+        hits: The number of lookups that found an entry
+        misses: The number of lookups that did not find an entry
+        evictions: The number of entries removed to make room for new entries
+        size: The current number of entries
+        maxsize: The maximum number of entries
+        memory: The approximate memory used by the entries, in bytes
+    """
+
+    name: str
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+    memory: int
+
+    @property
+    def lookups(self) -> int:
+        """Return the total number of lookups."""
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups that found an entry."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class StatsLFUCache(LFUCache):
+    """An LFU cache that counts its hits, misses and evictions.
+
+    Only lookups through get are counted, which is how the translators and
+    matchers read their caches.
+
+    Attributes:
+        hits: The number of lookups that found an entry
+        misses: The number of lookups that did not find an entry
+        evictions: The number of entries evicted
+    """
+
+    def __init__(self, maxsize: int, getsizeof=None):
+        super().__init__(maxsize, getsizeof)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for a key, or the default if it is not cached."""
+        if key in self:
+            self.hits += 1
+            return self[key]
+        self.misses += 1
+        return default
+
+    def popitem(self) -> tuple[Hashable, Any]:
+        """Remove and return the least frequently used entry."""
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+    def stats(self, name: str) -> CacheStats:
+        """Return a snapshot of the statistics of the cache.
+
+        Args:
+            name: The name to report the cache under
+
+        Returns:
+            The cache statistics
+        """
+        return CacheStats(
+            name=name,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self),
+            maxsize=self.maxsize,
+            memory=approximate_size(list(self.items())),
+        )
+
+
+def approximate_size(obj: Any, seen: set[int] | None = None) -> int:
+    """Return the approximate memory used by an object and everything it refers to.
+
+    Objects referred to more than once, such as shared phonemes and interned
+    rule ids, are only counted once. Classes are not counted, and neither are
+    the candidate rules an AttemptedRules refers to, as they belong to the
+    matcher.
+
+    Args:
+        obj: The object to size
+        seen: The ids of objects already counted
+
+    Returns:
+        The approximate size in bytes
+    """
+    seen = set() if seen is None else seen
+    stack = [obj]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+
+        if (
+            isinstance(obj, (str, bytes, int, float, bool, AttemptedRules))
+            or obj is None
+        ):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (tuple, list, set, frozenset)):
+            stack.extend(obj)
+        else:
+            if hasattr(obj, "__dict__"):
+                stack.append(obj.__dict__)
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+    return total
+
+
+def _replay_hit_rate(keys: Sequence[Hashable], maxsize: int) -> float:
+    """Return the hit rate of an LFU cache of the given size for a sequence of lookups."""
+    cache = StatsLFUCache(maxsize=maxsize)
+    for key in keys:
+        if cache.get(key) is None:
+            cache[key] = True
+    return cache.stats("replay").hit_rate
+
+
+def recommend_cache_size(
+    keys: Sequence[Hashable], target_hit_rate: float
+) -> tuple[int, float]:
+    """Find the smallest LFU cache that reaches a target hit rate.
+
+    The lookups are replayed against caches of different sizes, found by
+    bisection. The first lookup of every key always misses, so if the target is
+    above what any cache can reach, the number of distinct keys is returned.
+
+    Args:
+        keys: The keys looked up, in order
+        target_hit_rate: The hit rate to reach, between 0 and 1
+
+    Returns:
+        The recommended cache size and the hit rate it reaches
+    """
+    unique = len(set(keys))
+    if unique == 0:
+        return 0, 0.0
+
+    best = _replay_hit_rate(keys, unique)
+    if target_hit_rate >= best:
+        return unique, best
+
+    low, high, high_rate = 1, unique, best
+    while low < high:
+        middle = (low + high) // 2
+        rate = _replay_hit_rate(keys, middle)
+        if rate >= target_hit_rate:
+            high, high_rate = middle, rate
+        else:
+            low = middle + 1
+    return high, high_rate
+
+
+def replay_corpus(
+    words: Sequence[Word], target_hit_rate: float = 0.95
+) -> dict[str, tuple[int, float]]:
+    """Recommend cache sizes for translating a corpus.
+
+    The translation cache is looked up once for every word of the corpus, so
+    it is sized by replaying the word texts in order.
+
+    Args:
+        words: The words of the corpus, in order
+        target_hit_rate: The hit rate to reach, between 0 and 1
+
+    Returns:
+        The recommended size and the hit rate it reaches, by cache name
+    """
+    return {
+        "translator": recommend_cache_size([w.text for w in words], target_hit_rate)
+    }
+
+
+def format_cache_stats(stats: Iterable[CacheStats]) -> str:
+    """Format cache statistics as a table.
+
+    Args:
+        stats: The cache statistics
+
+    Returns:
+        The table, one line per cache
+    """
+    lines = [
+        f"{'cache':<16}{'hits':>12}{'misses':>12}{'hit rate':>10}"
+        f"{'evictions':>12}{'size':>10}{'maxsize':>10}{'memory':>14}"
+    ]
+    for s in stats:
+        lines.append(
+            f"{s.name:<16}{s.hits:>12,}{s.misses:>12,}{s.hit_rate:>10.1%}"
+            f"{s.evictions:>12,}{s.size:>10,}{s.maxsize:>10,}{s.memory:>14,}"
+        )
+    return "\n".join(lines)
@@ -1,4 +1,5 @@
 import csv
+import hashlib
 from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
@@ -10,7 +11,7 @@ import yaml
 
 from lapa_classic.sampify import Rules, Sampify
 from lapa_ng.phonemes import PhonemeList
-from lapa_ng.types import ContextualMatchResult, Matcher, MatchResult, Word
+from lapa_ng.types import ContextualMatchResult, Matcher, MatchResult, Phoneme, Word
 
 
 class _CallInterceptor:
@@ -30,6 +31,98 @@ class _CallInterceptor:
         return value
 
 
+class _IncrementalSampify(Sampify):
+    """A Sampify that translates a word in a single pass, without logging.
+
+    The original Sampify formats a debug message for every rule it tests and
+    applies, even when debug logging is disabled. After every rule it rebuilds
+    the word and its letter classes as new lists, and scans them again from the
+    start for the next letter to translate, which is quadratic in the length of
+    the word.
+
+    Everything before the first untranslated letter has been translated and
+    everything after it is still the original word, so this subclass keeps a
+    cursor in the original word and appends the replacements to an output
+    buffer instead. Rules are tested against the original word at the cursor,
+    which is what the original sees at the same position. The output is the
+    same as that of Sampify.translate.
+
+    The rules applied are recorded as (position, rule) pairs in applied, with
+    the position in the partly translated word as the original reports it.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.applied = []
+
+    def _test_rule(self, wl, tl, Nsyllab, rule, position, rulenumber):
+        expression = rule["rule"]
+        if type(expression) is int:
+            return expression == Nsyllab
+
+        # Past the end of the word, the cases are tested against None
+        remaining = len(wl) - position
+        test_case = self._test_case
+        for i, case in enumerate(expression):
+            if i < remaining:
+                matched = test_case(wl[position + i], tl[position + i], case)
+            else:
+                matched = test_case(None, None, case)
+            if not matched:
+                return False
+        return True
+
+    def _find_rule_at(self, wl, tl, Nsyllab, position, at_start, rules):
+        """Find the rule for a letter, as _find_rule does at the start of the word or elsewhere."""
+        if at_start and wl[position] in rules["P"]:
+            prefix_rules = rules["P"][wl[position]]["default"]
+            for i in sorted(prefix_rules):
+                if self._test_rule(wl, tl, Nsyllab, prefix_rules[i], position, i):
+                    return i, prefix_rules[i]
+        letter_rules = rules[tl[position]][wl[position]]
+        for i in sorted(letter_rules["rules"]):
+            if self._test_rule(wl, tl, Nsyllab, letter_rules["rules"][i], position, i):
+                return i, letter_rules["rules"][i]
+        return 0, letter_rules["default"][0]
+
+    def _num_syll(self, l):
+        if l[0] == "C":
+            vow, lettergrepen = False, 0
+        else:
+            vow, lettergrepen = True, 1
+        for i in range(1, len(l)):
+            if l[i] == "C" and vow:
+                vow = False
+            if l[i] == "V" and not vow:
+                vow, lettergrepen = True, lettergrepen + 1
+        return lettergrepen
+
+    def clean(self, w):
+        return self.strip_accents(w.lower())
+
+    def translate(self, word):
+        word_l, chlog = self._gen_chlog(self.clean(word))
+        syllables = self._num_syll(chlog)
+
+        output = []
+        cursor = 0
+        while cursor < len(word_l):
+            # Unknown letters are not translated and stay in the word
+            if chlog[cursor] == "S":
+                output.append(word_l[cursor])
+                cursor += 1
+                continue
+
+            position = len(output)
+            _rulenum, rule = self._find_rule_at(
+                word_l, chlog, syllables, cursor, position == 0, self.rules
+            )
+            self.applied.append((position, rule))
+            output.extend(rule["replaceby"])
+            cursor += len(rule["replaced"])
+        return "".join(output)
+
+
 @dataclass
 class RuleId:
     rule_id: str
@@ -97,20 +190,64 @@ def excel_to_rules(
     return parsed_rules, rule_ids
 
 
+def _file_fingerprint(file: str, sheet_name: str | None) -> str:
+    """Return a fingerprint of a classic rules file and sheet.
+
+    The rule ids contain the file name and sheet, so these are part of the
+    fingerprint as well as the content of the file.
+    """
+    digest = hashlib.sha256(f"classic:{Path(file).name}:{sheet_name}:".encode())
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 class ClassicMatcher(Matcher):
+    """A matcher that translates words with the original Sampify engine.
+
+    By default every rule Sampify tests and applies is traced, so the match
+    results list the rules attempted before each match. Without tracing,
+    words are translated by an incremental Sampify in a single pass without
+    debug logging, which is much faster, and the match results have no rules
+    attempted. The phonemes, rules and spans are the same in both modes.
 
-    def __init__(self, file: str, sheet_name: str | None = None):
+    Attributes:
+        trace: Whether the rules attempted are traced
+        fingerprint: The fingerprint of the rules file, sheet and trace mode
+    """
+
+    def __init__(self, file: str, sheet_name: str | None = None, trace: bool = True):
+        """Load the classic rules.
+
+        Args:
+            file: The path to the Excel file containing the rules
+            sheet_name: The name of the sheet in the Excel file containing the rules
+            trace: Whether to trace the rules attempted for every match
+        """
         rules, rule_ids = excel_to_rules(file, sheet_name)
 
         self.rule_ids = {
             (rule.first_letter, rule.description): rule for rule in rule_ids
         }
 
-        self.sampify = Sampify()
-        self.sampify._add_rules(rules)
-        self.sampify._test_rule = _CallInterceptor(self.sampify._test_rule)
-        self.sampify._apply_rule = _CallInterceptor(self.sampify._apply_rule)
+        self.trace = trace
+        if trace:
+            self.sampify = Sampify()
+            self.sampify._add_rules(rules)
+            self.sampify._test_rule = _CallInterceptor(self.sampify._test_rule)
+            self.sampify._apply_rule = _CallInterceptor(self.sampify._apply_rule)
+        else:
+            self.sampify = _IncrementalSampify()
+            self.sampify._add_rules(rules)
         self.phoneme_list = PhonemeList.default()
+        self._phonemes: dict[str, tuple[Phoneme, ...]] = {}
+
+        # The rules attempted are part of the results, so the trace mode is
+        # part of the fingerprint of the persistent cache
+        self.fingerprint = _file_fingerprint(file, sheet_name)
+        if not trace:
+            self.fingerprint += ":notrace"
 
     @property
     def id(self) -> str:
@@ -125,6 +262,14 @@ class ClassicMatcher(Matcher):
         """Return the number of rules in this matcher."""
         return len(self.rule_ids)
 
+    def _split_phonemes(self, sampa: str) -> tuple[Phoneme, ...]:
+        """Split a replacement into phonemes, sharing one tuple per replacement."""
+        phonemes = self._phonemes.get(sampa)
+        if phonemes is None:
+            phonemes = self.phoneme_list.split_phonemes(sampa, ignore_errors=True)
+            self._phonemes[sampa] = phonemes
+        return phonemes
+
     def _rule_for_meta(self, meta):
         first_letter = meta["rule"][0]
         return self.rule_ids.get((first_letter, meta["description"]))
@@ -133,6 +278,10 @@ class ClassicMatcher(Matcher):
         if start != 0:
             return []
 
+        if not self.trace:
+            yield from self._match_untraced(word)
+            return
+
         translated = self.sampify.translate(word.text)
         trace = self.sampify._apply_rule.pop()
         candidates = self.sampify._test_rule.pop()
@@ -150,12 +299,13 @@ class ClassicMatcher(Matcher):
             position_mapper[position] = len(match_so_far)
 
             rule_id = self._rule_for_meta(rule)
+            match_start = len(match_so_far)
             match_so_far += rule_id.replaced
             trace_by_position[position] = (
                 rule_id.replaced,
                 rule_id.replaceby,
-                match_so_far,
-                word.text[len(match_so_far) :],
+                match_start,
+                len(match_so_far),
                 rule_id.rule_id,
                 rule_id.description,
             )
@@ -178,19 +328,44 @@ class ClassicMatcher(Matcher):
                 pass
 
             regexes = [self._rule_for_meta(r[3]) for r in args]
-            regexes = [r.rule_id if r else "missing rule" for r in regexes]
+            regexes = tuple(r.rule_id if r else "missing rule" for r in regexes)
             candidates_by_position[pos] = regexes
 
         for pos, value in trace_by_position.items():
-            ph = self.phoneme_list.split_phonemes(value[1], ignore_errors=True)
-            candidates = candidates_by_position[pos]
+            ph = self._split_phonemes(value[1])
+            candidates = tuple(candidates_by_position[pos])
 
             yield ContextualMatchResult(
                 word=word,
                 phonemes=ph,
-                start=pos,
-                matched=word.text,
-                remainder=value[3],
+                start=value[2],
+                end=value[3],
                 rule_id=value[4],
                 rules_attempted=candidates,
             )
+
+    def _match_untraced(self, word: Word) -> Generator[MatchResult, None, None]:
+        """Translate a word with the incremental Sampify and yield its match results."""
+        self.sampify.translate(word.text)
+        applied = self.sampify.applied
+        self.sampify.applied = []
+
+        # The spans are offsets of the replaced text, as in the traced mode a
+        # later rule applied at the same Sampify position replaces the earlier one
+        by_position = {}
+        match_end = 0
+        for position, rule in applied:
+            rule_id = self._rule_for_meta(rule)
+            match_start = match_end
+            match_end += len(rule_id.replaced)
+            by_position[position] = (rule_id, match_start, match_end)
+
+        for rule_id, match_start, match_end in by_position.values():
+            yield ContextualMatchResult(
+                word=word,
+                phonemes=self._split_phonemes(rule_id.replaceby),
+                start=match_start,
+                end=match_end,
+                rule_id=rule_id.rule_id,
+                rules_attempted=(),
+            )
@@ -0,0 +1,171 @@
+"""
+Parallel corpus translation for LAPA-NG.
+
+This module translates collections of NAF files, spreading the files over a
+pool of worker processes. Each worker builds its matcher from the factory
+specification once and then translates every file it is given.
+"""
+
+import glob
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable
+
+from lapa_ng.cache import TranslationStore
+from lapa_ng.factory import create_matcher
+from lapa_ng.naf import parse_naf
+from lapa_ng.output import OUTPUT_FORMATS, write_results
+from lapa_ng.text_clean import clean_words, default_cleaners
+from lapa_ng.translator import CachedTranslator, MatchingTranslator
+from lapa_ng.types import Translator
+
+__all__ = [
+    "create_translator",
+    "find_naf_files",
+    "translate_corpus",
+    "translate_naf_file",
+]
+
+NAF_FILE_PATTERNS = ("*.naf", "*.xml")
+
+# The translator of the current worker process, created by _init_worker
+_worker_translator: Translator | None = None
+
+
+def create_translator(
+    matcher_spec: str, cache_dir: str | Path | None = None
+) -> CachedTranslator:
+    """Create a cached translator for a matcher specification.
+
+    Args:
+        matcher_spec: The matcher specification, as used by the matcher factory
+        cache_dir: Optional directory for a persistent translation cache
+
+    Returns:
+        The translator
+    """
+    matcher = create_matcher(matcher_spec)
+    store = None
+    if cache_dir is not None:
+        store = TranslationStore.for_matcher(
+            cache_dir, matcher, pipeline=default_cleaners.pipeline_id
+        )
+    return CachedTranslator(MatchingTranslator(matcher), store=store)
+
+
+def find_naf_files(source: str | Path) -> list[Path]:
+    """Find the NAF files for a source.
+
+    Args:
+        source: A NAF file, a directory containing NAF files, or a glob pattern
+
+    Returns:
+        Sorted list of NAF file paths
+    """
+    path = Path(source)
+    if path.is_dir():
+        files = [f for pattern in NAF_FILE_PATTERNS for f in path.glob(pattern)]
+    elif path.is_file():
+        files = [path]
+    else:
+        files = [Path(f) for f in glob.glob(str(source), recursive=True)]
+
+    return sorted(set(f for f in files if f.is_file()))
+
+
+def translate_naf_file(
+    translator: MatchingTranslator | CachedTranslator,
+    naf_file: str | Path,
+    output_file: str | Path,
+) -> int:
+    """Translate a NAF file and write the phoneme-level results.
+
+    The words of the file are translated as one batch, so every distinct word
+    form is only translated once.
+
+    Args:
+        translator: The translator to use
+        naf_file: Path to the input NAF file
+        output_file: Path to the output file, the suffix selects CSV or Parquet
+
+    Returns:
+        The number of rows written
+    """
+    input = parse_naf(naf_file)
+    input = clean_words(input, default_cleaners)
+    output = translator.translate_batch(input, emit="phoneme")
+
+    return write_results(output, output_file)
+
+
+def _init_worker(matcher_spec: str, cache_dir: str | Path | None) -> None:
+    """Create the translator for a worker process."""
+    global _worker_translator
+    _worker_translator = create_translator(matcher_spec, cache_dir)
+
+
+def _translate_in_worker(naf_file: Path, output_file: Path) -> int:
+    """Translate a single file with the translator of the worker process."""
+    return translate_naf_file(_worker_translator, naf_file, output_file)
+
+
+def translate_corpus(
+    matcher_spec: str,
+    naf_files: Iterable[str | Path],
+    output_dir: str | Path,
+    max_workers: int | None = None,
+    output_format: str = "csv",
+    cache_dir: str | Path | None = None,
+) -> list[tuple[Path, Path, int]]:
+    """Translate a collection of NAF files in parallel.
+
+    Every NAF file is written to a file with the same stem in the output
+    directory. The files are processed in sorted order and the results are
+    returned in that same order, regardless of which worker finishes first.
+
+    Args:
+        matcher_spec: The matcher specification, as used by the matcher factory
+        naf_files: The NAF files to translate
+        output_dir: The directory to write the output files to
+        max_workers: The number of worker processes, defaults to the number of CPUs
+        output_format: The output format, "csv" or "parquet"
+        cache_dir: Optional directory for a persistent translation cache, shared
+            by the workers
+
+    Returns:
+        List of (input file, output file, rows written) tuples in sorted input order
+
+    Raises:
+        ValueError: If two input files would be written to the same output file,
+            or the output format is not supported
+    """
+    suffixes = {v: k for k, v in OUTPUT_FORMATS.items()}
+    if output_format not in suffixes:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    output_dir = Path(output_dir)
+    naf_files = sorted(set(Path(f) for f in naf_files))
+
+    jobs = []
+    outputs = {}
+    for naf_file in naf_files:
+        output_file = output_dir / f"{naf_file.stem}{suffixes[output_format]}"
+        if output_file in outputs:
+            raise ValueError(
+                f"Both {outputs[output_file]} and {naf_file} would be written to {output_file}"
+            )
+        outputs[output_file] = naf_file
+        jobs.append((naf_file, output_file))
+
+    if not jobs:
+        return []
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(matcher_spec, cache_dir),
+    ) as executor:
+        futures = [executor.submit(_translate_in_worker, *job) for job in jobs]
+        return [(*job, future.result()) for job, future in zip(jobs, futures)]
@@ -7,23 +7,23 @@ based on a specification string. The specification string follows the format:
 
 Where:
 - prefix: Optional prefix indicating the type of matcher ('ng' or 'classic')
-- filename: Path to the rules file (Excel or YAML)
+- filename: Path to the rules file (Excel, or a compiled rule set ending in .lapa)
 - sheet: Optional sheet name for Excel files
 
 Examples:
     ng:rules.xlsx#RULES      # Next-gen matcher with specific sheet
     classic:rules.xlsx       # Classic matcher, default sheet
     rules.xlsx#RULES         # Next-gen matcher (default prefix)
+    ng:rules.lapa            # Next-gen matcher from a compiled rule set
+
+Modules that need pandas are only imported once the matcher type is known, so
+loading a compiled rule set does not import pandas or xlrd.
 """
 
 import re
 from dataclasses import dataclass
 from urllib.parse import parse_qs
 
-from lapa_ng.table_rules import (
-    sort_rules_by_alpha_priority,
-    sort_rules_by_numeric_priority,
-)
 from lapa_ng.types import Matcher
 
 PTN_MATCHER_SPEC = re.compile(r"^((ng|classic):)?(.*?)(#(.*?))?(\?.*)?$")
@@ -48,6 +48,25 @@ class MatcherSpec:
     def qs_flat(self) -> dict:
         return {k: v[0] for k, v in self.qs.items()}
 
+    def flag(self, name: str, default: bool = False) -> bool:
+        """Return the value of a boolean option.
+
+        Args:
+            name: The name of the option
+            default: The value to return if the option is not set
+
+        Raises:
+            ValueError: If the option is set to something other than a boolean
+        """
+        value = self.qs_flat.get(name)
+        if value is None:
+            return default
+        if value.lower() in ("1", "true", "yes", "on"):
+            return True
+        if value.lower() in ("0", "false", "no", "off"):
+            return False
+        raise ValueError(f"Option {name} must be a boolean, got {value}")
+
 
 def parse_matcher_spec(matcher_spec: str) -> MatcherSpec:
     """Parse a matcher specification string into its components.
@@ -92,15 +111,44 @@ def create_matcher(matcher_spec: str) -> Matcher:
     Examples:
         >>> create_matcher('ng:rules.xlsx#RULES')  # Next-gen matcher
         >>> create_matcher('classic:rules.xlsx')   # Classic matcher
+        >>> create_matcher('classic:rules.xlsx?trace=0')   # Classic matcher without tracing
         >>> create_matcher('rules.xlsx#RULES')     # Default (ng) matcher
         >>> create_matcher('ng:rules.xlsx#RULES?sort=numeric')  # Next-gen matcher with numeric sort
+        >>> create_matcher('ng:rules.xlsx#RULES?compiled=1')  # Next-gen matcher with combined patterns
+        >>> create_matcher('ng:rules.xlsx#RULES?codegen=1')  # Next-gen matcher with generated rule functions
+        >>> create_matcher('ng:rules.xlsx#RULES?verify=1')  # Next-gen matcher checked against all rules
+        >>> create_matcher('ng:rules.xlsx#RULES?trace=0')  # Next-gen matcher in lean mode
     """
     spec = parse_matcher_spec(matcher_spec)
 
     if spec.prefix == "ng":
-        from lapa_ng.table_rules import TableRulesMatcher
-
         options = spec.qs_flat
+        compiled = spec.flag("compiled")
+        verify = spec.flag("verify")
+        trace = spec.flag("trace", True)
+        codegen = spec.flag("codegen")
+
+        if spec.filename.endswith(".lapa"):
+            from lapa_ng.rules_compiled import CompiledRulesMatcher
+
+            if "sort" in options:
+                raise ValueError(
+                    "The sort order of a compiled rule set is fixed when it is compiled"
+                )
+            return CompiledRulesMatcher(
+                spec.filename,
+                compiled=compiled,
+                verify=verify,
+                trace=trace,
+                codegen=codegen,
+            )
+
+        from lapa_ng.table_rules import (
+            TableRulesMatcher,
+            sort_rules_by_alpha_priority,
+            sort_rules_by_numeric_priority,
+        )
+
         sort = options.get("sort", "numeric")
         if sort not in ["alpha", "numeric"]:
             raise ValueError(f"Sort option must be 'alpha' or 'numeric'")
@@ -110,13 +158,21 @@ def create_matcher(matcher_spec: str) -> Matcher:
             else sort_rules_by_alpha_priority
         )
         return TableRulesMatcher(
-            spec.filename, sheet_name=spec.section, sort_function=sort_function
+            spec.filename,
+            sheet_name=spec.section,
+            sort_function=sort_function,
+            compiled=compiled,
+            verify=verify,
+            trace=trace,
+            codegen=codegen,
         )
 
     elif spec.prefix == "classic":
         from lapa_ng.classic import ClassicMatcher
 
-        return ClassicMatcher(spec.filename, sheet_name=spec.section)
+        return ClassicMatcher(
+            spec.filename, sheet_name=spec.section, trace=spec.flag("trace", True)
+        )
 
     else:
         raise ValueError(f"Unknown matcher prefix: {spec.prefix}")
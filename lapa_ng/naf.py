@@ -19,6 +19,12 @@ def parse_naf(naf_file: str) -> Generator[Word, None, None]:
     This function parses a NAF file and yields WordForm objects for each
     word form element found in the text section of the file.
 
+    The file is parsed as a stream. Every element is cleared and detached from
+    its parent as soon as it has been processed, so the layers before the text
+    section and the word forms already yielded do not accumulate in memory.
+    Parsing stops at the end of the text section, so the layers after it are
+    never read.
+
     Args:
         naf_file: Path to the NAF file to parse
 
@@ -27,19 +33,31 @@ def parse_naf(naf_file: str) -> Generator[Word, None, None]:
     """
     is_text_found = False
 
-    for event, elem in ET.iterparse(naf_file, events=("start", "end")):
+    # The elements that have been opened, but not yet closed
+    open_elements = []
 
-        # Look for the "text" tag to start the parsing of a new text.
-        if not is_text_found and event == "start" and elem.tag == "text":
-            is_text_found = True
+    for event, elem in ET.iterparse(naf_file, events=("start", "end")):
+        if event == "start":
+            # Look for the "text" tag to start the parsing of a new text.
+            if not is_text_found and elem.tag == "text":
+                is_text_found = True
+            open_elements.append(elem)
             continue
 
+        open_elements.pop()
+
         # When the text tag ends, then we're done
-        if is_text_found and event == "end" and elem.tag == "text":
+        if is_text_found and elem.tag == "text":
             return
 
         # Found a wf element, yield a WordForm object.
-        if is_text_found and event == "end" and elem.tag == "wf":
+        if is_text_found and elem.tag == "wf":
             attribs = dict(elem.attrib)
             text = elem.text
             yield Word(text, attribs)
+
+        # The element has been fully processed, so release it. Since this is
+        # done for every element, the parent only ever holds this one child.
+        elem.clear()
+        if open_elements:
+            open_elements[-1].remove(elem)
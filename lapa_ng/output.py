@@ -0,0 +1,175 @@
+"""
+Output writers for LAPA-NG translation results.
+
+This module provides functions for writing streams of translation results
+to files for further analysis. Results can be written as CSV, or as Parquet
+for faster loading into pandas. Writing Parquet requires pyarrow.
+"""
+
+import csv
+from pathlib import Path
+from typing import Generator, Iterable, TextIO
+
+from lapa_ng.types import TranslationResult
+
+__all__ = [
+    "CSV_HEADER",
+    "OUTPUT_FORMATS",
+    "iter_rows",
+    "write_csv",
+    "write_parquet",
+    "write_results",
+]
+
+CSV_HEADER = [
+    "id",
+    "text",
+    "start",
+    "phoneme",
+    "rule_id",
+    "rules_attempted",
+]
+
+OUTPUT_FORMATS = {".csv": "csv", ".parquet": "parquet"}
+
+Row = tuple[str, str, int, str, str, int]
+
+
+def iter_rows(results: Iterable[TranslationResult]) -> Generator[Row, None, None]:
+    """Flatten phoneme-level translation results into rows.
+
+    Args:
+        results: The translation results, as emitted with emit="phoneme"
+
+    Yields:
+        Tuples of word id, word text, phoneme index, phoneme, rule id and
+        the number of rules attempted
+    """
+    for result in results:
+        attribs = result.word.attributes
+        text = result.word.text
+        word_id = attribs.get("id", "")
+        ruled_id = result.match_results[0].rule_id
+        # Matchers in lean mode do not record the rules attempted
+        rules_attempted = len(getattr(result.match_results[0], "rules_attempted", ()))
+
+        for ph_ix, ph in enumerate(result.phonemes):
+            yield word_id, text, ph_ix, ph.sampa, ruled_id, rules_attempted
+
+
+def write_csv(results: Iterable[TranslationResult], f: TextIO) -> int:
+    """Write phoneme-level translation results to a CSV file.
+
+    Args:
+        results: The translation results to write, as emitted with emit="phoneme"
+        f: The text file to write to
+
+    Returns:
+        The number of rows written, excluding the header
+    """
+    writer = csv.writer(f, quoting=csv.QUOTE_NONNUMERIC, delimiter=",")
+    writer.writerow(CSV_HEADER)
+
+    rows = 0
+    for row in iter_rows(results):
+        writer.writerow(row)
+        rows += 1
+
+    return rows
+
+
+def write_parquet(
+    results: Iterable[TranslationResult],
+    output_file: str | Path,
+    batch_size: int = 65_536,
+) -> int:
+    """Write phoneme-level translation results to a Parquet file.
+
+    The rows are written in record batches of ``batch_size`` rows, so the
+    results are never all held in memory. The string columns (id, text,
+    phoneme and rule_id) are dictionary encoded, as they repeat heavily.
+
+    Args:
+        results: The translation results to write, as emitted with emit="phoneme"
+        output_file: The Parquet file to write
+        batch_size: The number of rows per record batch
+
+    Returns:
+        The number of rows written
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Writing Parquet files requires pyarrow, install it with the parquet "
+            "extra: 'pip install lapa-ng[parquet]'"
+        ) from e
+
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    schema = pa.schema(
+        [
+            ("id", dictionary),
+            ("text", dictionary),
+            ("start", pa.int32()),
+            ("phoneme", dictionary),
+            ("rule_id", dictionary),
+            ("rules_attempted", pa.int32()),
+        ]
+    )
+
+    def to_batch(rows: list[Row]) -> "pa.RecordBatch":
+        columns = list(zip(*rows))
+        arrays = [
+            (
+                pa.array(values, type=field.type.value_type).dictionary_encode()
+                if pa.types.is_dictionary(field.type)
+                else pa.array(values, type=field.type)
+            )
+            for field, values in zip(schema, columns)
+        ]
+        return pa.record_batch(arrays, schema=schema)
+
+    count = 0
+    with pq.ParquetWriter(output_file, schema) as writer:
+        rows = []
+        for row in iter_rows(results):
+            rows.append(row)
+            if len(rows) >= batch_size:
+                writer.write_batch(to_batch(rows))
+                count += len(rows)
+                rows = []
+        if rows:
+            writer.write_batch(to_batch(rows))
+            count += len(rows)
+
+    return count
+
+
+def write_results(results: Iterable[TranslationResult], output_file: str | Path) -> int:
+    """Write phoneme-level translation results in the format of the file suffix.
+
+    Args:
+        results: The translation results to write, as emitted with emit="phoneme"
+        output_file: The file to write, ending in .csv or .parquet
+
+    Returns:
+        The number of rows written
+
+    Raises:
+        ValueError: If the file suffix is not a supported output format
+    """
+    output_format = OUTPUT_FORMATS.get(Path(output_file).suffix.lower())
+    if output_format == "csv":
+        with open(output_file, "w") as f:
+            return write_csv(results, f)
+    elif output_format == "parquet":
+        return write_parquet(results, output_file)
+    else:
+        raise ValueError(
+            f"Unsupported output format for {output_file}, "
+            f"expected one of {', '.join(OUTPUT_FORMATS)}"
+        )
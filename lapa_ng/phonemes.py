@@ -7,8 +7,9 @@ their constituent phonemes.
 """
 
 import csv
+from functools import cache
 from pathlib import Path
-from typing import Iterator
+from typing import Iterable, Iterator
 
 from lapa_ng.types import Phoneme
 
@@ -23,6 +24,9 @@ class PhonemeList:
     This class provides functionality for working with a list of phonemes,
     including splitting words into phonemes and looking up phonemes by
     their SAMPA representation.
+
+    A PhonemeList is immutable, which allows the default list to be shared by
+    everything in the process that needs it.
     """
 
     def __init__(self, phoneme_list: list[Phoneme]):
@@ -32,10 +36,38 @@ class PhonemeList:
             phoneme_list: List of phonemes to use, sorted by SAMPA length
         """
         # It's important that we test the longest phonemes first
-        self.phoneme_list = sorted(
-            phoneme_list, key=lambda x: len(x.sampa), reverse=True
+        self.phoneme_list = tuple(
+            sorted(phoneme_list, key=lambda x: len(x.sampa), reverse=True)
         )
 
+        # Index the phonemes by SAMPA. If a SAMPA string occurs more than once,
+        # the first phoneme wins, as it would when scanning the sorted list.
+        self._by_sampa: dict[str, Phoneme] = {}
+        for phoneme in self.phoneme_list:
+            if phoneme.sampa and phoneme.sampa not in self._by_sampa:
+                self._by_sampa[phoneme.sampa] = phoneme
+
+        # The SAMPA lengths that occur, longest first, for longest-match lookups
+        self._lengths = tuple(sorted({len(s) for s in self._by_sampa}, reverse=True))
+
+    def _longest_match(self, word: str, start: int) -> tuple[Phoneme | None, int]:
+        """Find the longest phoneme at a position in a word.
+
+        Args:
+            word: The word to match against
+            start: The position in the word to match at
+
+        Returns:
+            The matching phoneme and the position after it, or (None, start)
+        """
+        by_sampa = self._by_sampa
+        for length in self._lengths:
+            phoneme = by_sampa.get(word[start : start + length])
+            if phoneme is not None:
+                # Near the end of the word the slice can be shorter than length
+                return phoneme, start + len(phoneme.sampa)
+        return None, start
+
     def get_first(self, word: str) -> Phoneme | None:
         """Find the first phoneme that matches the start of a word.
 
@@ -45,18 +77,16 @@ class PhonemeList:
         Returns:
             The matching phoneme, or None if no match is found
         """
-        for phoneme in self.phoneme_list:
-            if word.startswith(phoneme.sampa):
-                return phoneme
-        return None
+        return self._longest_match(word, 0)[0]
 
     def split_phonemes(
         self, word: str, ignore_errors: bool = False
     ) -> tuple[Phoneme, ...]:
         """Split a word into its constituent phonemes.
 
-        This method attempts to match the longest possible phonemes first,
-        which is why the phoneme list is sorted by length in reverse order.
+        This method matches the longest possible phoneme at each position,
+        using a table of the phonemes by SAMPA string and trying the longest
+        SAMPA length first.
 
         Args:
             word: The word to split into phonemes
@@ -68,19 +98,51 @@ class PhonemeList:
         Raises:
             ValueError: If an unknown character is encountered and ignore_errors is False
         """
+        if not word:
+            return ()
+
         phonemes = []
-        while word:
-            phoneme = self.get_first(word)
+        position = 0
+        while position < len(word):
+            phoneme, end = self._longest_match(word, position)
             if phoneme:
                 phonemes.append(phoneme)
-                word = word[len(phoneme.sampa) :]
+                position = end
             else:
                 if not ignore_errors:
-                    raise ValueError(f"No phoneme found for word: {word}")
+                    raise ValueError(f"No phoneme found for word: {word[position:]}")
                 else:
-                    word = word[1:]
+                    position += 1
         return tuple(phonemes)
 
+    def split_many(
+        self, words: Iterable[str], ignore_errors: bool = False
+    ) -> list[tuple[Phoneme, ...]]:
+        """Split many words into their constituent phonemes.
+
+        Every distinct word is only split once, which makes this much faster
+        than calling split_phonemes for each word on typical output, where
+        the same strings occur many times.
+
+        Args:
+            words: The words to split into phonemes
+            ignore_errors: Whether to skip unknown characters instead of raising an error
+
+        Returns:
+            List with the phonemes of each word, in the order of the input
+
+        Raises:
+            ValueError: If an unknown character is encountered and ignore_errors is False
+        """
+        splits: dict[str, tuple[Phoneme, ...]] = {}
+        result = []
+        for word in words:
+            phonemes = splits.get(word)
+            if phonemes is None:
+                phonemes = splits[word] = self.split_phonemes(word, ignore_errors)
+            result.append(phonemes)
+        return result
+
     def __getitem__(self, key: int | str) -> Phoneme:
         """Get a phoneme by index or SAMPA representation.
 
@@ -95,10 +157,10 @@ class PhonemeList:
             KeyError: If no phoneme is found for the given SAMPA string
         """
         if isinstance(key, str):
-            for phoneme in self.phoneme_list:
-                if phoneme.sampa == key:
-                    return phoneme
-            raise KeyError(f"No phoneme found for {key}")
+            try:
+                return self._by_sampa[key]
+            except KeyError:
+                raise KeyError(f"No phoneme found for {key}") from None
         return self.phoneme_list[key]
 
     def __len__(self) -> int:
@@ -129,10 +191,19 @@ class PhonemeList:
         return cls(phonemes)
 
     @classmethod
-    def default(self) -> "PhonemeList":
-        """Create a PhonemeList using the default phoneme definitions.
+    def default(cls) -> "PhonemeList":
+        """Return the PhonemeList with the default phoneme definitions.
+
+        The default definitions are read once and the same instance is
+        shared by all callers in the process.
 
         Returns:
-            A new PhonemeList instance using the built-in phoneme definitions
+            The PhonemeList instance using the built-in phoneme definitions
         """
-        return self.from_csv(DEFAULT_PHONEME_FILE)
+        return _default_phoneme_list()
+
+
+@cache
+def _default_phoneme_list() -> PhonemeList:
+    """Read the default phoneme definitions."""
+    return PhonemeList.from_csv(DEFAULT_PHONEME_FILE)
@@ -0,0 +1,168 @@
+"""
+Code-generated rule matching for LAPA-NG.
+
+The rules generated from the rule tables match a fixed number of characters:
+literal letters, the vowel and consonant classes, any character and the end of
+the word. For patterns this short, most of the time of a regex match is spent
+entering the regex engine rather than matching.
+
+This module turns the candidate rules of every (first letter, start of word)
+bucket of a RegexListMatcher into a generated Python function, which tests the
+rules in priority order with inline character comparisons and set membership
+checks. The first letter is known for every bucket, so it is only tested for
+rules that can start with any letter.
+
+The functions of a rule set are generated as a single module source, compiled
+with compile() and kept by the matcher beside its candidate table. They give
+exactly the same matches as the regular expressions of the rules.
+"""
+
+from typing import Callable, Sequence
+
+from lapa_ng.rules_regex import (
+    RegexMatcher,
+    _Element,
+    _FixedRule,
+    _parse_fixed_rule,
+)
+
+__all__ = ["BucketFunction", "compile_bucket_functions", "generate_source"]
+
+BucketFunction = Callable[[str, int], tuple[int, int] | None]
+"""A generated function for a bucket of candidate rules.
+
+It is called with the text of the word and the start position, and returns
+the index of the first matching rule in the bucket and the length of its match
+group, or None if no rule matches.
+"""
+
+BucketKey = tuple[str | None, bool]
+
+
+def _element_condition(element: _Element, index: str) -> str:
+    """Return the condition for the character at an index to match an element."""
+    characters = "".join(sorted(element.characters))
+    if len(characters) == 1:
+        operator = "!=" if element.negate else "=="
+    else:
+        operator = "not in" if element.negate else "in"
+    return f"text[{index}] {operator} {characters!r}"
+
+
+def _rule_condition(rule: _FixedRule, letter: str | None) -> str | None:
+    """Return the condition for a rule to match, or None if it can never match.
+
+    Args:
+        rule: The fixed-length rule
+        letter: The letter at the start position, or None if it is not known
+
+    Returns:
+        The condition as a Python expression, in terms of text, start and rest
+    """
+    length = len(rule.elements)
+    if rule.end == "\\Z":
+        conditions = [f"rest == {length}"]
+    elif rule.end == "$":
+        conditions = [
+            f"(rest == {length} or rest == {length + 1} and text[-1] == '\\n')"
+        ]
+    elif length > 1 or letter is None:
+        conditions = [f"rest >= {length}"]
+    else:
+        conditions = []
+
+    for ix, element in enumerate(rule.elements):
+        if ix == 0 and letter is not None:
+            # The first letter is the key of the bucket
+            if (letter in element.characters) == element.negate:
+                return None
+            continue
+        conditions.append(
+            _element_condition(element, f"start + {ix}" if ix else "start")
+        )
+
+    return " and ".join(conditions) or "True"
+
+
+def _bucket_source(
+    name: str, key: BucketKey, rules: Sequence[tuple[RegexMatcher, _FixedRule]]
+) -> str:
+    """Return the source of the function for a bucket of candidate rules.
+
+    Prefix rules are only candidates in the buckets for the start of the word,
+    so the function never tests the start position.
+    """
+    letter, is_prefix = key
+    lines = [
+        f"def {name}(text, start):",
+        f"    # letter={letter!r}, prefix={is_prefix}",
+        "    rest = len(text) - start",
+    ]
+    for ix, (rule, fixed) in enumerate(rules):
+        condition = _rule_condition(fixed, letter)
+        if condition is None:
+            continue
+        lines.append(f"    if {condition}:  # {rule.id!r}")
+        lines.append(f"        return ({ix}, {fixed.group_end})")
+    lines.append("    return None")
+    return "\n".join(lines)
+
+
+def generate_source(
+    buckets: dict[BucketKey, Sequence[RegexMatcher]],
+) -> tuple[str, dict[BucketKey, str]]:
+    """Generate the source of the functions for buckets of candidate rules.
+
+    Args:
+        buckets: The candidate rules in priority order, keyed by (first letter,
+            at start of word). A letter of None stands for any letter.
+
+    Returns:
+        The module source, and the name of the function for every bucket
+
+    Raises:
+        ValueError: If a rule is not a fixed-length regex rule
+    """
+    fixed_rules: dict[int, _FixedRule] = {}
+    sources = []
+    names = {}
+    for key, rules in buckets.items():
+        parsed = []
+        for rule in rules:
+            if id(rule) not in fixed_rules:
+                fixed = (
+                    _parse_fixed_rule(rule) if isinstance(rule, RegexMatcher) else None
+                )
+                if fixed is None:
+                    raise ValueError(
+                        f"Rule {getattr(rule, 'id', rule)} cannot be code generated: "
+                        f"{getattr(rule, 'pattern', None)}"
+                    )
+                fixed_rules[id(rule)] = fixed
+            parsed.append((rule, fixed_rules[id(rule)]))
+
+        names[key] = f"_bucket_{len(names)}"
+        sources.append(_bucket_source(names[key], key, parsed))
+
+    return "\n\n\n".join(sources) + "\n", names
+
+
+def compile_bucket_functions(
+    buckets: dict[BucketKey, Sequence[RegexMatcher]],
+) -> dict[BucketKey, BucketFunction]:
+    """Generate and compile the functions for buckets of candidate rules.
+
+    Args:
+        buckets: The candidate rules in priority order, keyed by (first letter,
+            at start of word). A letter of None stands for any letter.
+
+    Returns:
+        The generated function for every bucket
+
+    Raises:
+        ValueError: If a rule is not a fixed-length regex rule
+    """
+    source, names = generate_source(buckets)
+    namespace: dict = {}
+    exec(compile(source, "<lapa-ng generated rules>", "exec"), namespace)
+    return {key: namespace[name] for key, name in names.items()}
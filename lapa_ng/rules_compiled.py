@@ -0,0 +1,199 @@
+"""
+Compiled rule sets for LAPA-NG.
+
+This module provides a precompiled file format for regex rule sets. A compiled
+rule set contains the resolved patterns, the phonemes and the metadata of every
+rule in priority order, so it can be loaded without reading the original Excel
+file, parsing rule expressions or splitting phonemes. Loading a compiled rule
+set does not require pandas or xlrd.
+
+The file is gzip compressed JSON with a header holding the format name, the
+format version and a SHA-256 hash of the rules. The hash is checked on load and
+doubles as a fingerprint of the rule set.
+"""
+
+import gzip
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from lapa_ng.rules_regex import RegexListMatcher, RegexMatcher, RegexRuleSpec
+from lapa_ng.types import Phoneme
+
+__all__ = [
+    "COMPILED_RULES_SUFFIX",
+    "CompiledRulesMatcher",
+    "load_compiled_rules",
+    "ruleset_fingerprint",
+    "save_compiled_rules",
+]
+
+COMPILED_RULES_FORMAT = "lapa-ng-rules"
+COMPILED_RULES_VERSION = 1
+COMPILED_RULES_SUFFIX = ".lapa"
+
+
+def _spec_to_dict(spec: RegexRuleSpec) -> dict[str, Any]:
+    """Return a serializable dictionary of a rule, keeping the full phonemes."""
+    return {
+        "id": spec.id,
+        "pattern": spec.pattern,
+        "replacement": [[p.sampa, p.ipa, p.example, p.notes] for p in spec.replacement],
+        "meta": dict(spec.meta),
+    }
+
+
+def _spec_from_dict(data: dict[str, Any]) -> RegexRuleSpec:
+    """Create a rule from a dictionary created by _spec_to_dict."""
+    return RegexRuleSpec(
+        id=data["id"],
+        pattern=data["pattern"],
+        replacement=tuple(Phoneme(*p) for p in data["replacement"]),
+        meta=data["meta"],
+    )
+
+
+def _hash_rules(rules: list[dict[str, Any]]) -> str:
+    """Return the SHA-256 hash of the canonical JSON form of the rules."""
+    canonical = json.dumps(rules, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def ruleset_fingerprint(specs: Iterable[RegexRuleSpec]) -> str:
+    """Return a fingerprint of a rule set.
+
+    The fingerprint changes whenever a pattern, phoneme, rule id or the order
+    of the rules changes.
+
+    Args:
+        specs: The rule specifications in priority order
+
+    Returns:
+        The hex encoded SHA-256 hash of the rules
+    """
+    return _hash_rules([_spec_to_dict(s) for s in specs])
+
+
+def save_compiled_rules(
+    specs: Sequence[RegexRuleSpec],
+    output_file: str | Path,
+    source: dict[str, Any] | None = None,
+) -> str:
+    """Write a compiled rule set.
+
+    Args:
+        specs: The rule specifications in priority order, with resolved patterns
+        output_file: The file to write
+        source: Optional description of where the rules came from
+
+    Returns:
+        The fingerprint of the rule set
+    """
+    rules = [_spec_to_dict(s) for s in specs]
+    fingerprint = _hash_rules(rules)
+
+    document = {
+        "format": COMPILED_RULES_FORMAT,
+        "version": COMPILED_RULES_VERSION,
+        "sha256": fingerprint,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "source": source or {},
+        "rules": rules,
+    }
+    with gzip.open(output_file, "wt", encoding="utf-8") as f:
+        json.dump(document, f)
+
+    return fingerprint
+
+
+def read_compiled_rules(input_file: str | Path) -> dict[str, Any]:
+    """Read and verify a compiled rule set.
+
+    Args:
+        input_file: The compiled rule set file
+
+    Returns:
+        The document, with the rules as RegexRuleSpec objects
+
+    Raises:
+        ValueError: If the file is not a compiled rule set, has an unsupported
+            version or its content does not match its hash
+    """
+    try:
+        with gzip.open(input_file, "rt", encoding="utf-8") as f:
+            document = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"{input_file} is not a compiled rule set") from e
+
+    if (
+        not isinstance(document, dict)
+        or document.get("format") != COMPILED_RULES_FORMAT
+    ):
+        raise ValueError(f"{input_file} is not a compiled rule set")
+    if document.get("version") != COMPILED_RULES_VERSION:
+        raise ValueError(
+            f"Unsupported compiled rule set version {document.get('version')} in {input_file}, "
+            f"expected {COMPILED_RULES_VERSION}. Please recompile the rules."
+        )
+    if _hash_rules(document["rules"]) != document["sha256"]:
+        raise ValueError(f"The rules in {input_file} do not match their hash")
+
+    document["rules"] = tuple(_spec_from_dict(r) for r in document["rules"])
+    return document
+
+
+def load_compiled_rules(input_file: str | Path) -> tuple[RegexRuleSpec, ...]:
+    """Load the rules from a compiled rule set.
+
+    Args:
+        input_file: The compiled rule set file
+
+    Returns:
+        Tuple of rule specifications in priority order
+    """
+    return read_compiled_rules(input_file)["rules"]
+
+
+class CompiledRulesMatcher(RegexListMatcher):
+    """A matcher that loads its rules from a compiled rule set.
+
+    This gives the same interface as the TableRulesMatcher, but skips reading
+    and converting the original rules.
+
+    Attributes:
+        source: The description of where the rules came from
+    """
+
+    def __init__(
+        self,
+        rules_file: str | Path,
+        compiled: bool = False,
+        verify: bool = False,
+        trace: bool = True,
+        codegen: bool = False,
+    ):
+        """Initialise the CompiledRulesMatcher.
+
+        Args:
+            rules_file: The path to the compiled rule set
+            compiled: Whether to match each candidate bucket with a single combined pattern
+            verify: Whether to check every match against all rules
+            trace: Whether to record the rules attempted before every match
+            codegen: Whether to match each candidate bucket with a generated function
+        """
+        document = read_compiled_rules(rules_file)
+        self._sha256 = document["sha256"]
+        self.source = document["source"]
+        super().__init__(
+            [RegexMatcher(spec) for spec in document["rules"]],
+            compiled=compiled,
+            verify=verify,
+            trace=trace,
+            codegen=codegen,
+        )
+
+    def _rules_fingerprint(self) -> str:
+        """Return the fingerprint stored in the compiled rule set."""
+        return self._sha256
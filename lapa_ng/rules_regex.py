@@ -12,14 +12,35 @@ uses caching and filtering to improve performance.
 """
 
 import re
+import sys
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Generator, Mapping, Sequence
 
 import yaml
-from cachetools import LFUCache
 
-from lapa_ng.types import ContextualMatchResult, Matcher, MatchResult, Phoneme, Word
+try:
+    import re._parser as _parser
+except ImportError:  # Python < 3.11
+    import sre_parse as _parser
+
+from lapa_ng.types import (
+    AttemptedRules,
+    ContextualMatchResult,
+    Matcher,
+    MatchResult,
+    Phoneme,
+    RuleMatchResult,
+    Word,
+)
+
+_REPEATS = (
+    _parser.MAX_REPEAT,
+    _parser.MIN_REPEAT,
+    getattr(_parser, "POSSESSIVE_REPEAT", _parser.MAX_REPEAT),
+)
+_ATOMIC_GROUP = getattr(_parser, "ATOMIC_GROUP", None)
 
 DEFAULT_CHARACTER_CLASSES = {
     "vowel": "aeiouy",
@@ -61,12 +82,188 @@ class RegexRuleSpec:
         """Create a RegexRuleSpec from a dictionary."""
         return cls(
             id=data["id"],
-            pattern=[Phoneme(v) for v in data["pattern"]],
+            pattern=data["pattern"],
             replacement=[Phoneme(sampa=p) for p in data["replacement"]],
             meta=data.get("meta", {}),
         )
 
 
+def pattern_first_characters(pattern: re.Pattern) -> frozenset[str] | None:
+    """Return the characters a match of a compiled pattern can start with.
+
+    The pattern is parsed with the parser of the re module, so character
+    classes, ranges, alternations, optional elements and zero-width assertions
+    such as ``^`` and lookbehinds are all taken into account. Where the first
+    character cannot be known exactly, such as for a wildcard, a negated set,
+    a category like ``\\d`` or a case-insensitive pattern, None is returned.
+
+    Args:
+        pattern: The compiled pattern, matched with ``pattern.match(text, start)``
+
+    Returns:
+        The set of first characters, or None if any character may come first
+    """
+    parsed = _parser.parse(pattern.pattern, pattern.flags)
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+
+    first, nullable = _first_characters(parsed)
+    # A pattern that can match an empty string matches before any character
+    if first is None or nullable:
+        return None
+    return frozenset(first)
+
+
+def _first_characters(items) -> tuple[set[str] | None, bool]:
+    """Return the first characters of a parsed sequence and whether it can be empty."""
+    first: set[str] = set()
+    for op, av in items:
+        if op is _parser.LITERAL:
+            item_first, nullable = {chr(av)}, False
+        elif op is _parser.IN:
+            item_first, nullable = _set_characters(av), False
+        elif op in (_parser.AT, _parser.ASSERT, _parser.ASSERT_NOT):
+            item_first, nullable = set(), True
+        elif op is _parser.SUBPATTERN:
+            _group, add_flags, _del_flags, sub_items = av
+            if add_flags & re.IGNORECASE:
+                return None, False
+            item_first, nullable = _first_characters(sub_items)
+        elif op in _REPEATS:
+            min_count, max_count, sub_items = av
+            if max_count == 0:
+                continue
+            item_first, nullable = _first_characters(sub_items)
+            nullable = nullable or min_count == 0
+        elif op is _parser.BRANCH:
+            item_first, nullable = set(), False
+            for branch in av[1]:
+                branch_first, branch_nullable = _first_characters(branch)
+                if branch_first is None:
+                    return None, False
+                item_first |= branch_first
+                nullable = nullable or branch_nullable
+        elif op is _ATOMIC_GROUP:
+            item_first, nullable = _first_characters(av)
+        else:
+            return None, False
+
+        if item_first is None:
+            return None, False
+        first |= item_first
+        if not nullable:
+            return first, False
+    return first, True
+
+
+def _set_characters(items) -> set[str] | None:
+    """Return the characters in a parsed character set, or None if not enumerable."""
+    characters = set()
+    for op, av in items:
+        if op is _parser.LITERAL:
+            characters.add(chr(av))
+        elif op is _parser.RANGE and av[1] - av[0] < 256:
+            characters.update(chr(c) for c in range(av[0], av[1] + 1))
+        else:
+            return None
+    return characters
+
+
+@dataclass(frozen=True)
+class _Element:
+    """A single character of a fixed-length rule, as a set of characters."""
+
+    characters: frozenset[str]
+    negate: bool = False
+
+
+@dataclass(frozen=True)
+class _FixedRule:
+    """A rule that matches a fixed number of characters.
+
+    Attributes:
+        elements: The characters the rule consumes, in order
+        group_end: The number of characters consumed by the match group
+        prefix: Whether the rule only matches at the start of the word
+        end: None, "$" if the rule must end at the end of the word, or
+            "\\Z" if it must end at the end of the string
+    """
+
+    elements: tuple[_Element, ...]
+    group_end: int
+    prefix: bool
+    end: str | None
+
+
+def _parse_element(op, av) -> _Element | None:
+    """Return the element for a parsed regex item, or None if it is not a single character."""
+    if op is _parser.LITERAL:
+        return _Element(frozenset(chr(av)))
+    if op is _parser.NOT_LITERAL:
+        return _Element(frozenset(chr(av)), negate=True)
+    if op is _parser.ANY:
+        return _Element(frozenset("\n"), negate=True)
+    if op is not _parser.IN:
+        return None
+
+    characters = set()
+    negate = False
+    for item_op, item_av in av:
+        if item_op is _parser.NEGATE:
+            negate = True
+        elif item_op is _parser.LITERAL:
+            characters.add(chr(item_av))
+        elif item_op is _parser.RANGE and item_av[1] - item_av[0] < 256:
+            characters.update(chr(c) for c in range(item_av[0], item_av[1] + 1))
+        else:
+            return None
+    return _Element(frozenset(characters), negate)
+
+
+def _parse_fixed_rule(rule: "RegexMatcher") -> _FixedRule | None:
+    """Parse a regex rule into a fixed-length rule.
+
+    Args:
+        rule: The rule to parse
+
+    Returns:
+        The fixed-length rule, or None if the rule uses anything other than
+        single characters, the match group, a leading ^ and a trailing $
+    """
+    parsed = _parser.parse(rule.rule.pattern, rule.rule.flags)
+    if parsed.state.flags & (re.IGNORECASE | re.MULTILINE | re.DOTALL):
+        return None
+
+    items = list(parsed)
+    prefix = False
+    end = None
+    if items and items[0] == (_parser.AT, _parser.AT_BEGINNING):
+        prefix = True
+        items = items[1:]
+    if items and items[-1] in (
+        (_parser.AT, _parser.AT_END),
+        (_parser.AT, _parser.AT_END_STRING),
+    ):
+        end = "$" if items[-1][1] is _parser.AT_END else "\\Z"
+        items = items[:-1]
+
+    elements = []
+    group_end = None
+    for op, av in items:
+        if op is _parser.SUBPATTERN and av[0] == 1 and not elements:
+            _group, add_flags, del_flags, group_items = av
+            if add_flags or del_flags:
+                return None
+            elements.extend(_parse_element(*item) for item in group_items)
+            group_end = len(elements)
+        else:
+            elements.append(_parse_element(op, av))
+
+    if group_end is None or group_end == 0 or None in elements:
+        return None
+    return _FixedRule(tuple(elements), group_end, prefix, end)
+
+
 class RegexMatcher(Matcher):
     """A matcher that uses regular expressions for pattern matching.
 
@@ -78,10 +275,22 @@ class RegexMatcher(Matcher):
         replacement: Phonetic replacement string
         match_group: The capturing group in the regex pattern
         prefix: Whether the rule must match at the start of the word
+        pattern: The pattern with character classes resolved
         rule: The compiled regular expression pattern
+        first_characters: The characters a match can start with, or None if
+            this is not known and the rule must be tried at every position
     """
 
-    __slots__ = ("id", "replacement", "match_group", "prefix", "rule")
+    __slots__ = (
+        "id",
+        "replacement",
+        "meta",
+        "match_group",
+        "prefix",
+        "pattern",
+        "rule",
+        "first_characters",
+    )
 
     def __init__(
         self,
@@ -99,7 +308,8 @@ class RegexMatcher(Matcher):
         Raises:
             ValueError: If no match group is found in the rule
         """
-        self.id = spec.id
+        # Rule ids are interned, every match result refers to the same string
+        self.id = sys.intern(spec.id)
         self.replacement = tuple(spec.replacement)
         self.meta = spec.meta
 
@@ -115,19 +325,20 @@ class RegexMatcher(Matcher):
         else:
             raise ValueError(f"No match group found in rule {self.id}: {spec.pattern}")
 
-        # If the rule starts with a caret, it is a prefix rule. We only then match for start == 0
-        if spec.pattern.startswith("^"):
-            self.prefix = True
-            self.rule = spec.pattern
-        else:
-            self.prefix = False
-            self.rule = "^" + spec.pattern
-
         # Replace the character classes with the actual characters
+        self.pattern = spec.pattern
         for class_name, characters in character_classes.items():
-            self.rule = re.sub(rf"\[:{class_name}:\]", f"[{characters}]", self.rule)
+            self.pattern = re.sub(
+                rf"\[:{class_name}:\]", f"[{characters}]", self.pattern
+            )
 
-        self.rule = re.compile(self.rule)
+        # If the rule starts with a caret, it is a prefix rule. We only then match for start == 0
+        self.prefix = self.pattern.startswith("^")
+
+        # Rules are matched with rule.match(text, start), which anchors them at
+        # the start position without slicing the word
+        self.rule = re.compile(self.pattern)
+        self.first_characters = pattern_first_characters(self.rule)
 
     def match(self, word: Word, start: int) -> Generator[MatchResult, None, None]:
         """Attempt to match the rule against a word starting at the given position.
@@ -139,33 +350,40 @@ class RegexMatcher(Matcher):
         Returns:
             MatchResult if the rule matches, None otherwise
         """
-        if self.prefix and start != 0:
-            return []
+        match_result = self.match_first(word, start)
+        if match_result is not None:
+            yield match_result
 
-        test_word = word.text[start:]
-        match = self.rule.match(test_word)
-        if not match:
-            return []
+    def match_first(self, word: Word, start: int) -> MatchResult | None:
+        """Match the rule against a word at the given position, without a generator.
 
-        replacement_part = match.group(1)
-        replacment_length = len(replacement_part)
+        Args:
+            word: The word to match against
+            start: Starting position in the word
+
+        Returns:
+            MatchResult if the rule matches, None otherwise
+        """
+        if self.prefix and start != 0:
+            return None
 
-        remainder = word.text[start + replacment_length :]
+        match = self.rule.match(word.text, start)
+        if not match:
+            return None
 
-        yield MatchResult(
-            matched=replacement_part,
-            phonemes=self.replacement,
+        return MatchResult(
             word=word,
+            phonemes=self.replacement,
             start=start,
-            remainder=remainder,
+            end=match.end(1),
         )
 
     @property
     def spec(self) -> RegexRuleSpec:
-        """Return the specification for the rule."""
+        """Return the specification for the rule, with character classes resolved."""
         return RegexRuleSpec(
             id=self.id,
-            pattern=self.rule.pattern,
+            pattern=self.pattern,
             replacement=self.replacement,
             meta=self.meta,
         )
@@ -175,22 +393,126 @@ class RegexListMatcher(Matcher):
     """An optimized list matcher for regex-based rules.
 
     This class implements the Matcher protocol with optimizations for regex rules.
-    It uses caching and filtering based on the first letter of the word to
-    reduce the number of rules that need to be attempted.
+    At construction it builds a table of the candidate rules for every first
+    letter and for the start of the word, so only those rules are attempted.
+    Rules whose first character cannot be determined are candidates everywhere.
+
+    Otherwise the candidates are narrowed down further by the next letter and
+    the number of characters left in the word, which rules out most of the
+    rules for common letters before any regex is run. The narrowed candidates
+    keep their priority order, and the rules attempted are still reported
+    relative to all candidates for the first letter.
+
+    In compiled mode the candidate rules for each (first letter, prefix) bucket
+    are combined into a single alternation, so finding the first matching rule
+    takes a single regex scan rather than one scan per rule.
+
+    In codegen mode the candidate rules for each bucket are tested by a
+    generated Python function with inline character checks, which avoids the
+    cost of entering the regex engine for the very short rule patterns. See
+    lapa_ng.rules_codegen.
+
+    In verify mode every match is checked against a brute force match over all
+    rules, which is slow but shows any rule the candidate table drops.
+
+    By default matches are traced: they are ContextualMatchResults listing the
+    rules attempted before the match. In lean mode, without tracing, they are
+    RuleMatchResults with only the rule that matched, created straight from
+    the regex match.
     """
 
-    def __init__(self, rules: list[RegexMatcher]):
+    def __init__(
+        self,
+        rules: list[RegexMatcher],
+        compiled: bool = False,
+        verify: bool = False,
+        trace: bool = True,
+        codegen: bool = False,
+    ):
         """Initialize with a list of regex matchers.
 
         Args:
             rules: List of regex matchers to use
+            compiled: Whether to match each candidate bucket with a single combined pattern
+            verify: Whether to check every match against all rules
+            trace: Whether to record the rules attempted before every match
+            codegen: Whether to match each candidate bucket with a generated function
+
+        Raises:
+            ValueError: If tracing is off and a rule is not a RegexMatcher, if
+                both compiled and codegen are set, if compiled is set and the
+                rules cannot be combined, or if codegen is set and a rule is
+                not a fixed-length regex rule
         """
+        if compiled and codegen:
+            raise ValueError("The compiled and codegen modes cannot be combined")
+
+        if compiled:
+            check_combinable(rules)
+
+        if not trace:
+            for rule in rules:
+                if not isinstance(rule, RegexMatcher):
+                    raise ValueError(
+                        f"Lean mode needs RegexMatcher rules, got {type(rule).__name__}"
+                    )
+
         self.rules = rules
-        self.candidate_cache = LFUCache(maxsize=1000)
+        self.compiled = compiled
+        self.verify = verify
+        self.trace = trace
+        self.codegen = codegen
+        self.candidate_table, self.wildcard_candidates = build_candidate_table(rules)
+        self.combined_cache: dict[tuple[str, bool], re.Pattern | None] = {}
+
+        # Rules that do not match a fixed number of characters are never ruled out
+        self.fixed_rules = {
+            rule: _parse_fixed_rule(rule) if isinstance(rule, RegexMatcher) else None
+            for rule in rules
+        }
+        # Longer remainders than this are all the same to the fixed rules
+        self.max_remainder = 2 + max(
+            (len(f.elements) for f in self.fixed_rules.values() if f is not None),
+            default=0,
+        )
+        self.lookahead_cache: dict[
+            tuple[str, bool, int],
+            tuple[tuple[Matcher, ...], tuple[tuple[int, Matcher], ...]],
+        ] = {}
+
+        if codegen:
+            from lapa_ng.rules_codegen import compile_bucket_functions
+
+            functions = compile_bucket_functions(
+                {
+                    **self.candidate_table,
+                    (None, False): self.wildcard_candidates[False],
+                    (None, True): self.wildcard_candidates[True],
+                }
+            )
+            self.wildcard_functions = (
+                functions.pop((None, False)),
+                functions.pop((None, True)),
+            )
+            self.generated_table = functions
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Return the fingerprint of the rules and the trace mode.
+
+        The rules attempted are part of the results, so the persistent cache
+        must not mix traced and lean results.
+        """
+        fingerprint = self._rules_fingerprint()
+        return fingerprint if self.trace else f"{fingerprint}:notrace"
 
-    def match(
-        self, word: Word, start: int
-    ) -> Generator[ContextualMatchResult, None, None]:
+    def _rules_fingerprint(self) -> str:
+        """Return the fingerprint of the rules, see ruleset_fingerprint."""
+        from lapa_ng.rules_compiled import ruleset_fingerprint
+
+        return ruleset_fingerprint(rule.spec for rule in self.rules)
+
+    def match(self, word: Word, start: int) -> Generator[RuleMatchResult, None, None]:
         """Attempt to match the word against the candidate rules.
 
         Args:
@@ -198,56 +520,245 @@ class RegexListMatcher(Matcher):
             start: Starting position in the word
 
         Returns:
-            ContextualMatchResult if a match is found, None otherwise
+            ContextualMatchResult if a match is found, or a RuleMatchResult in
+            lean mode, None otherwise
+
+        Raises:
+            AssertionError: In verify mode, if the candidate rules do not give
+                the same match as trying all rules
         """
-        candidate_rules = self.find_candidate_rules(word, start)
-
-        rules_attempted = []
-        for rule in candidate_rules:
-            match_results = list(rule.match(word, start))
-            if match_results:
-                for mr in match_results:
-                    yield ContextualMatchResult.from_match_result(
-                        mr, rule.id, rules_attempted
+        match_result = self.match_first(word, start)
+        if match_result is not None:
+            yield match_result
+
+    def match_first(self, word: Word, start: int) -> RuleMatchResult | None:
+        """Match the word against the candidate rules, without a generator.
+
+        Args:
+            word: The word to match against
+            start: Starting position in the word
+
+        Returns:
+            ContextualMatchResult if a match is found, or a RuleMatchResult in
+            lean mode, None otherwise
+
+        Raises:
+            AssertionError: In verify mode, if the candidate rules do not give
+                the same match as trying all rules
+        """
+        if self.verify:
+            return self._match_verified(word, start)
+        return self._match_candidates(word, start)
+
+    def _match_candidates(self, word: Word, start: int) -> RuleMatchResult | None:
+        """Match the candidate rules for the word at the given position.
+
+        Args:
+            word: The word to match against
+            start: Starting position in the word
+
+        Returns:
+            The match result if a match is found, None otherwise
+        """
+        if self.compiled:
+            return self._match_combined(
+                word, start, self.find_candidate_rules(word, start)
+            )
+
+        if self.codegen:
+            return self._match_generated(
+                word, start, self.find_candidate_rules(word, start)
+            )
+
+        candidate_rules, narrowed = self.find_lookahead_candidates(word, start)
+
+        if not self.trace:
+            # Prefix rules are only candidates at the start of the word, so
+            # the compiled rules can be matched directly
+            text = word.text
+            for _, rule in narrowed:
+                match = rule.rule.match(text, start)
+                if match:
+                    return RuleMatchResult(
+                        word, rule.replacement, start, match.end(1), rule.id
                     )
-                return
-            rules_attempted.append(rule.id)
+            return None
+
+        for count, rule in narrowed:
+            mr = first_match(rule, word, start)
+            if mr is not None:
+                # The rules attempted are the candidates before this one,
+                # including those ruled out by the lookahead
+                return ContextualMatchResult.from_match_result(
+                    mr, rule.id, AttemptedRules(candidate_rules, count)
+                )
+        return None
+
+    def _match_verified(self, word: Word, start: int) -> RuleMatchResult | None:
+        """Match the candidate rules and check the result against all rules.
+
+        Args:
+            word: The word to match against
+            start: Starting position in the word
+
+        Returns:
+            The match result if a match is found, None otherwise
+
+        Raises:
+            AssertionError: If the candidate rules do not give the same match
+                as trying all rules
+        """
+        result = self._match_candidates(word, start)
+
+        expected = None
+        for rule in self.rules:
+            mr = first_match(rule, word, start)
+            if mr is not None:
+                expected = (rule.id, mr.start, mr.end)
+                break
+
+        actual = None if result is None else (result.rule_id, result.start, result.end)
+        if actual != expected:
+            raise AssertionError(
+                f"Candidate rules for {word.text!r} at {start} matched {actual}, "
+                f"but trying all rules matched {expected}"
+            )
+        return result
+
+    def _match_combined(
+        self, word: Word, start: int, candidate_rules: tuple[RegexMatcher, ...]
+    ) -> RuleMatchResult | None:
+        """Match the candidate rules using the combined pattern for their bucket.
+
+        Args:
+            word: The word to match against
+            start: Starting position in the word
+            candidate_rules: The candidate rules for this position, in priority order
+
+        Returns:
+            The match result if a match is found, None otherwise
+        """
+        key = (word.text[start], start == 0)
+        if key in self.combined_cache:
+            combined = self.combined_cache[key]
+        else:
+            combined = combine_regex_matchers(candidate_rules)
+            self.combined_cache[key] = combined
+
+        if combined is None:
+            return None
+
+        match = combined.match(word.text, start)
+        if not match:
+            return None
+
+        # The wrapper of the winning alternative is the last group to close,
+        # and the match group of its rule is the next group
+        rule_ix = int(match.lastgroup[5:])
+        rule = candidate_rules[rule_ix]
+        end = match.end(combined.groupindex[match.lastgroup] + 1)
+
+        if not self.trace:
+            return RuleMatchResult(word, rule.replacement, start, end, rule.id)
+
+        return ContextualMatchResult(
+            word=word,
+            phonemes=rule.replacement,
+            start=start,
+            end=end,
+            rule_id=rule.id,
+            rules_attempted=AttemptedRules(candidate_rules, rule_ix),
+        )
+
+    def _match_generated(
+        self, word: Word, start: int, candidate_rules: tuple[RegexMatcher, ...]
+    ) -> RuleMatchResult | None:
+        """Match the candidate rules using the generated function for their bucket.
+
+        Args:
+            word: The word to match against
+            start: Starting position in the word
+            candidate_rules: The candidate rules for this position, in priority order
+
+        Returns:
+            The match result if a match is found, None otherwise
+        """
+        text = word.text
+        is_prefix = start == 0
+        function = self.generated_table.get(
+            (text[start], is_prefix), self.wildcard_functions[is_prefix]
+        )
+        found = function(text, start)
+        if found is None:
+            return None
+
+        rule_ix, length = found
+        rule = candidate_rules[rule_ix]
+
+        if not self.trace:
+            return RuleMatchResult(
+                word, rule.replacement, start, start + length, rule.id
+            )
+
+        return ContextualMatchResult(
+            word=word,
+            phonemes=rule.replacement,
+            start=start,
+            end=start + length,
+            rule_id=rule.id,
+            rules_attempted=AttemptedRules(candidate_rules, rule_ix),
+        )
 
     def find_candidate_rules(self, word: Word, start: int) -> tuple[Matcher, ...]:
         """Find candidate rules that might match the word at the given position.
 
-        This method optimizes matching by:
-        1. Filtering rules based on the first letter of the word
-        2. Considering prefix rules only at the start of the word
-        3. Caching results to avoid recomputation
-
         Args:
             word: The word to match against
             start: Starting position in the word
 
         Returns:
-            Tuple of candidate matchers that might match the word
+            Tuple of candidate matchers that might match the word, in priority order
         """
-        test_letter = word.text[start]
         is_prefix = start == 0
+        return self.candidate_table.get(
+            (word.text[start], is_prefix), self.wildcard_candidates[is_prefix]
+        )
 
-        if (test_letter, is_prefix) in self.candidate_cache:
-            return self.candidate_cache[(test_letter, is_prefix)]
+    def find_lookahead_candidates(
+        self, word: Word, start: int
+    ) -> tuple[tuple[Matcher, ...], tuple[tuple[int, Matcher], ...]]:
+        """Find the candidate rules that can match given the next letter and word length.
 
-        matched_rules = []
+        The candidates for the first letter are narrowed down to the rules
+        whose second character matches the next letter, and whose length fits
+        in the rest of the word. The narrowed candidates are built on first use
+        for every (letter and next letter, start of word, remainder) key.
 
-        for rule in self.rules:
-            assert isinstance(
-                rule, RegexMatcher
-            ), f"This optimisation currently only works with regex matchers, but got {type(rule)}"
-            if rule.prefix and not is_prefix:
-                continue
-            if rule.match_group[0] == test_letter:
-                matched_rules.append(rule)
+        Args:
+            word: The word to match against
+            start: Starting position in the word
 
-        matched_rules = tuple(matched_rules)
-        self.candidate_cache[(test_letter, is_prefix)] = matched_rules
-        return matched_rules
+        Returns:
+            The candidate rules for the first letter, and the narrowed candidates
+            with their index among them, in priority order
+        """
+        text = word.text
+        remainder = len(text) - start
+        if remainder > self.max_remainder:
+            remainder = self.max_remainder
+        # The first letter and the next letter, if any
+        key = (text[start : start + 2], start == 0, remainder)
+        candidates = self.lookahead_cache.get(key)
+        if candidates is None:
+            lookahead = key[0][1] if remainder > 1 else None
+            candidate_rules = self.find_candidate_rules(word, start)
+            narrowed = tuple(
+                (ix, rule)
+                for ix, rule in enumerate(candidate_rules)
+                if _fixed_rule_fits(self.fixed_rules.get(rule), lookahead, remainder)
+            )
+            candidates = self.lookahead_cache[key] = (candidate_rules, narrowed)
+        return candidates
 
     @property
     def id(self) -> str:
@@ -263,6 +774,175 @@ class RegexListMatcher(Matcher):
         return len(self.rules)
 
 
+def _fixed_rule_fits(
+    rule: _FixedRule | None, lookahead: str | None, remainder: int
+) -> bool:
+    """Return whether a rule can match given the next letter and the characters left.
+
+    A remainder beyond the length of every rule plus the newline allowed by $
+    stands for all longer remainders, so it never fits a rule anchored at the end.
+
+    Args:
+        rule: The fixed-length rule, or None if the rule is not fixed-length
+        lookahead: The letter after the start position, or None at the end of the word
+        remainder: The number of characters from the start position to the end of the word
+
+    Returns:
+        False if the rule cannot match, True if it might
+    """
+    if rule is None:
+        return True
+
+    length = len(rule.elements)
+    if rule.end is None:
+        if remainder < length:
+            return False
+    elif remainder != length and not (rule.end == "$" and remainder == length + 1):
+        return False
+
+    if length > 1:
+        element = rule.elements[1]
+        if (lookahead in element.characters) == element.negate:
+            return False
+    return True
+
+
+def first_match(rule: Matcher, word: Word, start: int) -> MatchResult | None:
+    """Return the first match of a rule at a position.
+
+    Rules whose class defines match_first are asked for it directly, other
+    matchers only implement match and give their first result.
+
+    Args:
+        rule: The rule to match
+        word: The word to match against
+        start: Starting position in the word
+
+    Returns:
+        The first match result, or None if the rule does not match
+    """
+    match_first = getattr(type(rule), "match_first", None)
+    if match_first is not None:
+        return match_first(rule, word, start)
+    return next(iter(rule.match(word, start)), None)
+
+
+def build_candidate_table(
+    rules: Sequence[Matcher],
+) -> tuple[
+    dict[tuple[str, bool], tuple[Matcher, ...]], tuple[tuple[Matcher, ...], ...]
+]:
+    """Build the table of candidate rules by first letter and start of word.
+
+    Every rule whose match can start with a letter is a candidate for that
+    letter. Prefix rules are only candidates at the start of the word. Rules
+    whose first characters are not known, including matchers that are not
+    RegexMatchers, are candidates for every letter.
+
+    Args:
+        rules: The rules in priority order
+
+    Returns:
+        The candidate rules keyed by (letter, at start of word), and the
+        candidates for letters that are not in the table, indexed by whether
+        the position is the start of the word
+    """
+    first_characters = [getattr(rule, "first_characters", None) for rule in rules]
+    prefixes = [getattr(rule, "prefix", False) for rule in rules]
+    letters = set().union(*(f for f in first_characters if f is not None))
+
+    def candidates(letter: str | None, is_prefix: bool) -> tuple[Matcher, ...]:
+        return tuple(
+            rule
+            for rule, first, prefix in zip(rules, first_characters, prefixes)
+            if (is_prefix or not prefix)
+            and (first is None or (letter is not None and letter in first))
+        )
+
+    table = {
+        (letter, is_prefix): candidates(letter, is_prefix)
+        for letter in sorted(letters)
+        for is_prefix in (False, True)
+    }
+    wildcards = (candidates(None, False), candidates(None, True))
+    return table, wildcards
+
+
+def combine_regex_matchers(rules: Sequence[RegexMatcher]) -> re.Pattern | None:
+    """Combine a list of regex matchers into a single alternation pattern.
+
+    Each rule becomes one alternative, in priority order, wrapped in a group
+    named ``_rule<index>``. Python tries alternatives from left to right, so
+    the alternative that matches identifies the first matching rule, and the
+    match group of that rule is the group after its wrapper. The combined
+    pattern is unanchored and is meant to be used with
+    ``pattern.match(text, start)``.
+
+    The rules must not refer to their groups, as the group numbers change,
+    and must not share group names, see check_combinable.
+
+    Args:
+        rules: The regex matchers to combine, in priority order
+
+    Returns:
+        The compiled combined pattern, or None if there are no rules
+    """
+    if not rules:
+        return None
+
+    alternatives = []
+    for ix, rule in enumerate(rules):
+        # Prefix rules start with a caret, which we drop as the combined
+        # pattern is anchored by matching at the start position instead
+        pattern = rule.pattern.removeprefix("^")
+        alternatives.append(f"(?P<_rule{ix}>(?:{pattern}))")
+
+    return re.compile("|".join(alternatives))
+
+
+def check_combinable(rules: Sequence[Matcher]) -> None:
+    """Check that rules can be combined by combine_regex_matchers.
+
+    Args:
+        rules: The rules to check
+
+    Raises:
+        ValueError: If a rule is not a RegexMatcher, refers to a group, or
+            uses a group name another rule uses as well
+    """
+    names: dict[str, str] = {}
+    for rule in rules:
+        if not isinstance(rule, RegexMatcher):
+            raise ValueError(
+                f"Compiled mode needs RegexMatcher rules, got {type(rule).__name__}"
+            )
+        if _has_group_references(_parser.parse(rule.rule.pattern, rule.rule.flags)):
+            raise ValueError(
+                f"Rule {rule.id} refers to a group and cannot be combined: {rule.pattern}"
+            )
+        for name in rule.rule.groupindex:
+            if name in names:
+                raise ValueError(
+                    f"Rules {names[name]} and {rule.id} both use the group name {name}"
+                )
+            names[name] = rule.id
+
+
+def _has_group_references(items) -> bool:
+    """Return whether parsed regex items refer to a group by number or name."""
+    for op, av in items:
+        if op in (_parser.GROUPREF, _parser.GROUPREF_EXISTS):
+            return True
+        for value in av if isinstance(av, (tuple, list)) else ():
+            subpatterns = value if isinstance(value, list) else [value]
+            for subpattern in subpatterns:
+                if isinstance(subpattern, _parser.SubPattern) and _has_group_references(
+                    subpattern
+                ):
+                    return True
+    return False
+
+
 def load_specs(rule_file: str | Path) -> tuple[RegexRuleSpec, ...]:
     """Load rule specifications from a YAML file.
 
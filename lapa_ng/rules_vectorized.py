@@ -0,0 +1,391 @@
+"""
+Vectorized whole-corpus matching for LAPA-NG.
+
+The rules generated from the rule tables only use a tiny part of the regular
+expression language: literal letters, the vowel and consonant classes, any
+character and the end of the word. Every rule therefore matches a fixed number
+of characters, and can be evaluated for every word and position of a corpus
+at once with NumPy.
+
+Words are encoded as rows of a uint8 array of character codes, and every
+element of a rule becomes a boolean mask over those codes. Each rule is
+evaluated at every position its first character can match, the first matching
+rule is kept for every position, and the words are then walked from left to
+right, all at the same time.
+
+This trades the latency of a single word for throughput over a whole corpus.
+The results are identical to those of a RegexListMatcher over the same rules.
+"""
+
+from dataclasses import dataclass
+from typing import Generator, Iterable, Sequence
+
+import numpy as np
+
+from lapa_ng.rules_regex import (
+    RegexListMatcher,
+    RegexMatcher,
+    _Element,
+    _parse_fixed_rule,
+)
+from lapa_ng.translator import _CachedTranslation, _translate_batch
+from lapa_ng.types import (
+    AttemptedRules,
+    ContextualMatchResult,
+    EmitValue,
+    MatchResult,
+    RuleMatchResult,
+    TranslationResult,
+    Translator,
+    Word,
+    WordOrWordList,
+)
+
+__all__ = ["CorpusMatches", "VectorizedTranslator"]
+
+# Character codes: 0 for characters no rule mentions, 255 for padding
+_OTHER = 0
+_PAD = 255
+_MAX_CODES = 254
+
+
+@dataclass(frozen=True)
+class CorpusMatches:
+    """The rule matches for every distinct text of a corpus.
+
+    The matches of all texts are stored in flat arrays, the matches of text
+    ``i`` are at ``offsets[i]:offsets[i + 1]``.
+
+    Attributes:
+        rule_ids: The ids of the rules, in priority order
+        texts: The distinct texts of the corpus, in order of first appearance
+        text_index: For every word of the corpus, the index of its text
+        offsets: The start of the matches of every text, and the total number of matches
+        starts: The start position of every match
+        ends: The end position of every match
+        rules: The index of the rule of every match, or -1 if no rule matched
+    """
+
+    rule_ids: tuple[str, ...]
+    texts: tuple[str, ...]
+    text_index: np.ndarray
+    offsets: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+    rules: np.ndarray
+
+    def __len__(self) -> int:
+        """Return the number of words in the corpus."""
+        return len(self.text_index)
+
+    def rule_counts(self) -> dict[str, int]:
+        """Return the number of times every rule matched in the corpus.
+
+        Returns:
+            The number of matches by rule id, for the rules that matched at least once
+        """
+        counts = self._weighted_counts()
+        return {
+            rule_id: int(count)
+            for rule_id, count in zip(self.rule_ids, counts[1:])
+            if count
+        }
+
+    @property
+    def silent_count(self) -> int:
+        """Return the number of characters in the corpus that no rule matched."""
+        return int(self._weighted_counts()[0])
+
+    def _weighted_counts(self) -> np.ndarray:
+        """Return the number of matches of every rule in the corpus, with silent matches first."""
+        occurrences = np.bincount(self.text_index, minlength=len(self.texts))
+        weights = np.repeat(occurrences, np.diff(self.offsets))
+        return np.bincount(
+            self.rules + 1, weights=weights, minlength=len(self.rule_ids) + 1
+        ).astype(np.int64)
+
+
+class VectorizedTranslator(Translator):
+    """A translator that matches a whole corpus at once with NumPy.
+
+    The output of translate and translate_batch is identical to that of a
+    MatchingTranslator over the same RegexListMatcher. For corpus statistics,
+    match_corpus returns the matches as arrays without creating any result
+    objects.
+
+    Attributes:
+        matcher: The matcher whose rules are vectorized
+        batch_size: The number of distinct texts matched at the same time
+    """
+
+    def __init__(self, matcher: RegexListMatcher, batch_size: int = 65_536):
+        """Vectorize the rules of a matcher.
+
+        Args:
+            matcher: The matcher whose rules to vectorize
+            batch_size: The number of distinct texts matched at the same time,
+                which bounds the memory used
+
+        Raises:
+            ValueError: If a rule is not a fixed-length rule, or the rules use
+                too many distinct characters
+        """
+        self.matcher = matcher
+        self.batch_size = batch_size
+        self.rule_ids = tuple(rule.id for rule in matcher.rules)
+
+        for rule in matcher.rules:
+            if not isinstance(rule, RegexMatcher):
+                raise ValueError(f"Rule {rule.id} is not a regex rule")
+        rules = [_parse_fixed_rule(rule) for rule in matcher.rules]
+        for rule, fixed in zip(matcher.rules, rules):
+            if fixed is None:
+                raise ValueError(f"Rule {rule.id} cannot be vectorized: {rule.pattern}")
+
+        # Every character a rule mentions gets its own code, the newline
+        # is needed to tell a wildcard from a $ before a trailing newline
+        alphabet = sorted(
+            {"\n"}.union(*(e.characters for rule in rules for e in rule.elements))
+        )
+        if len(alphabet) > _MAX_CODES:
+            raise ValueError(
+                f"The rules use {len(alphabet)} characters, at most {_MAX_CODES} are supported"
+            )
+        codes = {c: ix + 1 for ix, c in enumerate(alphabet)}
+        self._newline = codes["\n"]
+
+        # Maps code points to character codes, anything beyond it is _OTHER
+        self._lookup = np.full(ord(alphabet[-1]) + 2, _OTHER, dtype=np.uint8)
+        for c, code in codes.items():
+            self._lookup[ord(c)] = code
+
+        self._masks = [
+            tuple(self._element_mask(e, codes) for e in rule.elements) for rule in rules
+        ]
+        self._first_codes = [tuple(np.flatnonzero(m[0])) for m in self._masks]
+        self._group_ends = np.array([r.group_end for r in rules] + [1])
+        self._prefixes = [r.prefix for r in rules]
+        self._ends = [r.end for r in rules]
+        self._max_length = max((len(r.elements) for r in rules), default=1)
+
+    @staticmethod
+    def _element_mask(element: _Element, codes: dict[str, int]) -> np.ndarray:
+        """Return the character codes an element matches, as a boolean mask."""
+        mask = np.full(256, element.negate)
+        for c in element.characters:
+            mask[codes[c]] = not element.negate
+        mask[_PAD] = False
+        return mask
+
+    def match_corpus(self, words: Iterable[Word | str]) -> CorpusMatches:
+        """Match every word of a corpus.
+
+        Every distinct text is matched once, in batches of batch_size texts.
+
+        Args:
+            words: The words or texts of the corpus
+
+        Returns:
+            The matches of every distinct text
+        """
+        index: dict[str, int] = {}
+        text_index = np.fromiter(
+            (
+                index.setdefault(w if isinstance(w, str) else w.text, len(index))
+                for w in words
+            ),
+            dtype=np.int64,
+        )
+        texts = tuple(index)
+
+        batches = [
+            self._match_texts(texts[ix : ix + self.batch_size])
+            for ix in range(0, len(texts), self.batch_size)
+        ]
+        counts, starts, ends, rules = (
+            np.concatenate([b[i] for b in batches] or [np.zeros(0, dtype=np.int64)])
+            for i in range(4)
+        )
+        return CorpusMatches(
+            rule_ids=self.rule_ids,
+            texts=texts,
+            text_index=text_index,
+            offsets=np.concatenate([[0], np.cumsum(counts)]),
+            starts=starts,
+            ends=ends,
+            rules=rules,
+        )
+
+    def _match_texts(
+        self, texts: Sequence[str]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Match a batch of distinct texts.
+
+        Args:
+            texts: The texts to match
+
+        Returns:
+            The number of matches of every text, and the start, end and rule
+            index of every match, ordered by text and start
+        """
+        n = len(texts)
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=n)
+
+        # Lay the texts out as the rows of a grid, padded so that every rule
+        # can be tested at every position without running off the end
+        width = int(lengths.max(initial=0)) + self._max_length
+        code_points = np.frombuffer("".join(texts).encode("utf-32-le"), np.uint32)
+        codes = self._lookup[np.minimum(code_points, len(self._lookup) - 1)]
+        rows = np.repeat(np.arange(n), lengths)
+        row_offsets = np.cumsum(lengths) - lengths
+        positions = rows * width + np.arange(len(codes)) - row_offsets[rows]
+        grid = np.full(n * width, _PAD, dtype=np.uint8)
+        grid[positions] = codes
+
+        # The positions of every character code, to find where a rule can start
+        order = np.argsort(codes, kind="stable")
+        positions_by_code = positions[order]
+        code_bounds = np.searchsorted(codes[order], np.arange(257))
+        word_starts = np.arange(n) * width
+        starts_by_codes: dict[tuple[int, ...], np.ndarray] = {}
+
+        # Later rules are written first, so every position keeps its first matching rule
+        no_match = len(self._masks)
+        winners = np.full(n * width, no_match, dtype=np.int64)
+        for rule_ix in reversed(range(no_match)):
+            masks = self._masks[rule_ix]
+            if self._prefixes[rule_ix]:
+                candidates = word_starts[masks[0][grid[word_starts]]]
+            else:
+                first_codes = self._first_codes[rule_ix]
+                candidates = starts_by_codes.get(first_codes)
+                if candidates is None:
+                    candidates = np.concatenate(
+                        [
+                            positions_by_code[code_bounds[c] : code_bounds[c + 1]]
+                            for c in first_codes
+                        ]
+                        or [np.zeros(0, dtype=np.int64)]
+                    )
+                    starts_by_codes[first_codes] = candidates
+
+            for offset, mask in enumerate(masks[1:], 1):
+                candidates = candidates[mask[grid[candidates + offset]]]
+
+            if self._ends[rule_ix] is not None:
+                candidate_rows = candidates // width
+                end = candidates - candidate_rows * width + len(masks)
+                at_end = end == lengths[candidate_rows]
+                if self._ends[rule_ix] == "$":
+                    # $ also matches before a newline at the end of the text
+                    at_end |= (end == lengths[candidate_rows] - 1) & (
+                        grid[candidates + len(masks)] == self._newline
+                    )
+                candidates = candidates[at_end]
+
+            winners[candidates] = rule_ix
+
+        # Walk all texts from left to right at the same time
+        current = np.zeros(n, dtype=np.int64)
+        live = np.flatnonzero(lengths > 0)
+        steps = []
+        while live.size:
+            start = current[live]
+            rule = winners[live * width + start]
+            end = start + self._group_ends[rule]
+            steps.append((live, start, end, rule))
+            current[live] = end
+            live = live[end < lengths[live]]
+
+        if not steps:
+            empty = np.zeros(0, dtype=np.int64)
+            return np.zeros(n, dtype=np.int64), empty, empty, empty
+
+        match_rows, starts, ends, rules = (
+            np.concatenate([step[i] for step in steps]) for i in range(4)
+        )
+        order = np.argsort(match_rows, kind="stable")
+        rules = rules[order]
+        rules[rules == no_match] = -1
+        return (
+            np.bincount(match_rows, minlength=n),
+            starts[order],
+            ends[order],
+            rules,
+        )
+
+    def translate(
+        self, word: WordOrWordList, *, emit: EmitValue = "rule"
+    ) -> Generator[TranslationResult, None, None]:
+        """Translate words into phonemes, matching all words at once.
+
+        Args:
+            word: The word or words to translate
+            emit: The granularity at which to emit results (word, rule, or phoneme)
+
+        Yields:
+            TranslationResult objects for each match or non-match in the words
+        """
+        if isinstance(word, Word):
+            word = [word]
+        yield from self.translate_batch(word, emit=emit)
+
+    def translate_batch(
+        self, words: Iterable[Word], *, emit: EmitValue = "rule"
+    ) -> Generator[TranslationResult, None, None]:
+        """Translate a batch of words, matching every distinct text only once.
+
+        Args:
+            words: The words to translate
+            emit: The granularity at which to emit results (word, rule, or phoneme)
+
+        Yields:
+            TranslationResult objects for every word, in the order of the input
+        """
+        words = list(words)
+        matches = self.match_corpus(words)
+        index = {text: ix for ix, text in enumerate(matches.texts)}
+        yield from _translate_batch(
+            words,
+            emit,
+            lambda w: _CachedTranslation(self._results(w, matches, index[w.text])),
+        )
+
+    def _results(
+        self, word: Word, matches: CorpusMatches, text_ix: int
+    ) -> Generator[TranslationResult, None, None]:
+        """Yield the rule-level translation results of a word from the corpus matches."""
+        span = slice(matches.offsets[text_ix], matches.offsets[text_ix + 1])
+        for start, end, rule_ix in zip(
+            matches.starts[span].tolist(),
+            matches.ends[span].tolist(),
+            matches.rules[span].tolist(),
+        ):
+            rule = self.matcher.rules[rule_ix] if rule_ix >= 0 else None
+            if rule is None:
+                match_result = MatchResult(word, (), start, end)
+            elif not self.matcher.trace:
+                match_result = RuleMatchResult(
+                    word, rule.replacement, start, end, rule.id
+                )
+            else:
+                match_result = ContextualMatchResult(
+                    word=word,
+                    phonemes=rule.replacement,
+                    start=start,
+                    end=end,
+                    rule_id=rule.id,
+                    rules_attempted=self._rules_attempted(word, start, rule),
+                )
+            yield TranslationResult(
+                word=word,
+                phonemes=match_result.phonemes,
+                match_results=(match_result,),
+            )
+
+    def _rules_attempted(
+        self, word: Word, start: int, rule: RegexMatcher
+    ) -> AttemptedRules:
+        """Return the candidate rules the matcher tries before a rule."""
+        candidates = self.matcher.find_candidate_rules(word, start)
+        return AttemptedRules(candidates, candidates.index(rule))
@@ -98,10 +98,12 @@ def load_regex_matcher_list(
             f"For letter {k[0]} and priority {k[3]} there are {len(v)} duplicates: {', '.join(r.rule_id for r in v)}"
         )
 
+    phoneme_list = PhonemeList.default()
+
     regex_list = []
     for r in sort_function(rules):
         try:
-            regex_list.append(table_rule_to_regex_spec(r))
+            regex_list.append(table_rule_to_regex_spec(r, phoneme_list))
         except Exception as e:
             logger.error(f"Error converting rule {r.rule_id} to regex: {e}")
 
@@ -113,12 +115,20 @@ def load_matcher(
     rules_file: str,
     sheet_name: str | int | None = None,
     sort_function: callable = sort_rules_by_numeric_priority,
+    compiled: bool = False,
+    verify: bool = False,
+    trace: bool = True,
+    codegen: bool = False,
 ) -> RegexListMatcher:
     """
     Load a set of excel rules and convert them to a RegexListMatcher.
     """
     return RegexListMatcher(
-        load_regex_matcher_list(rules_file, sheet_name, sort_function)
+        load_regex_matcher_list(rules_file, sheet_name, sort_function),
+        compiled=compiled,
+        verify=verify,
+        trace=trace,
+        codegen=codegen,
     )
 
 
@@ -132,7 +142,8 @@ def table_rule_to_regex_spec(
 
     Args:
         rule: The tabular rule to convert
-        phoneme_list: Optional phoneme list for phoneme validation
+        phoneme_list: Optional phoneme list for phoneme validation, defaults to
+            the shared default phoneme list
 
     Returns:
         A RegexRuleSpec containing the pattern and replacement information
@@ -215,6 +226,10 @@ class TableRulesMatcher(RegexListMatcher):
         rules_file: str,
         sheet_name: str | int | None = None,
         sort_function: callable = sort_rules_by_numeric_priority,
+        compiled: bool = False,
+        verify: bool = False,
+        trace: bool = True,
+        codegen: bool = False,
     ):
         """Initialise the TableRulesMatcher.
 
@@ -222,8 +237,18 @@ class TableRulesMatcher(RegexListMatcher):
             rules_file: The path to the Excel file containing the rules
             sheet_name: The name of the sheet in the Excel file containing the rules
             sort_function: The function to use to sort the rules
+            compiled: Whether to match each candidate bucket with a single combined pattern
+            verify: Whether to check every match against all rules
+            trace: Whether to record the rules attempted before every match
+            codegen: Whether to match each candidate bucket with a generated function
         """
         matcher_list = load_regex_matcher_list(
             rules_file, sheet_name=sheet_name, sort_function=sort_function
         )
-        super().__init__(matcher_list)
+        super().__init__(
+            matcher_list,
+            compiled=compiled,
+            verify=verify,
+            trace=trace,
+            codegen=codegen,
+        )
@@ -1,5 +1,8 @@
+import functools
+import hashlib
 import unicodedata
-from typing import Iterable
+from types import CodeType
+from typing import Any, Iterable
 
 from lapa_ng.types import Word
 
@@ -14,9 +17,87 @@ def create_pipeline(*functions: callable) -> callable:
             text = function(text)
         return text
 
+    combined_function.__name__ = "+".join(
+        getattr(f, "__name__", type(f).__name__) for f in functions
+    )
+    # The id identifies the pipeline in the keys of the persistent cache
+    combined_function.pipeline_id = (
+        f"{combined_function.__name__}:{cleaner_fingerprint(*functions)}"
+    )
     return combined_function
 
 
+def cleaner_fingerprint(*functions: callable) -> str:
+    """Return a fingerprint of the configuration of a list of cleaners.
+
+    The fingerprint covers the name, the code, the default arguments and the
+    closure of every function, and the function and arguments of a
+    functools.partial, so changing a cleaner or its arguments gives a new
+    fingerprint. Changes to other functions a cleaner calls are not covered,
+    clear the persistent cache after changing those.
+
+    Args:
+        functions: The cleaners, in order
+
+    Returns:
+        The first 16 hex digits of the SHA-256 hash of the configuration
+    """
+    description = repr(tuple(_describe_function(f) for f in functions))
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()[:16]
+
+
+def _describe_function(function: Any) -> Any:
+    """Return a stable description of a function and its configuration."""
+    if isinstance(function, functools.partial):
+        return (
+            "partial",
+            _describe_function(function.func),
+            _describe_value(function.args),
+            _describe_value(function.keywords),
+        )
+
+    code = getattr(function, "__code__", None)
+    if code is None:
+        return (type(function).__qualname__, repr(function))
+
+    closure = tuple(cell.cell_contents for cell in function.__closure__ or ())
+    return (
+        function.__module__,
+        function.__qualname__,
+        _describe_code(code),
+        _describe_value(function.__defaults__),
+        _describe_value(function.__kwdefaults__),
+        _describe_value(closure),
+    )
+
+
+def _describe_code(code: CodeType) -> Any:
+    """Return a description of a code object, including its nested code objects."""
+    return (
+        code.co_code,
+        code.co_names,
+        tuple(_describe_value(c) for c in code.co_consts),
+    )
+
+
+def _describe_value(value: Any) -> Any:
+    """Return a description of a value that does not depend on hash randomization."""
+    if isinstance(value, CodeType):
+        return _describe_code(value)
+    if callable(value):
+        return _describe_function(value)
+    if isinstance(value, (set, frozenset)):
+        return ("set", tuple(sorted(repr(_describe_value(v)) for v in value)))
+    if isinstance(value, dict):
+        return (
+            "dict",
+            tuple(sorted((repr(k), _describe_value(v)) for k, v in value.items())),
+        )
+    if isinstance(value, (tuple, list)):
+        return tuple(_describe_value(v) for v in value)
+    return value
+
+
 def ensure_text(text: str | None) -> str:
     """
     Ensure that the text is a string and not None.
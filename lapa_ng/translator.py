@@ -1,11 +1,18 @@
-from typing import Generator, Iterable
-
-from cachetools import LFUCache
-
+import json
+import sys
+from dataclasses import fields
+from functools import cache
+from typing import Any, Callable, Generator, Iterable, Sequence
+
+from lapa_ng.cache import CacheStats, StatsLFUCache, TranslationStore
+from lapa_ng.phonemes import PhonemeList
 from lapa_ng.types import (
+    ContextualMatchResult,
     EmitValue,
     Matcher,
     MatchResult,
+    Phoneme,
+    RuleMatchResult,
     TranslationResult,
     Translator,
     Word,
@@ -40,8 +47,8 @@ def _collect_words(
         Yields:
             A single TranslationResult combining all phonemes and match results
         """
-        phonemes = [ph for t in translations for ph in t.phonemes]
-        match_results = [mr for t in translations for mr in t.match_results]
+        phonemes = tuple(ph for t in translations for ph in t.phonemes)
+        match_results = tuple(mr for t in translations for mr in t.match_results)
         yield TranslationResult(
             word=word, phonemes=phonemes, match_results=match_results
         )
@@ -96,10 +103,61 @@ def _collect_phonemes(
     for r in result:
         for phoneme in r.phonemes:
             yield TranslationResult(
-                word=r.word, phonemes=[phoneme], match_results=r.match_results
+                word=r.word, phonemes=(phoneme,), match_results=r.match_results
             )
 
 
+def _get_collector(
+    emit: EmitValue,
+) -> Callable[[Iterable[TranslationResult]], Generator[TranslationResult, None, None]]:
+    """Return the collector that produces results at the given granularity.
+
+    Args:
+        emit: The granularity at which to emit results (word, rule, or phoneme)
+
+    Returns:
+        A collector that turns rule-level results into results at that granularity
+    """
+    assert emit in ("word", "rule", "phoneme")
+
+    if emit == "rule":
+        return _collect_rules
+    elif emit == "word":
+        return _collect_words
+    else:
+        return _collect_phonemes
+
+
+def _translate_batch(
+    words: Iterable[Word],
+    emit: EmitValue,
+    translate_text: Callable[[Word], "_CachedTranslation"],
+) -> Generator[TranslationResult, None, None]:
+    """Translate a batch of words, translating every distinct text only once.
+
+    The first word with a given text is translated with ``translate_text`` and
+    the translation is kept for the rest of the batch. Every word gets its own
+    results, bound to that word, in the order of the input.
+
+    Args:
+        words: The words to translate
+        emit: The granularity at which to emit results (word, rule, or phoneme)
+        translate_text: Returns the rule-level translation of a word
+
+    Yields:
+        TranslationResult objects for every word in the batch
+    """
+    collector = _get_collector(emit)
+
+    translations: dict[str, _CachedTranslation] = {}
+    for w in words:
+        value = translations.get(w.text)
+        if value is None:
+            value = translate_text(w)
+            translations[w.text] = value
+        yield from collector(value.bind(w))
+
+
 class MatchingTranslator(Translator):
     """A translator that uses a matcher to translate words into phonemes.
 
@@ -118,6 +176,12 @@ class MatchingTranslator(Translator):
         """
         self.matcher = matcher
 
+    def cache_stats(self) -> list[CacheStats]:
+        """Return the statistics of the caches of the matcher, if it has any."""
+        if hasattr(self.matcher, "cache_stats"):
+            return self.matcher.cache_stats()
+        return []
+
     def translate(
         self, word: WordOrWordList, *, emit: EmitValue = "rule"
     ) -> Generator[TranslationResult, None, None]:
@@ -134,14 +198,7 @@ class MatchingTranslator(Translator):
         Yields:
             TranslationResult objects for each match or non-match in the word
         """
-        assert emit in ("word", "rule", "phoneme")
-
-        if emit == "rule":
-            collector = _collect_rules
-        elif emit == "word":
-            collector = _collect_words
-        else:
-            collector = _collect_phonemes
+        collector = _get_collector(emit)
 
         if isinstance(word, Word):
             word = [word]
@@ -149,12 +206,34 @@ class MatchingTranslator(Translator):
         for w in word:
             yield from collector(self._translate_word(w))
 
+    def translate_batch(
+        self, words: Iterable[Word], *, emit: EmitValue = "rule"
+    ) -> Generator[TranslationResult, None, None]:
+        """Translate a batch of words, matching every distinct text only once.
+
+        Natural text repeats a small number of forms very often, so this saves
+        most of the matching for a document. Unlike the CachedTranslator, the
+        results of the batch are never evicted, and the output is the same as
+        that of translate.
+
+        Args:
+            words: The words to translate
+            emit: The granularity at which to emit results (word, rule, or phoneme)
+
+        Yields:
+            TranslationResult objects for every word, in the order of the input
+        """
+        yield from _translate_batch(
+            words, emit, lambda w: _CachedTranslation(self._translate_word(w))
+        )
+
     def _translate_word(self, word: Word) -> Generator[TranslationResult, None, None]:
         """Translate a single word into phonemes.
 
         This internal method handles the actual translation of a word by
         repeatedly matching substrings against rules until the entire word
-        is processed.
+        is processed. If the matcher provides match_first, it is asked for one
+        result at a time instead of collecting the results of match.
 
         Args:
             word: The word to translate
@@ -162,40 +241,212 @@ class MatchingTranslator(Translator):
         Yields:
             TranslationResult objects for each match in the word
         """
-        word_remainder = word.text
-        start_length = len(word_remainder)
+        current_pos = 0
+        word_length = len(word.text)
+
+        # Looked up on the class, so a mock configured with only match is not
+        # taken for a matcher with a fast path
+        match_first = getattr(type(self.matcher), "match_first", None)
+        if match_first is not None:
+            matcher = self.matcher
+            while current_pos < word_length:
+                match_result = match_first(matcher, word, current_pos)
+                if match_result is None:
+                    # If no match, yield a 'silent' match with empty phonemes
+                    match_result = MatchResult(
+                        word=word,
+                        phonemes=(),
+                        start=current_pos,
+                        end=current_pos + 1,
+                    )
+                    current_pos += 1
+                else:
+                    current_pos = match_result.end
 
-        while word_remainder:
-            current_length = len(word_remainder)
-            current_pos = start_length - current_length
+                yield TranslationResult(
+                    word=match_result.word,
+                    phonemes=match_result.phonemes,
+                    match_results=(match_result,),
+                )
+            return
 
+        while current_pos < word_length:
             matched: list[MatchResult] = list(
                 self.matcher.match(word=word, start=current_pos)
             )
             if matched:
-                word_remainder = matched[-1].remainder
+                current_pos = matched[-1].end
             else:
                 # If no match, yield a 'silent' match with empty phonemes
-                matched_part = word_remainder[0]
-                word_remainder = word_remainder[1:]
                 matched.append(
                     MatchResult(
                         word=word,
-                        phonemes=[],
+                        phonemes=(),
                         start=current_pos,
-                        matched=matched_part,
-                        remainder=word_remainder,
+                        end=current_pos + 1,
                     )
                 )
+                current_pos += 1
 
             for match_result in matched:
                 yield TranslationResult(
                     word=match_result.word,
                     phonemes=match_result.phonemes,
-                    match_results=[match_result],
+                    match_results=(match_result,),
                 )
 
 
+# The match result classes that can be serialized, by name
+_MATCH_RESULT_TYPES = {
+    cls.__name__: cls for cls in (MatchResult, RuleMatchResult, ContextualMatchResult)
+}
+
+
+def _encode_phonemes(phonemes: Sequence[Phoneme]) -> list[str | list[str | None]]:
+    """Return a serializable form of a sequence of phonemes.
+
+    Phonemes from the default phoneme list are stored by their SAMPA string,
+    other phonemes in full.
+    """
+    default = PhonemeList.default()
+    encoded = []
+    for p in phonemes:
+        try:
+            known = default[p.sampa] == p
+        except KeyError:
+            known = False
+        encoded.append(p.sampa if known else [p.sampa, p.ipa, p.example, p.notes])
+    return encoded
+
+
+def _decode_phonemes(data: list[str | list[str | None]]) -> tuple[Phoneme, ...]:
+    """Create a tuple of phonemes from the form returned by _encode_phonemes."""
+    default = PhonemeList.default()
+    return tuple(default[p] if isinstance(p, str) else Phoneme(*p) for p in data)
+
+
+def _encode_field(name: str, value: Any) -> Any:
+    """Return a serializable form of a match result field."""
+    if name == "phonemes":
+        return _encode_phonemes(value)
+    if name == "rules_attempted":
+        return list(value)
+    return value
+
+
+def _decode_field(name: str, value: Any) -> Any:
+    """Create a match result field from the form returned by _encode_field."""
+    if name == "phonemes":
+        return _decode_phonemes(value)
+    if name == "rules_attempted":
+        return tuple(sys.intern(r) for r in value)
+    if name == "rule_id":
+        return sys.intern(value)
+    return value
+
+
+@cache
+def _detached_fields(cls: type[MatchResult]) -> tuple[str, ...]:
+    """Return the fields of a match result class other than the leading word."""
+    names = tuple(f.name for f in fields(cls))
+    assert names[0] == "word", f"{cls.__name__} must start with its word"
+    return names[1:]
+
+
+class _CachedTranslation:
+    """A rule-level translation detached from the word it was computed for.
+
+    The match results are stored without their word, as their class and the
+    values of their other fields, so a cached translation can be rebound to
+    every word with the same text while keeping that word's own attributes.
+
+    Attributes:
+        results: Pairs of phonemes and detached match results, one per rule-level result
+    """
+
+    __slots__ = ("results",)
+
+    def __init__(self, results: Iterable[TranslationResult]):
+        """Detach rule-level translation results from their word.
+
+        Args:
+            results: The rule-level translation results of a single word
+        """
+        self.results = tuple(
+            (
+                r.phonemes,
+                tuple(
+                    (
+                        type(mr),
+                        tuple(getattr(mr, f) for f in _detached_fields(type(mr))),
+                    )
+                    for mr in r.match_results
+                ),
+            )
+            for r in results
+        )
+
+    def bind(self, word: Word) -> Generator[TranslationResult, None, None]:
+        """Yield the rule-level translation results for the given word.
+
+        Args:
+            word: The word to bind the translation to
+
+        Yields:
+            TranslationResult objects for the word
+        """
+        for phonemes, match_results in self.results:
+            yield TranslationResult(
+                word,
+                phonemes,
+                tuple(cls(word, *values) for cls, values in match_results),
+            )
+
+    def dumps(self) -> str:
+        """Serialize the translation to JSON, for the persistent store."""
+        return json.dumps(
+            [
+                [
+                    _encode_phonemes(phonemes),
+                    [
+                        [
+                            cls.__name__,
+                            *map(_encode_field, _detached_fields(cls), values),
+                        ]
+                        for cls, values in match_results
+                    ],
+                ]
+                for phonemes, match_results in self.results
+            ],
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def loads(cls, data: str) -> "_CachedTranslation":
+        """Create a translation from JSON created by dumps."""
+        value = cls.__new__(cls)
+        value.results = tuple(
+            (
+                _decode_phonemes(phonemes),
+                tuple(
+                    (
+                        _MATCH_RESULT_TYPES[name],
+                        tuple(
+                            map(
+                                _decode_field,
+                                _detached_fields(_MATCH_RESULT_TYPES[name]),
+                                values,
+                            )
+                        ),
+                    )
+                    for name, *values in match_results
+                ),
+            )
+            for phonemes, match_results in json.loads(data)
+        )
+        return value
+
+
 class CachedTranslator(Translator):
     """A translator that caches results to improve performance.
 
@@ -203,20 +454,46 @@ class CachedTranslator(Translator):
     recomputing translations for the same words. It uses an LFU (Least
     Frequently Used) cache to manage the cache size.
 
+    The cache holds the rule-level translation of each word text once. Word and
+    phoneme level results are derived from it with the same collectors the
+    MatchingTranslator uses, so switching between emit modes does not require
+    the words to be matched again. Cached translations are stored without their
+    word and are rebound to each incoming word, so results always carry the
+    caller's word and attributes.
+
+    Optionally, a persistent TranslationStore sits behind the in-memory cache.
+    Words that miss the in-memory cache are looked up in the store before they
+    are translated, and new translations are added to it.
+
     Attributes:
-        cache: The LFU cache storing translation results
+        cache: The LFU cache storing rule-level translation results by word text
         parent: The underlying translator being cached
+        store: The persistent translation store, if any
     """
 
-    def __init__(self, parent: Translator, cache_size: int = 10_000):
+    def __init__(
+        self,
+        parent: Translator,
+        cache_size: int = 10_000,
+        store: TranslationStore | None = None,
+    ):
         """Initialize with a translator and cache size.
 
         Args:
             parent: The translator to cache results from
             cache_size: Maximum number of translations to cache
+            store: Optional persistent store for the translations of the parent
         """
-        self.cache = LFUCache(maxsize=cache_size)
+        self.cache = StatsLFUCache(maxsize=cache_size)
         self.parent = parent
+        self.store = store
+
+    def cache_stats(self) -> list[CacheStats]:
+        """Return the statistics of the translation cache and the caches of the parent."""
+        stats = [self.cache.stats("translator")]
+        if hasattr(self.parent, "cache_stats"):
+            stats.extend(self.parent.cache_stats())
+        return stats
 
     def translate(
         self, word: WordOrWordList, *, emit: EmitValue | None = None
@@ -225,22 +502,67 @@ class CachedTranslator(Translator):
 
         This method first checks the cache for existing translations.
         If found, it yields the cached results. Otherwise, it computes
-        the translation using the parent translator and caches the results.
+        the rule-level translation using the parent translator and caches
+        the results.
 
         Args:
             word: The word or words to translate
-            emit: The granularity at which to emit results
+            emit: The granularity at which to emit results, defaults to "rule"
 
         Yields:
             TranslationResult objects containing the phonetic translations
         """
+        collector = _get_collector(emit or "rule")
+
         word = [word] if isinstance(word, Word) else word
-        for w in word:
-            value = self.cache.get((w.text, emit))
-            if value:
-                yield from value
-                continue
-
-            t = tuple(self.parent.translate(w, emit=emit))
-            self.cache[(w.text, emit)] = t
-            yield from t
+        try:
+            for w in word:
+                yield from collector(self._lookup(w).bind(w))
+        finally:
+            self.flush()
+
+    def translate_batch(
+        self, words: Iterable[Word], *, emit: EmitValue | None = None
+    ) -> Generator[TranslationResult, None, None]:
+        """Translate a batch of words, looking up every distinct text only once.
+
+        Within the batch the translations are kept in full, so a text that is
+        evicted from the cache is not translated again. The cache still carries
+        translations over from one batch to the next.
+
+        Args:
+            words: The words to translate
+            emit: The granularity at which to emit results, defaults to "rule"
+
+        Yields:
+            TranslationResult objects for every word, in the order of the input
+        """
+        try:
+            yield from _translate_batch(words, emit or "rule", self._lookup)
+        finally:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending translations to the persistent store, if any."""
+        if self.store is not None:
+            self.store.flush()
+
+    def _lookup(self, word: Word) -> _CachedTranslation:
+        """Return the cached translation of a word, translating it on a miss."""
+        value = self.cache.get(word.text)
+        if value is None:
+            value = self._load(word)
+            self.cache[word.text] = value
+        return value
+
+    def _load(self, word: Word) -> _CachedTranslation:
+        """Return the stored translation of a word, translating and storing it on a miss."""
+        if self.store is not None:
+            stored = self.store.get(word.text)
+            if stored is not None:
+                return _CachedTranslation.loads(stored)
+
+        value = _CachedTranslation(self.parent.translate(word, emit="rule"))
+        if self.store is not None:
+            self.store.put(word.text, value.dumps())
+        return value
@@ -1,5 +1,6 @@
+from collections.abc import Sequence as SequenceABC
 from dataclasses import dataclass, field
-from typing import Generator, Iterable, Literal, Protocol, Sequence, TypeAlias
+from typing import Any, Generator, Iterable, Literal, Protocol, Sequence, TypeAlias
 
 
 @dataclass(frozen=True)
@@ -39,26 +40,37 @@ class Phoneme:
     notes: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MatchResult:
     """The result of matching a substring of a word against a rule.
 
     This class represents a successful match between a word and a rule pattern,
     containing information about what was matched and the resulting phonemes.
+    The match is stored as offsets into the word, the matched substring and the
+    remainder of the word are only sliced when they are asked for. Match results
+    are slotted and immutable, as a corpus run keeps a great many of them alive.
 
     Attributes:
         word (Word): The original word being matched
         phonemes (Sequence[Phoneme]): The phonemes produced by the match
         start (int): The starting position of the match in the word
-        matched (str): The substring that was matched
-        remainder (str): The remaining part of the word after the match
+        end (int): The position in the word just after the match
     """
 
     word: Word
     phonemes: Sequence[Phoneme]
     start: int
-    matched: str
-    remainder: str
+    end: int
+
+    @property
+    def matched(self) -> str:
+        """The substring of the word that was matched."""
+        return self.word.text[self.start : self.end]
+
+    @property
+    def remainder(self) -> str:
+        """The remaining part of the word after the match."""
+        return self.word.text[self.end :]
 
     def phoneme_str(self, separator: str = " ") -> str:
         """Return a string of the phonemes separated by the given separator.
@@ -72,25 +84,95 @@ class MatchResult:
         return separator.join(p.sampa for p in self.phonemes)
 
 
-@dataclass(frozen=True)
-class ContextualMatchResult(MatchResult):
-    """A match result that includes information about the rules used.
+@dataclass(frozen=True, slots=True)
+class RuleMatchResult(MatchResult):
+    """A match result that includes the rule used.
 
-    Extends MatchResult to include information about which rule was used
-    and what other rules were attempted.
+    Matchers in lean mode return these instead of ContextualMatchResults, as
+    keeping track of the rules attempted costs time and memory on every match.
 
     Attributes:
         rule_id (str): The identifier of the rule that produced this match
-        rules_attempted (tuple[str, ...]): List of rule IDs that were tried
-            before finding this match
     """
 
     rule_id: str
-    rules_attempted: tuple[str, ...]
+
+
+class AttemptedRules(SequenceABC):
+    """The ids of the rules attempted before a match, as a prefix of the candidates.
+
+    A matcher attempts its candidate rules in order until one matches, so the
+    rules attempted are always the first rules of the candidates. Rather than
+    copying their ids for every match, this refers to the shared tuple of
+    candidates and stores how many were attempted. The ids are only looked up
+    when the sequence is indexed or iterated.
+
+    AttemptedRules compares equal to any other sequence of the same ids, such
+    as a tuple.
+
+    Attributes:
+        candidates: The candidate rules, each with an id attribute
+        count: The number of candidates attempted
+    """
+
+    __slots__ = ("candidates", "count")
+
+    def __init__(self, candidates: Sequence[Any], count: int):
+        """Refer to the first rules of a tuple of candidates.
+
+        Args:
+            candidates: The candidate rules, in the order they were attempted
+            count: The number of candidates attempted
+        """
+        self.candidates = candidates
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(r.id for r in self.candidates[: self.count][index])
+        if not -self.count <= index < self.count:
+            raise IndexError("AttemptedRules index out of range")
+        return self.candidates[index % self.count].id
+
+    def __iter__(self):
+        for ix in range(self.count):
+            yield self.candidates[ix].id
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, AttemptedRules):
+            if self.candidates is other.candidates and self.count == other.count:
+                return True
+        elif not isinstance(other, SequenceABC) or isinstance(other, str):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return repr(tuple(self))
+
+
+@dataclass(frozen=True, slots=True)
+class ContextualMatchResult(RuleMatchResult):
+    """A match result that includes information about the rules used.
+
+    Extends RuleMatchResult to include information about what other rules
+    were attempted.
+
+    Attributes:
+        rules_attempted (Sequence[str]): The IDs of the rules that were tried
+            before finding this match, an AttemptedRules or a tuple
+    """
+
+    rules_attempted: Sequence[str]
 
     @classmethod
     def from_match_result(
-        cls, match_result: MatchResult, rule_id: str, rules_attempted: tuple[str, ...]
+        cls, match_result: MatchResult, rule_id: str, rules_attempted: Sequence[str]
     ) -> "ContextualMatchResult":
         """Create a ContextualMatchResult from a basic MatchResult.
 
@@ -106,8 +188,7 @@ class ContextualMatchResult(MatchResult):
             match_result.word,
             match_result.phonemes,
             match_result.start,
-            match_result.matched,
-            match_result.remainder,
+            match_result.end,
             rule_id,
             rules_attempted,
         )
@@ -119,6 +200,11 @@ class Matcher(Protocol):
     A matcher is responsible for finding matches between substrings of words
     and rule patterns, returning the corresponding phonetic transcriptions.
 
+    Matchers may also provide match_first(word, start), which returns the
+    next match result at a position, or None, without creating a generator.
+    The MatchingTranslator calls it instead of match when the matcher's class
+    defines it, and continues from the end of each result it returns.
+
     Methods:
         match: Find matches for a word starting at a given position
     """
@@ -146,12 +232,13 @@ This defines the different levels at which translation results can be emitted:
 """
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TranslationResult:
     """The result of translating a word into phonemes.
 
     This class represents the complete translation of a word, including
-    all phonemes and the match results that produced them.
+    all phonemes and the match results that produced them. The translators
+    produce tuples for the phonemes and match results.
 
     Attributes:
         word (Word): The original word being translated
@@ -1,9 +1,76 @@
 from pathlib import Path
+from typing import Callable
+
 import pytest
 
+from lapa_ng.rules_regex import RegexMatcher, RegexRuleSpec
+from lapa_ng.types import Phoneme, Word
+
 TEST_ROOT = Path(__file__).parent
 FIXTURES_ROOT = TEST_ROOT.parent / "fixtures"
 
+EDGE_CASE_PATTERNS = (
+    "^(ab)",
+    "(a)$",
+    "(b).a",
+    "([:vowel:]x)[^z]",
+    "(é)",
+    "(c)[:consonant:]",
+    r"(x)\Z",
+    "(.)b",
+)
+EDGE_CASE_TEXTS = (
+    "",
+    "ab",
+    "xab",
+    "aab",
+    "ba",
+    "bxa",
+    "b\na",
+    "a\n",
+    "ab\n",
+    "\nb",
+    "1b",
+    "axy",
+    "axz",
+    "é",
+    "cé",
+    "cd",
+    "ccd",
+    "cx",
+    "ça",
+    "xx",
+    "x\n",
+)
+
+
 @pytest.fixture
 def fixtures_path() -> Path:
-    return FIXTURES_ROOT 
+    return FIXTURES_ROOT
+
+
+@pytest.fixture
+def regex_rules() -> Callable[..., list[RegexMatcher]]:
+    """Return a factory for regex rules with ids r0, r1, ... and phonemes P0, P1, ..."""
+
+    def factory(*patterns: str) -> list[RegexMatcher]:
+        return [
+            RegexMatcher(
+                RegexRuleSpec(id=f"r{ix}", pattern=p, replacement=[Phoneme(f"P{ix}")])
+            )
+            for ix, p in enumerate(patterns)
+        ]
+
+    return factory
+
+
+@pytest.fixture
+def edge_case_rules(regex_rules) -> list[RegexMatcher]:
+    """Fixed-length rules covering anchors, classes, negation and non-ASCII letters."""
+    return regex_rules(*EDGE_CASE_PATTERNS)
+
+
+@pytest.fixture
+def edge_case_words() -> list[Word]:
+    """Words exercising the edge cases of edge_case_rules."""
+    return [Word(t, {"id": str(ix)}) for ix, t in enumerate(EDGE_CASE_TEXTS)]
@@ -0,0 +1,80 @@
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from lapa_ng.benchmark import (
+    compare_results,
+    load_results,
+    run_benchmarks,
+    save_results,
+    synthetic_corpus,
+)
+
+
+def test_synthetic_corpus():
+    corpus = synthetic_corpus(1000, vocabulary=100, seed=5)
+    assert len(corpus) == 1000
+    assert corpus == synthetic_corpus(1000, vocabulary=100, seed=5)
+    assert corpus != synthetic_corpus(1000, vocabulary=100, seed=6)
+
+    texts = [w.text for w in corpus]
+    assert len(set(texts)) <= 100
+    assert all(t and t.isalpha() for t in texts)
+
+    # The distribution is Zipfian, so the most common form is far more common than average
+    most_common = max(texts.count(t) for t in set(texts))
+    assert most_common > 5 * len(texts) / len(set(texts))
+
+
+def test_run_benchmarks(fixtures_path):
+    results = run_benchmarks(
+        fixtures_path / "RULES_A_V1.5.xls", sheet_name="RULES", corpus_size=200
+    )
+
+    assert results["meta"]["corpus_size"] == 200
+    assert set(results["results"]) == {
+        "ng.read_excel",
+        "ng.load",
+        "ng.match",
+        "ng.translate",
+        "ng.translate_lean",
+        "ng.translate_codegen",
+        "ng.translate_codegen_lean",
+        "ng.translate_batch",
+        "ng.translate_cached",
+        "ng.vectorized",
+        "classic.load",
+        "classic.translate",
+        "classic.translate_untraced",
+    }
+
+    translate = results["results"]["ng.translate"]
+    assert translate["items"] == 200
+    assert translate["items_per_second"] > 0
+    assert translate["peak_memory"] > 0
+    assert 0 < results["results"]["ng.translate_cached"]["extra"]["hit_rate"] < 1
+
+    with TemporaryDirectory() as temp_dir:
+        output_file = f"{temp_dir}/results.json"
+        save_results(results, output_file)
+        assert load_results(output_file) == results
+
+
+def test_run_benchmarks_unknown_engine(fixtures_path):
+    with pytest.raises(ValueError):
+        run_benchmarks(fixtures_path / "RULES_A_V1.5.xls", engines=["fast"])
+
+
+def test_compare_results():
+    def stage(us, memory):
+        return {"microseconds_per_item": us, "peak_memory": memory}
+
+    baseline = {"results": {"a": stage(10, 100), "b": stage(10, 100)}}
+    current = {"results": {"a": stage(10.5, 100), "b": stage(20, 90), "c": stage(1, 1)}}
+
+    comparison = compare_results(baseline, current, tolerance=0.1)
+    assert [c["name"] for c in comparison] == ["a", "b"]
+    assert comparison[0]["regression"] is False
+    assert comparison[1]["regression"] is True
+    assert comparison[1]["latency_change"] == pytest.approx(1.0)
+    assert comparison[1]["memory_change"] == pytest.approx(-0.1)
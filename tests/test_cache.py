@@ -0,0 +1,179 @@
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+
+import pytest
+
+from lapa_ng.cache import (
+    StatsLFUCache,
+    TranslationStore,
+    approximate_size,
+    matcher_fingerprint,
+    recommend_cache_size,
+    replay_corpus,
+)
+from lapa_ng.factory import create_matcher
+from lapa_ng.rules_regex import RegexListMatcher, RegexMatcher, RegexRuleSpec
+from lapa_ng.translator import CachedTranslator, MatchingTranslator
+from lapa_ng.types import AttemptedRules, Phoneme, Word
+
+
+def test_translation_store():
+    with TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "cache" / "translations.sqlite"
+
+        with TranslationStore(path, "rules-1", "clean") as store:
+            store.put("een", "value-1")
+            assert store.get("een") == "value-1"
+            assert store.get("twee") is None
+
+        with TranslationStore(path, "rules-1", "clean") as store:
+            assert store.get("een") == "value-1"
+            assert len(store) == 1
+
+        with TranslationStore(path, "rules-2", "clean") as store:
+            assert store.get("een") is None
+
+        with TranslationStore(path, "rules-1", "other") as store:
+            assert store.get("een") is None
+
+
+def test_matcher_fingerprint(fixtures_path):
+    rules_file = fixtures_path / "RULES_A_V1.5.xls"
+    numeric = create_matcher(f"ng:{rules_file}#RULES")
+    alpha = create_matcher(f"ng:{rules_file}#RULES?sort=alpha")
+    compiled = create_matcher(f"ng:{rules_file}#RULES?compiled=true")
+
+    assert matcher_fingerprint(numeric) == matcher_fingerprint(compiled)
+    assert matcher_fingerprint(numeric) != matcher_fingerprint(alpha)
+
+    with pytest.raises(ValueError):
+        matcher_fingerprint(Mock(spec=["match"]))
+
+
+def test_cached_translator_store(fixtures_path):
+    matcher = create_matcher(f"ng:{fixtures_path / 'RULES_A_V1.5.xls'}#RULES")
+    words = [Word(text=t) for t in ["gheen", "vrienden", "ende", "liefde", "ende"]]
+    expected = list(MatchingTranslator(matcher).translate(words))
+
+    with TemporaryDirectory() as temp_dir:
+        with TranslationStore.for_matcher(temp_dir, matcher) as store:
+            translator = CachedTranslator(MatchingTranslator(matcher), store=store)
+            assert list(translator.translate_batch(words)) == expected
+            assert len(store) == 4
+
+        # A new translator finds every word in the store and never matches
+        parent = Mock(wraps=MatchingTranslator(matcher))
+        with TranslationStore.for_matcher(temp_dir, matcher) as store:
+            translator = CachedTranslator(parent, store=store)
+            assert list(translator.translate(words)) == expected
+            assert list(translator.translate(words, emit="word")) == list(
+                MatchingTranslator(matcher).translate(words, emit="word")
+            )
+        parent.translate.assert_not_called()
+
+
+def test_cached_translator_store_lean(fixtures_path):
+    rules_file = fixtures_path / "RULES_A_V1.5.xls"
+    traced = create_matcher(f"ng:{rules_file}#RULES")
+    lean = create_matcher(f"ng:{rules_file}#RULES?trace=0")
+    words = [Word(text=t) for t in ["gheen", "vrienden", "ende"]]
+    expected = list(MatchingTranslator(lean).translate(words))
+
+    with TemporaryDirectory() as temp_dir:
+        for matcher in (traced, lean):
+            with TranslationStore.for_matcher(temp_dir, matcher) as store:
+                translator = CachedTranslator(MatchingTranslator(matcher), store=store)
+                list(translator.translate(words))
+
+        # Lean results are stored apart from traced results and keep their type
+        with TranslationStore.for_matcher(temp_dir, lean) as store:
+            assert len(store) == 3
+            translator = CachedTranslator(Mock(), store=store)
+            assert list(translator.translate(words)) == expected
+
+
+def test_cached_translator_store_custom_phonemes():
+    word = Word(text="ab")
+    custom = Phoneme("X", ipa="/x/", example="none")
+    spec = RegexRuleSpec(id="r1", pattern="(ab)", replacement=[custom])
+    matcher = RegexListMatcher([RegexMatcher(spec)])
+
+    with TemporaryDirectory() as temp_dir:
+        with TranslationStore.for_matcher(temp_dir, matcher) as store:
+            translator = CachedTranslator(MatchingTranslator(matcher), store=store)
+            list(translator.translate(word))
+
+        parent = Mock()
+        with TranslationStore.for_matcher(temp_dir, matcher) as store:
+            [result] = CachedTranslator(parent, store=store).translate(word)
+
+    parent.translate.assert_not_called()
+    assert result.phonemes == (custom,)
+    assert result.match_results[0].rule_id == "r1"
+    assert result.match_results[0].word is word
+
+
+def test_stats_lfu_cache():
+    cache = StatsLFUCache(maxsize=2)
+    for key in ["a", "b", "a", "c", "a", "d"]:
+        if cache.get(key) is None:
+            cache[key] = key.upper()
+
+    stats = cache.stats("test")
+    assert (stats.hits, stats.misses, stats.evictions) == (2, 4, 2)
+    assert (stats.size, stats.maxsize) == (2, 2)
+    assert stats.hit_rate == pytest.approx(2 / 6)
+    assert stats.memory > 0
+
+
+def test_approximate_size_counts_shared_objects_once():
+    shared = tuple(Phoneme(str(ix)) for ix in range(10))
+    assert approximate_size([shared, shared]) < 2 * approximate_size([shared])
+
+
+def test_recommend_cache_size():
+    keys = ["a", "b"] * 50 + [str(ix) for ix in range(20)]
+
+    assert recommend_cache_size(keys, 0.5) == (2, pytest.approx(98 / 120))
+    size, hit_rate = recommend_cache_size(keys, 1.0)
+    assert size == 22
+    assert hit_rate == pytest.approx(98 / 120)
+    assert recommend_cache_size([], 0.9) == (0, 0.0)
+
+
+def test_cached_translator_cache_stats(fixtures_path):
+    matcher = create_matcher(f"ng:{fixtures_path / 'RULES_A_V1.5.xls'}#RULES")
+    translator = CachedTranslator(MatchingTranslator(matcher))
+    words = [Word(text=t) for t in ["ende", "vrienden", "ende"]]
+    list(translator.translate(words))
+
+    [stats] = translator.cache_stats()
+    assert stats.name == "translator"
+    assert (stats.hits, stats.misses) == (1, 2)
+
+
+def test_replay_corpus():
+    words = [Word(text=t) for t in ["ende"] * 8 + ["vrienden", "liefde"]]
+
+    recommendations = replay_corpus(words, target_hit_rate=0.5)
+    assert recommendations == {"translator": (1, pytest.approx(0.7))}
+
+
+def test_approximate_size_ignores_candidate_rules(fixtures_path):
+    matcher = create_matcher(f"ng:{fixtures_path / 'RULES_A_V1.5.xls'}#RULES")
+    candidates = tuple(matcher.rules)
+    assert approximate_size(AttemptedRules(candidates, 10)) == sys.getsizeof(
+        AttemptedRules(candidates, 10)
+    )
+
+    # The reported memory follows the cached words, not the size of the rule set
+    translator = CachedTranslator(MatchingTranslator(matcher))
+    list(translator.translate(Word(text="vrienden")))
+    [one] = translator.cache_stats()
+    assert one.memory < 10_000
+
+    list(translator.translate([Word(text=t) for t in ["ende", "liefde", "gheen"]]))
+    [four] = translator.cache_stats()
+    assert four.memory < 5 * one.memory
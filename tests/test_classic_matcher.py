@@ -0,0 +1,61 @@
+from lapa_classic.sampify import Sampify
+from lapa_ng.benchmark import synthetic_corpus
+from lapa_ng.classic import _IncrementalSampify, excel_to_rules
+from lapa_ng.factory import create_matcher
+from lapa_ng.translator import MatchingTranslator
+from lapa_ng.types import Word
+
+
+def _spans(results):
+    return [
+        (mr.start, mr.end, getattr(mr, "rule_id", None), r.phonemes)
+        for r in results
+        for mr in r.match_results
+    ]
+
+
+def test_untraced_matches_traced(fixtures_path):
+    spec = f"classic:{fixtures_path / 'RULES_A_V1.5.xls'}#RULES"
+    traced = create_matcher(spec)
+    untraced = create_matcher(f"{spec}?trace=0")
+    assert traced.trace is True
+    assert untraced.trace is False
+    assert traced.fingerprint != untraced.fingerprint
+
+    words = synthetic_corpus(300, vocabulary=300) + [Word("élève"), Word("x1y")]
+    expected = list(MatchingTranslator(traced).translate(words))
+    result = list(MatchingTranslator(untraced).translate(words))
+
+    assert _spans(result) == _spans(expected)
+    assert any(mr.rules_attempted for r in expected for mr in r.match_results)
+    assert all(
+        getattr(mr, "rules_attempted", ()) == ()
+        for r in result
+        for mr in r.match_results
+    )
+
+
+def test_incremental_sampify(fixtures_path):
+    rules, _ = excel_to_rules(fixtures_path / "RULES_A_V1.5.xls", "RULES")
+    original = Sampify()
+    original._add_rules(rules)
+    incremental = _IncrementalSampify()
+    incremental._add_rules(rules)
+
+    words = [w.text for w in synthetic_corpus(300, vocabulary=300)]
+    words += ["élève", "x1y", "'t", "aa-bb", "ghebroeders" * 20]
+    for word in words:
+        assert incremental.translate(word) == original.translate(word), word
+
+
+def test_translator_uses_match(fixtures_path):
+    # Sampify translates whole words, so the classic matcher has no stateful
+    # match_first and the translator collects the results of match
+    matcher = create_matcher(f"classic:{fixtures_path / 'RULES_A_V1.5.xls'}#RULES")
+    assert not hasattr(type(matcher), "match_first")
+
+    words = [Word("vrienden"), Word("ende")]
+    result = list(MatchingTranslator(matcher).translate(words))
+    assert [mr for r in result for mr in r.match_results] == [
+        mr for w in words for mr in matcher.match(w, 0)
+    ]
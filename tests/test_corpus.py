@@ -0,0 +1,135 @@
+import csv
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from lapa_ng.corpus import (
+    create_translator,
+    find_naf_files,
+    translate_corpus,
+    translate_naf_file,
+)
+from lapa_ng.factory import create_matcher
+from lapa_ng.translator import MatchingTranslator
+
+NAF_TEMPLATE = """<?xml version='1.0' encoding='UTF-8'?>
+<NAF lang="nl" version="v4">
+  <text>
+{words}
+  </text>
+</NAF>
+"""
+
+
+def write_naf(path: Path, words: list[str]):
+    wfs = "\n".join(f'    <wf id="w{ix}">{w}</wf>' for ix, w in enumerate(words))
+    path.write_text(NAF_TEMPLATE.format(words=wfs))
+
+
+def test_find_naf_files():
+    with TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        write_naf(temp_dir / "b.xml", ["een"])
+        write_naf(temp_dir / "a.naf", ["twee"])
+        (temp_dir / "notes.txt").write_text("not a naf file")
+
+        assert find_naf_files(temp_dir) == [temp_dir / "a.naf", temp_dir / "b.xml"]
+        assert find_naf_files(temp_dir / "b.xml") == [temp_dir / "b.xml"]
+        assert find_naf_files(str(temp_dir / "*.xml")) == [temp_dir / "b.xml"]
+        assert find_naf_files(temp_dir / "missing.xml") == []
+
+
+def test_translate_corpus(fixtures_path):
+    matcher_spec = f"ng:{fixtures_path / 'RULES_A_V1.5.xls'}#RULES"
+    plays = {
+        "play2": ["Gheen", "vrienden", "ende", "liefde"],
+        "play1": ["Het", "schip", "vaert", "uyt"],
+    }
+
+    with TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        for name, words in plays.items():
+            write_naf(temp_dir / f"{name}.xml", words)
+
+        output_dir = temp_dir / "output"
+        results = translate_corpus(
+            matcher_spec, find_naf_files(temp_dir), output_dir, max_workers=2
+        )
+
+        assert [r[0].name for r in results] == ["play1.xml", "play2.xml"]
+        assert [r[1] for r in results] == [
+            output_dir / "play1.csv",
+            output_dir / "play2.csv",
+        ]
+
+        # The parallel output must be identical to translating each file in-process
+        translator = MatchingTranslator(create_matcher(matcher_spec))
+        for naf_file, output_file, rows in results:
+            expected_file = temp_dir / f"{naf_file.stem}.expected.csv"
+            expected_rows = translate_naf_file(translator, naf_file, expected_file)
+            assert rows == expected_rows
+            assert output_file.read_text() == expected_file.read_text()
+
+            with open(output_file) as f:
+                ids = {row[0] for row in list(csv.reader(f))[1:]}
+            assert ids == {f"w{ix}" for ix in range(4)}
+
+
+def test_translate_corpus_duplicate_outputs():
+    with pytest.raises(ValueError):
+        translate_corpus("ng:rules.xls", ["a/play.xml", "b/play.xml"], "output")
+
+
+def test_translate_corpus_parquet(fixtures_path):
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+
+    matcher_spec = f"ng:{fixtures_path / 'RULES_A_V1.5.xls'}#RULES"
+
+    with TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        write_naf(temp_dir / "play.xml", ["Gheen", "vrienden"])
+
+        results = translate_corpus(
+            matcher_spec,
+            [temp_dir / "play.xml"],
+            temp_dir / "output",
+            max_workers=1,
+            output_format="parquet",
+        )
+
+        [(_, output_file, rows)] = results
+        assert output_file == temp_dir / "output" / "play.parquet"
+        assert len(pd.read_parquet(output_file)) == rows
+
+
+def test_translate_corpus_unsupported_format():
+    with pytest.raises(ValueError):
+        translate_corpus("ng:rules.xls", ["play.xml"], "output", output_format="txt")
+
+
+def test_translate_corpus_cache_dir(fixtures_path):
+    matcher_spec = f"ng:{fixtures_path / 'RULES_A_V1.5.xls'}#RULES"
+
+    with TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        write_naf(temp_dir / "play.xml", ["Gheen", "vrienden", "ende", "ende"])
+
+        first = translate_corpus(
+            matcher_spec,
+            [temp_dir / "play.xml"],
+            temp_dir / "first",
+            max_workers=1,
+            cache_dir=temp_dir / "cache",
+        )
+        assert len(create_translator(matcher_spec, temp_dir / "cache").store) == 3
+
+        second = translate_corpus(
+            matcher_spec,
+            [temp_dir / "play.xml"],
+            temp_dir / "second",
+            max_workers=1,
+            cache_dir=temp_dir / "cache",
+        )
+        assert first[0][1].read_text() == second[0][1].read_text()
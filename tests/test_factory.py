@@ -1,4 +1,8 @@
-from lapa_ng.factory import parse_matcher_spec
+import pytest
+
+from lapa_ng.benchmark import synthetic_corpus
+from lapa_ng.factory import create_matcher, parse_matcher_spec
+from lapa_ng.translator import MatchingTranslator
 
 
 def test_parse_basic():
@@ -74,3 +78,30 @@ def test_parse_without_prefix():
     assert spec.filename == "rules.xlsx"
     assert spec.section == "SHEET"
     assert spec.options == None
+
+
+def test_parse_flag_options():
+    spec = parse_matcher_spec("ng:rules.xlsx?compiled=1&other=no")
+
+    assert spec.flag("compiled") is True
+    assert spec.flag("other") is False
+    assert spec.flag("missing") is False
+    assert spec.flag("missing", default=True) is True
+
+    with pytest.raises(ValueError):
+        parse_matcher_spec("ng:rules.xlsx?compiled=maybe").flag("compiled")
+
+
+@pytest.mark.parametrize(
+    "options", ["verify=1", "verify=1&compiled=1", "verify=1&codegen=1"]
+)
+def test_create_matcher_verify(fixtures_path, options):
+    rules_file = fixtures_path / "RULES_A_V1.5.xls"
+    words = synthetic_corpus(500, vocabulary=500)
+
+    expected = list(
+        MatchingTranslator(create_matcher(f"ng:{rules_file}#RULES")).translate(words)
+    )
+    matcher = create_matcher(f"ng:{rules_file}#RULES?{options}")
+    assert matcher.verify is True
+    assert list(MatchingTranslator(matcher).translate(words)) == expected
@@ -17,3 +17,41 @@ def test_naf_parser():
     assert len(parser) == 2
     assert parser[0].text == "One"
     assert parser[1].text == "two"
+
+
+def test_naf_parser_skips_other_layers():
+    xml = """<?xml version='1.0' encoding='UTF-8'?>
+<NAF lang="nl" version="v4">
+  <nafHeader>
+    <fileDesc title="Test"/>
+  </nafHeader>
+  <raw>One two three</raw>
+  <text>
+    <wf id="w1" sent="1">One</wf>
+    <wf id="w2" sent="1">two<note>ignored</note></wf>
+    <wf id="w3" sent="2">three</wf>
+  </text>
+  <terms>
+    <term id="t1"><span><target id="w1"/></span></term>
+  </terms>
+</NAF>
+"""
+
+    words = list(parse_naf(StringIO(xml)))
+    assert [w.text for w in words] == ["One", "two", "three"]
+    assert [w.attributes for w in words] == [
+        {"id": "w1", "sent": "1"},
+        {"id": "w2", "sent": "1"},
+        {"id": "w3", "sent": "2"},
+    ]
+
+
+def test_naf_parser_large_document():
+    count = 50_000
+    wfs = "".join(f'<wf id="w{ix}">word{ix}</wf>' for ix in range(count))
+    xml = f"<NAF><text>{wfs}</text></NAF>"
+
+    words = parse_naf(StringIO(xml))
+    for ix, word in enumerate(words):
+        assert word.text == f"word{ix}"
+    assert ix == count - 1
@@ -0,0 +1,116 @@
+import csv
+import io
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from lapa_ng.output import CSV_HEADER, iter_rows, write_csv, write_results
+from lapa_ng.types import ContextualMatchResult, Phoneme, TranslationResult, Word
+
+
+def make_results() -> list[TranslationResult]:
+    results = []
+    for ix, (text, phonemes) in enumerate(
+        [("ende", "En@"), ("een", "en"), ("ende", "En@")]
+    ):
+        word = Word(text, {"id": f"w{ix}"})
+        match = ContextualMatchResult(
+            word=word,
+            phonemes=[Phoneme(ph) for ph in phonemes],
+            start=0,
+            end=len(text),
+            rule_id=f"rule-{ix}",
+            rules_attempted=("a", "b"),
+        )
+        for ph in phonemes:
+            results.append(
+                TranslationResult(
+                    word=word, phonemes=[Phoneme(ph)], match_results=[match]
+                )
+            )
+    return results
+
+
+def test_iter_rows():
+    rows = list(iter_rows(make_results()))
+    assert len(rows) == 8
+    assert rows[0] == ("w0", "ende", 0, "E", "rule-0", 2)
+
+
+def test_write_results_csv():
+    with TemporaryDirectory() as temp_dir:
+        output_file = Path(temp_dir) / "output.csv"
+        assert write_results(make_results(), output_file) == 8
+
+        with open(output_file) as f:
+            assert len(list(csv.reader(f))) == 9
+
+
+def test_write_results_parquet():
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+
+    results = make_results()
+    with TemporaryDirectory() as temp_dir:
+        output_file = Path(temp_dir) / "output.parquet"
+        assert write_results(results, output_file) == 8
+
+        df = pd.read_parquet(output_file)
+        assert list(df.columns) == [
+            "id",
+            "text",
+            "start",
+            "phoneme",
+            "rule_id",
+            "rules_attempted",
+        ]
+        assert list(df.columns) == CSV_HEADER
+        assert isinstance(df["text"].dtype, pd.CategoricalDtype)
+        assert list(df.itertuples(index=False, name=None)) == list(iter_rows(results))
+
+
+def test_write_parquet_batches():
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+
+    from lapa_ng.output import write_parquet
+
+    results = make_results()
+    with TemporaryDirectory() as temp_dir:
+        output_file = Path(temp_dir) / "output.parquet"
+        assert write_parquet(results, output_file, batch_size=3) == 8
+        assert len(pd.read_parquet(output_file)) == 8
+
+
+def test_write_parquet_without_pyarrow(monkeypatch):
+    from lapa_ng.output import write_parquet
+
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(ImportError, match="parquet extra"):
+        write_parquet(make_results(), "output.parquet")
+
+
+def test_write_results_unsupported():
+    with pytest.raises(ValueError):
+        write_results(make_results(), "output.txt")
+
+
+def test_write_csv():
+    f = io.StringIO()
+    assert write_csv(make_results(), f) == 8
+    assert f.getvalue().splitlines()[1] == '"w0","ende",0,"E","rule-0",2'
+
+    # Every column has a name, the same as in the Parquet output
+    header, row = list(csv.reader(io.StringIO(f.getvalue())))[:2]
+    assert header == CSV_HEADER
+    assert len(header) == len(row) == len(next(iter_rows(make_results())))
+    assert header == [
+        "id",
+        "text",
+        "start",
+        "phoneme",
+        "rule_id",
+        "rules_attempted",
+    ]
@@ -1,3 +1,6 @@
+import random
+from unittest.mock import patch
+
 import pytest
 
 from lapa_ng.phonemes import PhonemeList
@@ -50,3 +53,79 @@ def test_phoneme_list():
 
     with pytest.raises(KeyError):
         phonemes["d"]
+
+
+def test_default_phoneme_list_is_shared():
+    phonemes = PhonemeList.default()
+    assert phonemes is PhonemeList.default()
+    assert isinstance(phonemes.phoneme_list, tuple)
+
+
+def test_get_first():
+    phonemes = PhonemeList(
+        [Phoneme(sampa="a"), Phoneme(sampa="a:"), Phoneme(sampa="b")]
+    )
+
+    assert phonemes.get_first("a:b").sampa == "a:"
+    assert phonemes.get_first("ab").sampa == "a"
+    assert phonemes.get_first("b").sampa == "b"
+    assert phonemes.get_first("c") is None
+    assert phonemes.get_first("") is None
+
+
+def test_rule_loading_reads_phonemes_once(fixtures_path):
+    from lapa_ng.table_rules import load_regex_matcher_list
+
+    PhonemeList.default()
+    with patch.object(PhonemeList, "from_csv") as from_csv:
+        matchers = load_regex_matcher_list(
+            fixtures_path / "RULES_A_V1.5.xls", sheet_name="RULES"
+        )
+    assert len(matchers) == 304
+    from_csv.assert_not_called()
+
+
+def _split_by_scanning(phonemes: PhonemeList, word: str) -> list[str]:
+    # The straightforward algorithm: try every phoneme, longest first
+    result = []
+    while word:
+        for phoneme in phonemes:
+            if word.startswith(phoneme.sampa):
+                result.append(phoneme.sampa)
+                word = word[len(phoneme.sampa) :]
+                break
+        else:
+            word = word[1:]
+    return result
+
+
+def test_split_phonemes_longest_match():
+    phonemes = PhonemeList.default()
+    alphabet = sorted({c for p in phonemes for c in p.sampa} | {"-", "Q"})
+
+    rng = random.Random(3)
+    for _ in range(500):
+        word = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        result = phonemes.split_phonemes(word, ignore_errors=True)
+        assert [p.sampa for p in result] == _split_by_scanning(phonemes, word)
+
+
+def test_split_many():
+    phonemes = PhonemeList.default()
+    words = ["strit", "9yt", "strit", "", "t-t"]
+
+    result = phonemes.split_many(words, ignore_errors=True)
+    assert result == [phonemes.split_phonemes(w, ignore_errors=True) for w in words]
+    assert result[0] is result[2]
+
+    with pytest.raises(ValueError):
+        phonemes.split_many(words)
+
+
+def test_get_by_sampa():
+    phonemes = PhonemeList.default()
+    assert phonemes["a:"].ipa == "/aː/"
+    assert phonemes["9y"] is phonemes.split_phonemes("9y")[0]
+
+    with pytest.raises(KeyError):
+        phonemes["a:a:"]
@@ -1,14 +1,24 @@
+import re
+import sys
 from typing import Generator
 from unittest.mock import Mock
 
+import pytest
+
 from lapa_ng.rules_regex import (
     RegexListMatcher,
 )
 from lapa_ng.rules_regex import RegexMatcher as _RegexMatcher
-from lapa_ng.rules_regex import (
-    RegexRuleSpec,
+from lapa_ng.rules_regex import RegexRuleSpec, pattern_first_characters
+from lapa_ng.types import (
+    AttemptedRules,
+    ContextualMatchResult,
+    Matcher,
+    MatchResult,
+    Phoneme,
+    RuleMatchResult,
+    Word,
 )
-from lapa_ng.types import Matcher, MatchResult, Phoneme, Word
 
 
 def RegexMatcher(id: str, rule: str, replacement: str):
@@ -40,26 +50,70 @@ def test_find_candidate_rules():
     assert [r.id for r in result] == ["r4"]
 
 
-def test_find_cached_rules():
+def test_candidate_table():
     rules = (
         RegexMatcher(id="r1", rule="^(ab)", replacement="P A"),
-        RegexMatcher(id="r2", rule="(ab)a", replacement="X1"),
-        RegexMatcher(id="r3", rule="(ab)b", replacement="AB"),
+        RegexMatcher(id="r2", rule="([:vowel:]b)a", replacement="X1"),
+        RegexMatcher(id="r3", rule="(.b)", replacement="AB"),
         RegexMatcher(id="r4", rule="(ba)", replacement="PC"),
+        RegexMatcher(id="r5", rule="^(b?c)", replacement="C"),
     )
 
     matcher = RegexListMatcher(rules)
-    assert len(matcher.candidate_cache) == 0
+    assert matcher.candidate_table[("a", True)] == rules[:3]
+    assert matcher.candidate_table[("e", False)] == (rules[1], rules[2])
+    assert matcher.candidate_table[("b", False)] == (rules[2], rules[3])
+    assert matcher.candidate_table[("b", True)] == rules[2:]
+    assert matcher.candidate_table[("c", True)] == (rules[2], rules[4])
 
-    result = matcher.find_candidate_rules(word=Word("a"), start=0)
-    assert [r.id for r in result] == ["r1", "r2", "r3"]
+    # Letters no rule starts with only have the rules that can start with anything
+    assert matcher.find_candidate_rules(Word("xz"), 1) == (rules[2],)
+    assert matcher.find_candidate_rules(Word("z"), 0) == (rules[2],)
 
-    # Poison the cache
-    key = list(matcher.candidate_cache.keys())[0]
-    matcher.candidate_cache[key] = "MY CRAZY CACHE OBJECT"
+    result = list(matcher.match(Word("ebab"), 0))
+    assert result[0].rule_id == "r2"
 
-    result = matcher.find_candidate_rules(word=Word("a"), start=0)
-    assert result == "MY CRAZY CACHE OBJECT"
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        ("^(ab)", "a"),
+        ("([aeiouy]b)a", "aeiouy"),
+        ("([0-9])", "0123456789"),
+        ("(b?c)", "bc"),
+        ("(?<=x)(a|bc)d", "ab"),
+        ("(?:x|y)(z)", "xy"),
+        ("(.b)", None),
+        ("([^a]b)", None),
+        (r"(\d)", None),
+        ("(a*)", None),
+        ("(?i)(a)", None),
+    ],
+)
+def test_pattern_first_characters(pattern, expected):
+    result = pattern_first_characters(re.compile(pattern))
+    assert result == (None if expected is None else frozenset(expected))
+
+
+def test_verify():
+    rules = (
+        RegexMatcher(id="r1", rule="^(ab)", replacement="P A"),
+        RegexMatcher(id="r2", rule="([:vowel:]b)a", replacement="X1"),
+        RegexMatcher(id="r3", rule="([:digit:])", replacement="D"),
+        RegexMatcher(id="r4", rule="(.)", replacement="X"),
+    )
+
+    for compiled in (False, True):
+        matcher = RegexListMatcher(rules, compiled=compiled, verify=True)
+        for text in ["aba", "xeba", "x1", "ab", "ub"]:
+            for start in range(len(text)):
+                assert list(matcher.match(Word(text), start))
+
+    # A table that drops a rule is caught
+    matcher = RegexListMatcher(rules, verify=True)
+    matcher.candidate_table[("e", False)] = (rules[3],)
+    with pytest.raises(AssertionError, match="r2"):
+        list(matcher.match(Word("xeba"), 1))
 
 
 def test_match():
@@ -71,7 +125,7 @@ def test_match():
 
         def match(self, word, start):
             if word.text == self.word:
-                yield MatchResult(word, [Phoneme(sampa="P")], 0, "P", "A")
+                yield MatchResult(word, [Phoneme(sampa="P")], 0, 1)
 
     rules = [MockMatcher(word="a"), MockMatcher(word="b")]
 
@@ -87,3 +141,234 @@ def test_match():
     assert len(result) == 1
     assert result[0].phonemes == [Phoneme(sampa="P")]
     assert len(result[0].rules_attempted) == 1
+
+
+def test_compiled_match():
+    rules = (
+        RegexMatcher(id="r1", rule="^(ab)", replacement="P A"),
+        RegexMatcher(id="r2", rule="(ab)a", replacement="X1"),
+        RegexMatcher(id="r3", rule="(ab)b", replacement="AB"),
+        RegexMatcher(id="r4", rule="(a)$", replacement="A"),
+        RegexMatcher(id="r5", rule="(ba)", replacement="PC"),
+    )
+
+    plain = RegexListMatcher(rules)
+    compiled = RegexListMatcher(rules, compiled=True)
+
+    for text in ["ab", "aba", "xabb", "xaba", "xa", "xab", "bab"]:
+        word = Word(text)
+        for start in range(len(text)):
+            expected = list(plain.match(word, start))
+            result = list(compiled.match(word, start))
+            assert result == expected, (text, start)
+
+    result = list(compiled.match(Word("xabb"), 1))
+    assert len(result) == 1
+    assert result[0].rule_id == "r3"
+    assert result[0].matched == "ab"
+    assert result[0].remainder == "b"
+    assert result[0].rules_attempted == ("r2",)
+
+
+def test_compiled_no_candidates():
+    rules = (RegexMatcher(id="r1", rule="(ab)", replacement="P A"),)
+    matcher = RegexListMatcher(rules, compiled=True)
+    assert list(matcher.match(Word("xyz"), 1)) == []
+    assert list(matcher.match(Word("abc"), 2)) == []
+
+
+@pytest.mark.parametrize(
+    "pattern", ["(a)(b)", "(a)b(c)?", r"\((a)", "(?<=x)(a)", "(?P<g>a)"]
+)
+def test_compiled_groups(pattern):
+    rules = (
+        RegexMatcher(id="r1", rule="(x)y", replacement="X"),
+        RegexMatcher(id="r2", rule=pattern, replacement="A"),
+        RegexMatcher(id="r3", rule="(.)", replacement="B"),
+    )
+    plain = RegexListMatcher(rules)
+    compiled = RegexListMatcher(rules, compiled=True)
+
+    for text in ["ab", "abc", "(a", "xa", "a", "xab"]:
+        word = Word(text)
+        for start in range(len(text)):
+            assert compiled.match_first(word, start) == plain.match_first(
+                word, start
+            ), (text, start)
+
+
+def test_compiled_rejects_group_references():
+    with pytest.raises(ValueError, match="refers to a group"):
+        RegexListMatcher(
+            [RegexMatcher(id="r1", rule=r"(a)\1", replacement="A")], compiled=True
+        )
+
+    rules = [
+        RegexMatcher(id="r1", rule="(?P<g>a)", replacement="A"),
+        RegexMatcher(id="r2", rule="(?P<g>b)", replacement="B"),
+    ]
+    with pytest.raises(ValueError, match="group name g"):
+        RegexListMatcher(rules, compiled=True)
+    assert RegexListMatcher(rules).match_first(Word("b"), 0).rule_id == "r2"
+
+
+def test_match_results_are_compact():
+    rules = [
+        RegexMatcher(id="".join(["r", "1"]), rule="(b)c", replacement="A"),
+        RegexMatcher(id="r2", rule="(b)", replacement="B"),
+    ]
+    matcher = RegexListMatcher(rules)
+
+    [first] = matcher.match(Word("xb"), 1)
+    [second] = matcher.match(Word("b"), 0)
+
+    assert not hasattr(first, "__dict__")
+    assert first.rules_attempted == ("r1",)
+    assert first.rules_attempted[0] is sys.intern("r1")
+    assert first.phonemes is second.phonemes
+
+
+def test_lean_match():
+    rules = (
+        RegexMatcher(id="r1", rule="^(ab)", replacement="P A"),
+        RegexMatcher(id="r2", rule="(ab)a", replacement="X1"),
+        RegexMatcher(id="r3", rule="(ab)b", replacement="AB"),
+        RegexMatcher(id="r4", rule="(a)$", replacement="A"),
+    )
+
+    for compiled in (False, True):
+        traced = RegexListMatcher(rules, compiled=compiled)
+        lean = RegexListMatcher(rules, compiled=compiled, trace=False)
+        for text in ["ab", "aba", "xabb", "xaba", "xa", "xab"]:
+            word = Word(text)
+            for start in range(len(text)):
+                expected = list(traced.match(word, start))
+                result = list(lean.match(word, start))
+                assert [type(r) for r in result] == [RuleMatchResult] * len(expected)
+                assert [(r.rule_id, r.start, r.end, r.phonemes) for r in result] == [
+                    (r.rule_id, r.start, r.end, r.phonemes) for r in expected
+                ]
+
+    assert lean.fingerprint != traced.fingerprint
+
+    with pytest.raises(ValueError):
+        RegexListMatcher([Mock(spec=["match"])], trace=False)
+
+
+def test_attempted_rules():
+    rules = (
+        RegexMatcher(id="r1", rule="(ab)b", replacement="AB"),
+        RegexMatcher(id="r2", rule="(ab)a", replacement="X1"),
+        RegexMatcher(id="r3", rule="(a)", replacement="A"),
+    )
+    matcher = RegexListMatcher(rules)
+
+    [first] = matcher.match(Word("xa"), 1)
+    [second] = matcher.match(Word("ya"), 1)
+    attempted = first.rules_attempted
+
+    # The attempted rules refer to the shared candidates instead of copying their ids
+    assert isinstance(attempted, AttemptedRules)
+    assert attempted.candidates is second.rules_attempted.candidates
+    assert len(attempted) == 2
+    assert list(attempted) == ["r1", "r2"]
+    assert attempted[-1] == "r2"
+    assert attempted[:1] == ("r1",)
+    with pytest.raises(IndexError):
+        attempted[2]
+
+    assert attempted == ("r1", "r2")
+    assert attempted == second.rules_attempted
+    assert attempted != ("r1",)
+    assert hash(attempted) == hash(("r1", "r2"))
+    assert repr(attempted) == "('r1', 'r2')"
+    assert first == ContextualMatchResult(
+        Word("xa"), first.phonemes, 1, 2, "r3", ("r1", "r2")
+    )
+
+
+def test_match_first():
+    rules = (
+        RegexMatcher(id="r1", rule="^(ab)", replacement="P A"),
+        RegexMatcher(id="r2", rule="(ab)a", replacement="X1"),
+        RegexMatcher(id="r3", rule="(ab)b", replacement="AB"),
+        RegexMatcher(id="r4", rule="(a)$", replacement="A"),
+    )
+
+    assert rules[0].match_first(Word("ab"), 0) == MatchResult(
+        Word("ab"), rules[0].replacement, 0, 2
+    )
+    assert rules[0].match_first(Word("xab"), 1) is None
+
+    matchers = [
+        RegexListMatcher(rules, compiled=compiled, verify=verify, trace=trace)
+        for compiled in (False, True)
+        for verify in (False, True)
+        for trace in (False, True)
+    ]
+    for matcher in matchers:
+        for text in ["ab", "aba", "xabb", "xaba", "xa", "xab"]:
+            word = Word(text)
+            for start in range(len(text)):
+                result = matcher.match_first(word, start)
+                assert list(matcher.match(word, start)) == (
+                    [] if result is None else [result]
+                )
+
+
+def test_lookahead_candidates():
+    rules = (
+        RegexMatcher(id="r1", rule="(ab)a", replacement="X1"),
+        RegexMatcher(id="r2", rule="(a)$", replacement="A"),
+        RegexMatcher(id="r3", rule="(a)[^b]", replacement="B"),
+        RegexMatcher(id="r4", rule=r"(ax)\Z", replacement="C"),
+        RegexMatcher(id="r5", rule="(a).", replacement="D"),
+        RegexMatcher(id="r6", rule="(a)", replacement="E"),
+    )
+    matcher = RegexListMatcher(rules)
+
+    candidates, narrowed = matcher.find_lookahead_candidates(Word("xaba"), 1)
+    assert candidates == rules
+    assert [(ix, rule.id) for ix, rule in narrowed] == [(0, "r1"), (4, "r5"), (5, "r6")]
+
+    _, narrowed = matcher.find_lookahead_candidates(Word("axb"), 0)
+    assert [rule.id for _, rule in narrowed] == ["r3", "r5", "r6"]
+    _, narrowed = matcher.find_lookahead_candidates(Word("bax"), 1)
+    assert [rule.id for _, rule in narrowed] == ["r2", "r3", "r4", "r5", "r6"]
+
+    # $ also matches before a trailing newline
+    _, narrowed = matcher.find_lookahead_candidates(Word("a\n"), 0)
+    assert [rule.id for _, rule in narrowed] == ["r2", "r3", "r6"]
+
+    # The matches and rules attempted are the same as trying every candidate
+    verified = RegexListMatcher(rules, verify=True)
+    for text in ["a", "ab", "aba", "ax", "axa", "a\n", "ac", "xa", "xab\n"]:
+        word = Word(text)
+        for start in range(len(text)):
+            result = verified.match_first(word, start)
+            if result is not None:
+                assert tuple(result.rules_attempted) == tuple(
+                    rule.id
+                    for rule in rules[: [r.id for r in rules].index(result.rule_id)]
+                )
+
+
+def test_match_only_rules():
+    class MatchOnly(Matcher):
+        id = "match-only"
+
+        def match(self, word, start):
+            if word.text[start] == "b":
+                yield MatchResult(word, (Phoneme(sampa="B"),), start, start + 1)
+
+    rules = [RegexMatcher(id="r1", rule="(a)", replacement="A"), MatchOnly()]
+    for verify in (False, True):
+        matcher = RegexListMatcher(rules, verify=verify)
+        word = Word("abc")
+
+        [a] = matcher.match(word, 0)
+        assert a.rule_id == "r1"
+        [b] = matcher.match(word, 1)
+        assert (b.rule_id, b.start, b.end) == ("match-only", 1, 2)
+        assert b.rules_attempted == ()
+        assert matcher.match_first(word, 2) is None
@@ -85,3 +85,16 @@ def test_non_prefix_matcher_matched_in_middle():
     assert result.start == 3
     assert result.word.text == "abbabbabdo"
     assert result.remainder == "babdo"
+
+
+def test_non_prefix_matcher_offsets():
+    spec = RegexRuleSpec(id="test", pattern="(ab)b", replacement=[Phoneme("A")])
+    matcher = RegexMatcher(spec)
+
+    # The rule is anchored at the start position, without slicing the word
+    assert list(matcher.match(word=Word("xaab"), start=1)) == []
+
+    [result] = matcher.match(word=Word("xabb"), start=1)
+    assert (result.start, result.end) == (1, 3)
+    assert result.matched == "ab"
+    assert result.remainder == "b"
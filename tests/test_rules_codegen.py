@@ -0,0 +1,51 @@
+import pytest
+
+from lapa_ng.benchmark import synthetic_corpus
+from lapa_ng.factory import create_matcher
+from lapa_ng.rules_codegen import generate_source
+from lapa_ng.rules_regex import RegexListMatcher
+from lapa_ng.translator import MatchingTranslator
+
+
+@pytest.mark.parametrize("trace", [True, False])
+def test_same_as_regex_matcher(fixtures_path, trace):
+    spec = f"ng:{fixtures_path / 'RULES_A_V1.5.xls'}#RULES?trace={int(trace)}"
+    words = synthetic_corpus(2000, vocabulary=1000)
+
+    expected = list(MatchingTranslator(create_matcher(spec)).translate(words))
+    matcher = create_matcher(f"{spec}&codegen=1")
+    assert matcher.codegen is True
+    assert list(MatchingTranslator(matcher).translate(words)) == expected
+
+
+def test_edge_cases(edge_case_rules, edge_case_words):
+    plain = RegexListMatcher(edge_case_rules)
+    generated = RegexListMatcher(edge_case_rules, codegen=True)
+
+    for word in edge_case_words:
+        for start in range(len(word.text)):
+            assert generated.match_first(word, start) == plain.match_first(
+                word, start
+            ), (word.text, start)
+
+
+def test_generate_source(regex_rules):
+    rules = regex_rules("(ab)", "(a)$", "(b)")
+    source, names = generate_source({("a", False): rules[:2], (None, False): rules})
+
+    assert names == {("a", False): "_bucket_0", (None, False): "_bucket_1"}
+    assert "text[start + 1] == 'b'" in source
+    # The letter of a bucket is not tested again
+    assert "text[start] == 'a'" not in source.split("def _bucket_1")[0]
+    assert "text[start] == 'b'" in source.split("def _bucket_1")[1]
+
+
+@pytest.mark.parametrize("pattern", ["(a+)", "(a|bc)", "x(a)", "(?i)(a)"])
+def test_unsupported_rules(regex_rules, pattern):
+    with pytest.raises(ValueError, match="cannot be code generated"):
+        RegexListMatcher(regex_rules(pattern), codegen=True)
+
+
+def test_compiled_and_codegen(regex_rules):
+    with pytest.raises(ValueError):
+        RegexListMatcher(regex_rules("(a)"), compiled=True, codegen=True)
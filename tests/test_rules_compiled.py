@@ -0,0 +1,133 @@
+import gzip
+import json
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from lapa_ng.factory import create_matcher
+from lapa_ng.rules_compiled import (
+    CompiledRulesMatcher,
+    load_compiled_rules,
+    ruleset_fingerprint,
+    save_compiled_rules,
+)
+from lapa_ng.rules_regex import RegexMatcher, RegexRuleSpec
+from lapa_ng.translator import MatchingTranslator
+from lapa_ng.types import Phoneme, Word
+
+WORDS = ["gheen", "vrienden", "schip", "aenschouwen", "uitgezonderd", "boven", "a"]
+
+
+@pytest.fixture(scope="module")
+def table_matcher():
+    fixtures_path = Path(__file__).parent.parent / "fixtures"
+    return create_matcher(f"ng:{fixtures_path / 'RULES_A_V1.5.xls'}#RULES")
+
+
+def test_spec_round_trip():
+    spec = RegexRuleSpec(
+        id="r1", pattern="(a)[:vowel:]", replacement=[Phoneme("a:", "/aː/")]
+    )
+    matcher = RegexMatcher(spec)
+
+    assert matcher.spec.pattern == "(a)[aeiouy]"
+    assert matcher.prefix is False
+
+    reloaded = RegexMatcher(RegexRuleSpec.from_dict(matcher.spec.asdict()))
+    assert reloaded.pattern == matcher.pattern
+    assert reloaded.prefix is False
+
+    prefix = RegexMatcher(RegexRuleSpec(id="r2", pattern="^(ab)", replacement=[]))
+    assert RegexMatcher(prefix.spec).prefix is True
+
+
+def test_compiled_rules_round_trip(table_matcher):
+    specs = [rule.spec for rule in table_matcher.rules]
+
+    with TemporaryDirectory() as temp_dir:
+        rules_file = Path(temp_dir) / "rules.lapa"
+        fingerprint = save_compiled_rules(specs, rules_file, source={"test": True})
+
+        assert fingerprint == ruleset_fingerprint(specs)
+        assert list(load_compiled_rules(rules_file)) == [
+            RegexRuleSpec(s.id, s.pattern, tuple(s.replacement), s.meta) for s in specs
+        ]
+
+        matcher = create_matcher(f"ng:{rules_file}")
+        assert isinstance(matcher, CompiledRulesMatcher)
+        assert matcher.fingerprint == fingerprint
+        assert matcher.source == {"test": True}
+        assert [r.id for r in matcher.rules] == [r.id for r in table_matcher.rules]
+
+        expected = list(
+            MatchingTranslator(table_matcher).translate(
+                [Word(w) for w in WORDS], emit="rule"
+            )
+        )
+        result = list(
+            MatchingTranslator(matcher).translate([Word(w) for w in WORDS], emit="rule")
+        )
+        assert result == expected
+
+        with pytest.raises(ValueError):
+            create_matcher(f"ng:{rules_file}?sort=alpha")
+
+
+def test_ruleset_fingerprint_changes(table_matcher):
+    specs = [rule.spec for rule in table_matcher.rules]
+    fingerprint = ruleset_fingerprint(specs)
+
+    assert ruleset_fingerprint(list(reversed(specs))) != fingerprint
+    assert ruleset_fingerprint(specs[:-1]) != fingerprint
+
+
+def test_compiled_rules_verification():
+    spec = RegexRuleSpec(id="r1", pattern="(a)", replacement=[Phoneme("a:")])
+
+    with TemporaryDirectory() as temp_dir:
+        rules_file = Path(temp_dir) / "rules.lapa"
+        save_compiled_rules([spec], rules_file)
+
+        with gzip.open(rules_file, "rt") as f:
+            document = json.load(f)
+
+        document["rules"][0]["pattern"] = "(b)"
+        with gzip.open(rules_file, "wt") as f:
+            json.dump(document, f)
+        with pytest.raises(ValueError, match="hash"):
+            load_compiled_rules(rules_file)
+
+        document["version"] = 999
+        with gzip.open(rules_file, "wt") as f:
+            json.dump(document, f)
+        with pytest.raises(ValueError, match="version"):
+            load_compiled_rules(rules_file)
+
+        Path(rules_file).write_text("not compiled")
+        with pytest.raises(ValueError):
+            load_compiled_rules(rules_file)
+
+
+def test_compiled_rules_without_pandas():
+    spec = RegexRuleSpec(id="r1", pattern="(a)", replacement=[Phoneme("a:")])
+
+    with TemporaryDirectory() as temp_dir:
+        rules_file = Path(temp_dir) / "rules.lapa"
+        save_compiled_rules([spec], rules_file)
+
+        code = (
+            "import sys\n"
+            "from lapa_ng.factory import create_matcher\n"
+            f"matcher = create_matcher({str(rules_file)!r})\n"
+            "assert len(matcher) == 1\n"
+            "assert 'pandas' not in sys.modules\n"
+            "assert 'xlrd' not in sys.modules\n"
+        )
+        subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            cwd=Path(__file__).parent.parent,
+        )
@@ -0,0 +1,57 @@
+import pytest
+
+from lapa_ng.benchmark import synthetic_corpus
+from lapa_ng.factory import create_matcher
+from lapa_ng.rules_regex import RegexListMatcher
+from lapa_ng.rules_vectorized import VectorizedTranslator
+from lapa_ng.translator import MatchingTranslator
+
+
+@pytest.mark.parametrize("trace", [True, False])
+@pytest.mark.parametrize("emit", ["rule", "word", "phoneme"])
+def test_same_as_regex_matcher(fixtures_path, emit, trace):
+    spec = f"ng:{fixtures_path / 'RULES_A_V1.5.xls'}#RULES?trace={int(trace)}"
+    matcher = create_matcher(spec)
+    words = synthetic_corpus(2000, vocabulary=1000)
+
+    expected = list(MatchingTranslator(matcher).translate(words, emit=emit))
+    translator = VectorizedTranslator(matcher, batch_size=300)
+    assert list(translator.translate(words, emit=emit)) == expected
+
+
+def test_edge_cases(edge_case_rules, edge_case_words):
+    matcher = RegexListMatcher(edge_case_rules)
+
+    expected = list(MatchingTranslator(matcher).translate(edge_case_words))
+    for batch_size in (1, 5, 100):
+        translator = VectorizedTranslator(matcher, batch_size=batch_size)
+        assert list(translator.translate(edge_case_words)) == expected
+
+
+def test_match_corpus(regex_rules):
+    matcher = RegexListMatcher(regex_rules("(ab)", "(a)$", "(b)"))
+    translator = VectorizedTranslator(matcher)
+
+    matches = translator.match_corpus(["ab", "xa", "ab", "b"])
+    assert len(matches) == 4
+    assert matches.texts == ("ab", "xa", "b")
+    assert matches.text_index.tolist() == [0, 1, 0, 2]
+    assert matches.offsets.tolist() == [0, 1, 3, 4]
+    assert matches.starts.tolist() == [0, 0, 1, 0]
+    assert matches.ends.tolist() == [2, 1, 2, 1]
+    assert matches.rules.tolist() == [0, -1, 1, 2]
+
+    assert matches.rule_counts() == {"r0": 2, "r1": 1, "r2": 1}
+    assert matches.silent_count == 1
+
+    empty = translator.match_corpus([])
+    assert empty.rule_counts() == {}
+    assert empty.offsets.tolist() == [0]
+
+
+@pytest.mark.parametrize(
+    "pattern", ["(a+)", "(a|bc)", "x(a)", r"(\d)", "(?i)(a)", "()a"]
+)
+def test_unsupported_rules(regex_rules, pattern):
+    with pytest.raises(ValueError, match="cannot be vectorized"):
+        VectorizedTranslator(RegexListMatcher(regex_rules(pattern)))
@@ -1,3 +1,4 @@
+from functools import partial
 from unittest.mock import Mock, call
 
 from lapa_ng.text_clean import (
@@ -127,3 +128,28 @@ def test_clean_words_no_changes():
 
     assert result[1].text == "world"
     assert "original_text" not in result[1].attributes
+
+
+def test_pipeline_id():
+    def replace(text, old="a", new="b"):
+        return text.replace(old, new)
+
+    def other_replace(text, old="a", new="b"):
+        return text.replace(old, new).upper()
+
+    pipeline = create_pipeline(replace, to_lowercase)
+    assert pipeline.__name__ == "replace+to_lowercase"
+    assert pipeline.pipeline_id.startswith("replace+to_lowercase:")
+    assert pipeline.pipeline_id == create_pipeline(replace, to_lowercase).pipeline_id
+
+    # A change to the code or the arguments of a cleaner gives a new id
+    other_replace.__name__ = other_replace.__qualname__ = "replace"
+    ids = {
+        pipeline.pipeline_id,
+        create_pipeline(other_replace, to_lowercase).pipeline_id,
+        create_pipeline(partial(replace, new="c"), to_lowercase).pipeline_id,
+        create_pipeline(partial(replace, new="d"), to_lowercase).pipeline_id,
+        create_pipeline(lambda t: t.strip(), to_lowercase).pipeline_id,
+        create_pipeline(lambda t: t.lstrip(), to_lowercase).pipeline_id,
+    }
+    assert len(ids) == 6
@@ -31,11 +31,87 @@ def test_cached_translator():
     mock_translator.translate.reset_mock()
 
     result = list(translator.translate(word, emit="phoneme"))
-    assert len(result) == 2
-    assert mock_translator.translate.call_count == 1
+    assert len(result) == 4
+    assert mock_translator.translate.call_count == 0
     mock_translator.translate.reset_mock()
 
-    result = list(translator.translate(word, emit="phoneme"))
-    assert len(result) == 2
+    result = list(translator.translate(word, emit="word"))
+    assert len(result) == 1
+    assert result[0].phonemes == ("t", "e", "s", "t")
     assert mock_translator.translate.call_count == 0
-    mock_translator.translate.reset_mock()
+
+
+def test_cached_translator_requests_rules():
+    word = Word(text="test")
+
+    mock_translator = Mock()
+    mock_translator.translate.return_value = [
+        TranslationResult(word=word, phonemes=["t", "e"], match_results=[]),
+    ]
+
+    translator = CachedTranslator(mock_translator)
+    list(translator.translate(word, emit="word"))
+    mock_translator.translate.assert_called_once_with(word, emit="rule")
+    assert list(translator.cache.keys()) == ["test"]
+
+
+def test_cached_translator_empty_result():
+    mock_translator = Mock()
+    mock_translator.translate.return_value = []
+
+    translator = CachedTranslator(mock_translator)
+    assert list(translator.translate(Word(text=""))) == []
+    assert list(translator.translate(Word(text=""))) == []
+    assert mock_translator.translate.call_count == 1
+
+
+def test_cached_translator_rebinds_word():
+    first = Word(text="test", attributes={"id": "1"})
+    second = Word(text="test", attributes={"id": "2"})
+
+    mock_translator = Mock()
+    mock_translator.translate.return_value = [
+        TranslationResult(
+            word=first,
+            phonemes=["t", "e"],
+            match_results=[MatchResult(first, ["t", "e"], 0, 2)],
+        ),
+        TranslationResult(
+            word=first,
+            phonemes=["s", "t"],
+            match_results=[MatchResult(first, ["s", "t"], 2, 4)],
+        ),
+    ]
+
+    translator = CachedTranslator(mock_translator)
+    list(translator.translate(first))
+
+    result = list(translator.translate(second))
+    assert mock_translator.translate.call_count == 1
+    assert [r.word.attributes["id"] for r in result] == ["2", "2"]
+    assert [mr.word for r in result for mr in r.match_results] == [second, second]
+    assert [mr.start for r in result for mr in r.match_results] == [0, 2]
+    assert [r.phonemes for r in result] == [["t", "e"], ["s", "t"]]
+
+    result = list(translator.translate(second, emit="word"))
+    assert len(result) == 1
+    assert result[0].word is second
+
+
+def test_cached_translator_batch_is_exact():
+    mock_translator = Mock()
+    mock_translator.translate.side_effect = lambda word, emit: [
+        TranslationResult(
+            word=word,
+            phonemes=[word.text],
+            match_results=[MatchResult(word, [word.text], 0, len(word.text))],
+        )
+    ]
+
+    # A cache of one entry evicts on every new word, the batch still translates each text once
+    translator = CachedTranslator(mock_translator, cache_size=1)
+    words = [Word(text=t) for t in ["a", "b", "a", "c", "b", "a"]]
+
+    result = list(translator.translate_batch(words))
+    assert mock_translator.translate.call_count == 3
+    assert [r.word for r in result] == words
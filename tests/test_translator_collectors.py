@@ -15,28 +15,18 @@ def test_collect_words_single_word():
         TranslationResult(
             word=word1,
             phonemes=["t"],
-            match_results=[
-                MatchResult(
-                    word=word1, phonemes=["t"], start=0, matched="t", remainder="est"
-                )
-            ],
+            match_results=[MatchResult(word=word1, phonemes=["t"], start=0, end=1)],
         ),
         TranslationResult(
             word=word1,
             phonemes=["e"],
-            match_results=[
-                MatchResult(
-                    word=word1, phonemes=["e"], start=1, matched="e", remainder="st"
-                )
-            ],
+            match_results=[MatchResult(word=word1, phonemes=["e"], start=1, end=2)],
         ),
         TranslationResult(
             word=word1,
             phonemes=["s", "t"],
             match_results=[
-                MatchResult(
-                    word=word1, phonemes=["s", "t"], start=2, matched="st", remainder=""
-                )
+                MatchResult(word=word1, phonemes=["s", "t"], start=2, end=4)
             ],
         ),
     ]
@@ -44,7 +34,7 @@ def test_collect_words_single_word():
     collected1 = list(_collect_words(results1))
     assert len(collected1) == 1
     assert collected1[0].word == word1
-    assert collected1[0].phonemes == ["t", "e", "s", "t"]
+    assert collected1[0].phonemes == ("t", "e", "s", "t")
     assert len(collected1[0].match_results) == 3
 
 
@@ -57,54 +47,36 @@ def test_collect_words_multiple_words():
             word=word1,
             phonemes=["t", "e"],
             match_results=[
-                MatchResult(
-                    word=word1,
-                    phonemes=["t", "e"],
-                    start=0,
-                    matched="test",
-                    remainder="st",
-                )
+                MatchResult(word=word1, phonemes=["t", "e"], start=0, end=4)
             ],
         ),
         TranslationResult(
             word=word1,
             phonemes=["s", "t"],
             match_results=[
-                MatchResult(
-                    word=word1, phonemes=["s", "t"], start=2, matched="st", remainder=""
-                )
+                MatchResult(word=word1, phonemes=["s", "t"], start=2, end=4)
             ],
         ),
         TranslationResult(
             word=word2,
             phonemes=["h", "e", "l", "l"],
             match_results=[
-                MatchResult(
-                    word=word2,
-                    phonemes=["h", "e", "l", "l"],
-                    start=0,
-                    matched="hello",
-                    remainder="o",
-                )
+                MatchResult(word=word2, phonemes=["h", "e", "l", "l"], start=0, end=5)
             ],
         ),
         TranslationResult(
             word=word2,
             phonemes=["o"],
-            match_results=[
-                MatchResult(
-                    word=word2, phonemes=["o"], start=4, matched="o", remainder=""
-                )
-            ],
+            match_results=[MatchResult(word=word2, phonemes=["o"], start=4, end=5)],
         ),
     ]
 
     collected2 = list(_collect_words(results2))
     assert len(collected2) == 2
     assert collected2[0].word == word1
-    assert collected2[0].phonemes == ["t", "e", "s", "t"]
+    assert collected2[0].phonemes == ("t", "e", "s", "t")
     assert collected2[1].word == word2
-    assert collected2[1].phonemes == ["h", "e", "l", "l", "o"]
+    assert collected2[1].phonemes == ("h", "e", "l", "l", "o")
 
 
 def test_collect_words_empty_input():
@@ -120,18 +92,14 @@ def test_collect_words_single_word_no_phonemes():
         TranslationResult(
             word=word3,
             phonemes=[],
-            match_results=[
-                MatchResult(
-                    word=word3, phonemes=[], start=0, matched="", remainder="empty"
-                )
-            ],
+            match_results=[MatchResult(word=word3, phonemes=[], start=0, end=0)],
         )
     ]
 
     collected4 = list(_collect_words(results4))
     assert len(collected4) == 1
     assert collected4[0].word == word3
-    assert collected4[0].phonemes == []
+    assert collected4[0].phonemes == ()
     assert len(collected4[0].match_results) == 1
 
 
@@ -141,28 +109,18 @@ def test_collect_rules():
         TranslationResult(
             word=word1,
             phonemes=["t"],
-            match_results=[
-                MatchResult(
-                    word=word1, phonemes=["t"], start=0, matched="t", remainder="est"
-                )
-            ],
+            match_results=[MatchResult(word=word1, phonemes=["t"], start=0, end=1)],
         ),
         TranslationResult(
             word=word1,
             phonemes=["e"],
-            match_results=[
-                MatchResult(
-                    word=word1, phonemes=["e"], start=1, matched="e", remainder="st"
-                )
-            ],
+            match_results=[MatchResult(word=word1, phonemes=["e"], start=1, end=2)],
         ),
         TranslationResult(
             word=word1,
             phonemes=["s", "t"],
             match_results=[
-                MatchResult(
-                    word=word1, phonemes=["s", "t"], start=2, matched="st", remainder=""
-                )
+                MatchResult(word=word1, phonemes=["s", "t"], start=2, end=4)
             ],
         ),
     ]
@@ -184,51 +142,31 @@ def test_collect_phonemes():
         TranslationResult(
             word=word1,
             phonemes=["t"],
-            match_results=[
-                MatchResult(
-                    word=word1, phonemes=["t"], start=0, matched="t", remainder="est"
-                )
-            ],
+            match_results=[MatchResult(word=word1, phonemes=["t"], start=0, end=1)],
         ),
         TranslationResult(
             word=word1,
             phonemes=["e"],
-            match_results=[
-                MatchResult(
-                    word=word1, phonemes=["e"], start=1, matched="e", remainder="st"
-                )
-            ],
+            match_results=[MatchResult(word=word1, phonemes=["e"], start=1, end=2)],
         ),
         TranslationResult(
             word=word1,
             phonemes=["s", "t"],
             match_results=[
-                MatchResult(
-                    word=word1, phonemes=["s", "t"], start=2, matched="st", remainder=""
-                )
+                MatchResult(word=word1, phonemes=["s", "t"], start=2, end=4)
             ],
         ),
         TranslationResult(
             word=word2,
             phonemes=["h", "e", "l", "l"],
             match_results=[
-                MatchResult(
-                    word=word2,
-                    phonemes=["h", "e", "l", "l"],
-                    start=0,
-                    matched="hello",
-                    remainder="o",
-                )
+                MatchResult(word=word2, phonemes=["h", "e", "l", "l"], start=0, end=5)
             ],
         ),
         TranslationResult(
             word=word2,
             phonemes=["o"],
-            match_results=[
-                MatchResult(
-                    word=word2, phonemes=["o"], start=4, matched="o", remainder=""
-                )
-            ],
+            match_results=[MatchResult(word=word2, phonemes=["o"], start=4, end=5)],
         ),
     ]
 
@@ -237,12 +175,12 @@ def test_collect_phonemes():
     assert collected1[0].word == word1
     assert collected1[-1].word == word2
 
-    assert collected1[0].phonemes == ["t"]
-    assert collected1[1].phonemes == ["e"]
-    assert collected1[2].phonemes == ["s"]
-    assert collected1[3].phonemes == ["t"]
-    assert collected1[4].phonemes == ["h"]
-    assert collected1[5].phonemes == ["e"]
-    assert collected1[6].phonemes == ["l"]
-    assert collected1[7].phonemes == ["l"]
-    assert collected1[8].phonemes == ["o"]
+    assert collected1[0].phonemes == ("t",)
+    assert collected1[1].phonemes == ("e",)
+    assert collected1[2].phonemes == ("s",)
+    assert collected1[3].phonemes == ("t",)
+    assert collected1[4].phonemes == ("h",)
+    assert collected1[5].phonemes == ("e",)
+    assert collected1[6].phonemes == ("l",)
+    assert collected1[7].phonemes == ("l",)
+    assert collected1[8].phonemes == ("o",)
@@ -49,20 +49,8 @@ def test_emit_settings(
 def test_translate_word_matches():
     mock_matcher = Mock()
     mock_matcher.match.return_value = [
-        MatchResult(
-            phonemes=["t", "e"],
-            word=Word(text="test"),
-            start=0,
-            matched="te",
-            remainder="st",
-        ),
-        MatchResult(
-            phonemes=["s", "t"],
-            word=Word(text="test"),
-            start=2,
-            matched="st",
-            remainder="",
-        ),
+        MatchResult(phonemes=["t", "e"], word=Word(text="test"), start=0, end=2),
+        MatchResult(phonemes=["s", "t"], word=Word(text="test"), start=2, end=4),
     ]
 
     translator = MatchingTranslator(mock_matcher)
@@ -78,7 +66,60 @@ def test_translate_word_no_matches():
     translator = MatchingTranslator(mock_matcher)
     result = list(translator._translate_word(Word(text="test")))
     assert len(result) == 4
-    assert result[0].phonemes == []
-    assert result[1].phonemes == []
-    assert result[2].phonemes == []
-    assert result[3].phonemes == []
+    assert result[0].phonemes == ()
+    assert result[1].phonemes == ()
+    assert result[2].phonemes == ()
+    assert result[3].phonemes == ()
+
+
+def test_translate_word_silent_spans():
+    mock_matcher = Mock()
+    mock_matcher.match.return_value = []
+    translator = MatchingTranslator(mock_matcher)
+    result = list(translator._translate_word(Word(text="ab")))
+    spans = [(r.match_results[0].start, r.match_results[0].end) for r in result]
+    assert spans == [(0, 1), (1, 2)]
+    assert [r.match_results[0].matched for r in result] == ["a", "b"]
+    assert result[0].match_results[0].remainder == "b"
+
+
+def test_translate_batch():
+    mock_matcher = Mock()
+    mock_matcher.match.side_effect = lambda word, start: [
+        MatchResult(word=word, phonemes=[word.text], start=0, end=len(word.text))
+    ]
+    translator = MatchingTranslator(mock_matcher)
+
+    words = [
+        Word(text=t, attributes={"id": str(ix)})
+        for ix, t in enumerate(["de", "man", "de", "de", "man"])
+    ]
+    result = list(translator.translate_batch(words, emit="word"))
+
+    assert mock_matcher.match.call_count == 2
+    assert [r.word for r in result] == words
+    assert [mr.word for r in result for mr in r.match_results] == words
+    assert result == list(translator.translate(words, emit="word"))
+
+
+def test_translate_word_prefers_match_first():
+    class FirstMatcher:
+        def match(self, word, start):
+            raise AssertionError("match_first should be used")
+
+        def match_first(self, word, start):
+            if word.text[start] == "a":
+                return MatchResult(
+                    word=word, phonemes=["A"], start=start, end=start + 1
+                )
+            return None
+
+    translator = MatchingTranslator(FirstMatcher())
+    result = list(translator.translate(Word(text="bab")))
+
+    assert [r.phonemes for r in result] == [(), ["A"], ()]
+    assert [(r.match_results[0].start, r.match_results[0].end) for r in result] == [
+        (0, 1),
+        (1, 2),
+        (2, 3),
+    ]